@@ -12,7 +12,19 @@ from app.config import get_settings
 from app.db.base import Base
 
 # Import all models for Alembic to detect
-from app.models import User, Model, PromptTemplate, PromptVersion, TestRun, TestResult
+from app.models import (
+    User,
+    Model,
+    PromptTemplate,
+    PromptVersion,
+    StoredText,
+    TestRun,
+    TestResult,
+    TestResultBlob,
+    CachedResponse,
+    Job,
+    Batch,
+)
 
 config = context.config
 settings = get_settings()
@@ -0,0 +1,59 @@
+"""keyset pagination indexes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Composite indexes matching the (timestamp, id) order of the cursor-paged
+lists. They are built CONCURRENTLY so existing tables stay writable, and
+skipped when already present (e.g. on a schema created from the models).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index condition)
+INDEXES = [
+    (
+        "ix_test_runs_user_history",
+        "test_runs",
+        ["user_id", "created_at", "id"],
+        "batch_id IS NULL",
+    ),
+    (
+        "ix_prompt_templates_user_updated",
+        "prompt_templates",
+        ["user_id", "updated_at", "id"],
+        None,
+    ),
+    ("ix_models_created", "models", ["created_at", "id"], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in INDEXES:
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,52 @@
+"""full-text search columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+Generated tsvector columns on test_runs (user message, then system prompt)
+and test_results (the first 100,000 characters of the response), each with
+a GIN index. Adding a stored generated column rewrites the table under an
+exclusive lock, so run this in a maintenance window on large tables; the
+indexes are then built CONCURRENTLY.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = {
+    "test_runs": (
+        "setweight(to_tsvector('simple', user_message), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(system_prompt, '')), 'B')"
+    ),
+    "test_results": "to_tsvector('simple', left(coalesce(response, ''), 100000))",
+}
+
+
+def upgrade() -> None:
+    for table, expression in COLUMNS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+    with op.get_context().autocommit_block():
+        for table in COLUMNS:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search "
+                f"ON {table} USING gin (search_vector)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in COLUMNS:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_search")
+    for table in COLUMNS:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
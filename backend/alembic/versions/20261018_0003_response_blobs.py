@@ -0,0 +1,62 @@
+"""compressed response blobs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+Adds test_result_blobs for responses over RESPONSE_OFFLOAD_BYTES and the
+test_results.response_offloaded flag. Existing rows are moved by the
+background job queued with POST /api/v1/llm/storage/offload, not here.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "test_results",
+        sa.Column(
+            "response_offloaded",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+    op.create_table(
+        "test_result_blobs",
+        sa.Column(
+            "result_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("test_results.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("codec", sa.String(10), nullable=False),
+        sa.Column("raw_size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    op.create_index(
+        "ix_test_result_blobs_search",
+        "test_result_blobs",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    # Already compressed: keep Postgres from trying again in TOAST
+    op.execute("ALTER TABLE test_result_blobs ALTER COLUMN data SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    # Offloaded responses are dropped with the table
+    op.drop_index("ix_test_result_blobs_search", table_name="test_result_blobs")
+    op.drop_table("test_result_blobs")
+    op.drop_column("test_results", "response_offloaded")
@@ -0,0 +1,94 @@
+"""content-addressed texts
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+Moves test_runs.user_message and system_prompt into a texts table keyed by
+the hex SHA-256 of the UTF-8 text, so identical prompts are stored (and
+full-text indexed) once. Runs keep the hashes. The full-text index moves
+from test_runs to texts.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ["user_message", "system_prompt"]
+
+
+def _hash(column: str) -> str:
+    return f"encode(sha256(convert_to({column}, 'UTF8')), 'hex')"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "texts",
+        sa.Column("hash", sa.String(64), primary_key=True),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        "ALTER TABLE texts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('simple', left(content, 100000))) STORED"
+    )
+
+    for column in COLUMNS:
+        op.add_column("test_runs", sa.Column(f"{column}_hash", sa.String(64)))
+        op.execute(
+            f"INSERT INTO texts (hash, content) "
+            f"SELECT DISTINCT {_hash(column)}, {column} FROM test_runs "
+            f"WHERE {column} IS NOT NULL ON CONFLICT DO NOTHING"
+        )
+        op.execute(f"UPDATE test_runs SET {column}_hash = {_hash(column)}")
+        op.create_foreign_key(
+            f"fk_test_runs_{column}_hash",
+            "test_runs",
+            "texts",
+            [f"{column}_hash"],
+            ["hash"],
+        )
+        op.create_index(f"ix_test_runs_{column}_hash", "test_runs", [f"{column}_hash"])
+    op.alter_column("test_runs", "user_message_hash", nullable=False)
+
+    op.drop_index("ix_test_runs_search", table_name="test_runs", if_exists=True)
+    op.execute("ALTER TABLE test_runs DROP COLUMN IF EXISTS search_vector")
+    for column in COLUMNS:
+        op.drop_column("test_runs", column)
+    op.create_index(
+        "ix_texts_search", "texts", ["search_vector"], postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    for column in COLUMNS:
+        op.add_column("test_runs", sa.Column(column, sa.Text()))
+        op.execute(
+            f"UPDATE test_runs SET {column} = texts.content FROM texts "
+            f"WHERE texts.hash = test_runs.{column}_hash"
+        )
+        op.drop_index(f"ix_test_runs_{column}_hash", table_name="test_runs")
+        op.drop_constraint(f"fk_test_runs_{column}_hash", "test_runs")
+        op.drop_column("test_runs", f"{column}_hash")
+    op.alter_column("test_runs", "user_message", nullable=False)
+    op.execute(
+        "ALTER TABLE test_runs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', user_message), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(system_prompt, '')), 'B')) STORED"
+    )
+    op.create_index(
+        "ix_test_runs_search", "test_runs", ["search_vector"], postgresql_using="gin"
+    )
+    op.drop_table("texts")
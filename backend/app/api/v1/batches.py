@@ -0,0 +1,188 @@
+"""Batch evaluation API endpoints."""
+
+from uuid import UUID
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import ActiveUser
+from app.db.session import get_db
+from app.models.batch import Batch
+from app.schemas.batch import BatchCreate, BatchListResponse, BatchResponse
+from app.schemas.test_run import (
+    ModelTestConfig,
+    TestRunListResponse,
+    TestRunResponse,
+)
+from app.services.batch import BatchService
+from app.services.model import model_names
+from app.services.test_run import TestRunService
+from app.worker import job_worker
+
+router = APIRouter()
+
+
+def _batch_response(batch: Batch) -> BatchResponse:
+    return BatchResponse(
+        id=batch.id,
+        name=batch.name,
+        status=batch.status,
+        item_count=batch.item_count,
+        models=[ModelTestConfig.model_validate(c) for c in batch.config["models"]],
+        progress=BatchService.progress(batch),
+        error=batch.error,
+        created_at=batch.created_at,
+        started_at=batch.started_at,
+        finished_at=batch.finished_at,
+    )
+
+
+@router.post(
+    "",
+    response_model=BatchResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_batch(
+    current_user: ActiveUser,
+    file: UploadFile = File(..., description="JSONL dataset, one message per line"),
+    config: str = Form(..., description="BatchCreate as JSON"),
+    db: AsyncSession = Depends(get_db),
+) -> BatchResponse:
+    """
+    Queue a dataset for evaluation against one or more models.
+
+    Each line of ``file`` is ``{"user_message": ..., "system_prompt": ...}``
+    or a bare JSON string. Every line is run against every entry of
+    ``config.models``. Poll the batch for progress, throughput and ETA.
+    """
+    try:
+        batch_data = BatchCreate.model_validate_json(config)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False),
+        )
+
+    service = BatchService(db)
+    try:
+        items = service.parse_dataset(await file.read())
+        batch = await service.create_batch(current_user.id, batch_data, items)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    job_worker.notify()
+
+    return _batch_response(batch)
+
+
+@router.get("", response_model=BatchListResponse)
+async def get_batches(
+    current_user: ActiveUser,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+) -> BatchListResponse:
+    """Get paginated list of batches for the current user."""
+    batches, total = await BatchService(db).get_batches(
+        user_id=current_user.id, skip=skip, limit=limit
+    )
+    return BatchListResponse(
+        items=[_batch_response(batch) for batch in batches],
+        total=total,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get("/{batch_id}", response_model=BatchResponse)
+async def get_batch(
+    batch_id: UUID,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> BatchResponse:
+    """Get a batch with its progress, throughput and ETA."""
+    batch = await BatchService(db).get_batch_by_id(batch_id, current_user.id)
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found",
+        )
+    return _batch_response(batch)
+
+
+@router.get("/{batch_id}/results", response_model=TestRunListResponse)
+async def get_batch_results(
+    batch_id: UUID,
+    current_user: ActiveUser,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+) -> TestRunListResponse:
+    """Get a page of dataset rows with their per-model results."""
+    service = BatchService(db)
+    batch = await service.get_batch_by_id(batch_id, current_user.id)
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found",
+        )
+
+    test_runs = await service.get_results(batch_id, skip=skip, limit=limit)
+    model_ids = [UUID(c["model_id"]) for c in batch.config["models"]]
+    names = await model_names.get(db, model_ids)
+
+    items = [
+        TestRunResponse(
+            id=run.id,
+            user_id=run.user_id,
+            prompt_template_id=run.prompt_template_id,
+            user_message=run.user_message,
+            system_prompt=run.system_prompt,
+            status=run.status,
+            error=run.error,
+            results=[
+                TestRunService.result_response(
+                    result, names.get(result.model_id, "Unknown")
+                )
+                for result in run.results
+            ],
+            created_at=run.created_at,
+            updated_at=run.updated_at,
+        )
+        for run in test_runs
+    ]
+
+    return TestRunListResponse(
+        items=items,
+        total=batch.item_count,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.delete("/{batch_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_batch(
+    batch_id: UUID,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Delete a batch with all its rows and results."""
+    success = await BatchService(db).delete_batch(batch_id, current_user.id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found",
+        )
@@ -0,0 +1,123 @@
+"""Benchmark (load test) API endpoints."""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import ActiveUser
+from app.db.session import get_db
+from app.models.benchmark import Benchmark
+from app.schemas.benchmark import (
+    BenchmarkCreate,
+    BenchmarkListResponse,
+    BenchmarkResponse,
+    BenchmarkStep,
+)
+from app.services.benchmark import BenchmarkService
+from app.worker import job_worker
+
+router = APIRouter()
+
+
+def _benchmark_response(benchmark: Benchmark) -> BenchmarkResponse:
+    return BenchmarkResponse(
+        id=benchmark.id,
+        model_id=benchmark.model_id,
+        status=benchmark.status,
+        config=BenchmarkCreate.model_validate(benchmark.config),
+        steps=[BenchmarkStep.model_validate(step) for step in benchmark.steps],
+        recommended_concurrency=benchmark.recommended_concurrency,
+        error=benchmark.error,
+        created_at=benchmark.created_at,
+        started_at=benchmark.started_at,
+        finished_at=benchmark.finished_at,
+    )
+
+
+@router.post(
+    "",
+    response_model=BenchmarkResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_benchmark(
+    benchmark_data: BenchmarkCreate,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> BenchmarkResponse:
+    """
+    Queue a load test against one model.
+
+    Runs each concurrency (or target QPS) step for ``step_seconds`` and
+    records latency, TTFT and decode-speed percentiles, throughput and
+    error rate per step. Poll the benchmark; steps appear as they finish.
+    With ``mode: "probe"`` the saturation knee is stored on the model as
+    its ``max_concurrency`` cap.
+    """
+    try:
+        benchmark = await BenchmarkService(db).create_benchmark(
+            current_user.id, benchmark_data
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    job_worker.notify()
+
+    return _benchmark_response(benchmark)
+
+
+@router.get("", response_model=BenchmarkListResponse)
+async def get_benchmarks(
+    current_user: ActiveUser,
+    model_id: UUID | None = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+) -> BenchmarkListResponse:
+    """Get paginated list of benchmarks for the current user."""
+    benchmarks, total = await BenchmarkService(db).get_benchmarks(
+        user_id=current_user.id, model_id=model_id, skip=skip, limit=limit
+    )
+    return BenchmarkListResponse(
+        items=[_benchmark_response(benchmark) for benchmark in benchmarks],
+        total=total,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get("/{benchmark_id}", response_model=BenchmarkResponse)
+async def get_benchmark(
+    benchmark_id: UUID,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> BenchmarkResponse:
+    """Get a benchmark with the results of its finished steps."""
+    benchmark = await BenchmarkService(db).get_benchmark_by_id(
+        benchmark_id, current_user.id
+    )
+    if not benchmark:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Benchmark not found",
+        )
+    return _benchmark_response(benchmark)
+
+
+@router.delete("/{benchmark_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_benchmark(
+    benchmark_id: UUID,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Delete a benchmark."""
+    success = await BenchmarkService(db).delete_benchmark(
+        benchmark_id, current_user.id
+    )
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Benchmark not found",
+        )
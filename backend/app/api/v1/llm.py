@@ -0,0 +1,114 @@
+"""LLM client monitoring API endpoints."""
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import AdminUser
+from app.db.session import get_db
+from app.schemas.llm import (
+    LLMCacheStats,
+    LLMCircuitBreaker,
+    LLMCircuitBreakerResponse,
+    LLMCoalescingStats,
+    LLMConcurrencyLimit,
+    LLMConcurrencyLimitResponse,
+    LLMPoolStats,
+    LLMPoolStatsResponse,
+    LLMReplicaStatsResponse,
+    LLMRetryStats,
+    ResponseOffloadJob,
+    ResponseStorageStats,
+    ResultWriterStats,
+)
+from app.services.response_store import ResponseOffloader, storage_report
+from app.services.result_writer import result_writer
+from app.utils.llm_client import llm_client
+from app.utils.response_cache import response_cache
+from app.worker import job_worker
+
+router = APIRouter()
+
+
+@router.get("/pools", response_model=LLMPoolStatsResponse)
+async def get_pool_stats(current_user: AdminUser):
+    """Get connection pool statistics for every LLM endpoint in use."""
+    items = [LLMPoolStats(**stats) for stats in llm_client.pool_stats()]
+    return LLMPoolStatsResponse(items=items, total=len(items))
+
+
+@router.get("/limits", response_model=LLMConcurrencyLimitResponse)
+async def get_concurrency_limits(current_user: AdminUser):
+    """Get adaptive concurrency limits, queue depth and rejections per endpoint."""
+    items = [LLMConcurrencyLimit(**stats) for stats in llm_client.concurrency.stats()]
+    return LLMConcurrencyLimitResponse(
+        enabled=llm_client.concurrency.enabled, items=items, total=len(items)
+    )
+
+
+@router.get("/breakers", response_model=LLMCircuitBreakerResponse)
+async def get_circuit_breakers(current_user: AdminUser):
+    """Get circuit breaker state per endpoint."""
+    items = [LLMCircuitBreaker(**stats) for stats in llm_client.breakers.stats()]
+    return LLMCircuitBreakerResponse(
+        enabled=llm_client.breakers.enabled, items=items, total=len(items)
+    )
+
+
+@router.get("/replicas", response_model=LLMReplicaStatsResponse)
+async def get_replica_stats(current_user: AdminUser):
+    """Get load and prefix-affinity hit rates per replica of multi-replica models."""
+    return LLMReplicaStatsResponse(**llm_client.balancer_stats())
+
+
+@router.get("/retries", response_model=LLMRetryStats)
+async def get_retry_stats(current_user: AdminUser):
+    """Get hedging and retry counters and the retry budget."""
+    return LLMRetryStats(**llm_client.retry_stats())
+
+
+@router.get("/coalescing", response_model=LLMCoalescingStats)
+async def get_coalescing_stats(current_user: AdminUser):
+    """Get statistics for identical requests sharing one upstream call."""
+    return LLMCoalescingStats(**llm_client.coalescing_stats())
+
+
+@router.get("/cache", response_model=LLMCacheStats)
+async def get_cache_stats(current_user: AdminUser):
+    """Get deterministic response cache statistics."""
+    return LLMCacheStats(**response_cache.stats())
+
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_cache(current_user: AdminUser):
+    """Drop every cached response."""
+    await response_cache.clear()
+    return None
+
+
+@router.get("/writes", response_model=ResultWriterStats)
+async def get_result_writer_stats(current_user: AdminUser):
+    """Get flush latency, rows per flush and backpressure of result writes."""
+    return ResultWriterStats(**result_writer.stats())
+
+
+@router.get("/storage", response_model=ResponseStorageStats)
+async def get_response_storage(
+    current_user: AdminUser, db: AsyncSession = Depends(get_db)
+):
+    """Get inline vs. compressed response sizes and the bytes saved."""
+    return ResponseStorageStats(**await storage_report(db))
+
+
+@router.post(
+    "/storage/offload",
+    response_model=ResponseOffloadJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def offload_responses(
+    current_user: AdminUser, db: AsyncSession = Depends(get_db)
+):
+    """Queue a background move of existing large responses to compressed storage."""
+    job = ResponseOffloader.enqueue(db)
+    await db.commit()
+    job_worker.notify()
+    return ResponseOffloadJob(job_id=job.id, status=job.status)
@@ -28,18 +28,32 @@ async def list_models(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Items per page"),
     active_only: bool = Query(True, description="Only show active models"),
+    cursor: str | None = Query(None, description="next_cursor of the last page"),
+    include_total: bool = Query(True, description="Count matching models"),
     current_user: ActiveUser = None,
     model_service: ModelService = Depends(get_model_service),
 ):
     """Get paginated list of models."""
     skip = (page - 1) * size
-    models, total = await model_service.get_models(
-        skip=skip, limit=size, active_only=active_only
-    )
+    try:
+        models = await model_service.get_models(
+            skip=skip,
+            limit=size,
+            active_only=active_only,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
     return ModelListResponse(
-        items=[ModelResponse.model_validate(m) for m in models],
-        total=total,
+        items=[ModelResponse.model_validate(m) for m in models.items],
+        total=models.total,
+        total_exact=models.total_exact,
+        next_cursor=models.next_cursor,
         page=page,
         size=size,
     )
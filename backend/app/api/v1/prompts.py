@@ -32,22 +32,34 @@ async def list_prompts(
     size: int = Query(20, ge=1, le=100, description="Items per page"),
     tags: list[str] | None = Query(None, description="Filter by tags"),
     favorites_only: bool = Query(False, description="Only show favorites"),
+    cursor: str | None = Query(None, description="next_cursor of the last page"),
+    include_total: bool = Query(True, description="Count matching prompts"),
     current_user: ActiveUser = None,
     prompt_service: PromptService = Depends(get_prompt_service),
 ):
     """Get paginated list of prompts for current user."""
     skip = (page - 1) * size
-    prompts, total = await prompt_service.get_prompts(
-        user_id=current_user.id,
-        skip=skip,
-        limit=size,
-        tags=tags,
-        favorites_only=favorites_only,
-    )
+    try:
+        prompts = await prompt_service.get_prompts(
+            user_id=current_user.id,
+            skip=skip,
+            limit=size,
+            tags=tags,
+            favorites_only=favorites_only,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
     return PromptListResponse(
-        items=[PromptResponse.model_validate(p) for p in prompts],
-        total=total,
+        items=[PromptResponse.model_validate(p) for p in prompts.items],
+        total=prompts.total,
+        total_exact=prompts.total_exact,
+        next_cursor=prompts.next_cursor,
         page=page,
         size=size,
     )
@@ -1,23 +1,47 @@
 """Test Runs API endpoints."""
 
+import json
+from contextlib import aclosing
+from datetime import datetime
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Cookie,
+    Depends,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import ActiveUser
-from app.db.session import get_db
-from app.models.model import Model
+from app.config import get_settings
+from app.db.session import async_session_maker, get_db
+from app.models.test_run import TestRunStatus
 from app.schemas.test_run import (
     TestRunCreate,
+    TestRunJobResponse,
     TestRunListSummaryResponse,
+    TestRunProgress,
     TestRunResponse,
-    TestRunSummary,
-    TestResultResponse,
+    TestRunSearchResponse,
+    TestRunSweepCreate,
+    TestRunSweepResponse,
 )
+from app.services.auth import AuthService
+from app.services.search import SearchService
 from app.services.test_run import TestRunService
+from app.utils.progress import progress_hub
+from app.worker import job_worker
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.post(
@@ -39,71 +63,289 @@ async def create_test_run(
     service = TestRunService(db)
     test_run = await service.create_and_execute_test(current_user.id, test_data)
 
-    # Build response with model names
-    results = []
-    for result in test_run.results:
-        # Get model name
-        model = await db.get(Model, result.model_id)
-        model_name = model.name if model else "Unknown"
-
-        results.append(
-            TestResultResponse(
-                id=result.id,
-                model_id=result.model_id,
-                model_name=model_name,
-                parameters=result.parameters,
-                response=result.response,
-                latency_ms=result.latency_ms,
-                token_count=result.token_count,
-                error=result.error,
-                created_at=result.created_at,
-            )
+    return await service.run_response(test_run)
+
+
+@router.post(
+    "/jobs",
+    response_model=TestRunJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_test_run_job(
+    test_data: TestRunCreate,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> TestRunJobResponse:
+    """
+    Queue a test run for background execution.
+
+    Returns immediately with the run id. Poll ``progress_url`` or subscribe
+    to ``events_url`` (Server-Sent Events) for per-model progress, and fetch
+    the run itself for full results.
+    """
+    service = TestRunService(db)
+    test_run = await service.create_test_run_job(current_user.id, test_data)
+    job_worker.notify()
+
+    return TestRunJobResponse(
+        id=test_run.id,
+        status=test_run.status,
+        progress_url=f"/api/v1/test-runs/{test_run.id}/progress",
+        events_url=f"/api/v1/test-runs/{test_run.id}/events",
+    )
+
+
+@router.post(
+    "/sweeps",
+    response_model=TestRunJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_sweep(
+    sweep_data: TestRunSweepCreate,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> TestRunJobResponse:
+    """
+    Queue a parameter sweep for background execution.
+
+    The sweep is expanded server-side into one config per model and
+    parameter combination and runs as a single test run. Fetch the grouped
+    results from ``/test-runs/{id}/sweep``.
+    """
+    service = TestRunService(db)
+    try:
+        test_run = await service.create_sweep_job(current_user.id, sweep_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
+    job_worker.notify()
 
-    return TestRunResponse(
+    return TestRunJobResponse(
         id=test_run.id,
-        user_id=test_run.user_id,
-        prompt_template_id=test_run.prompt_template_id,
-        user_message=test_run.user_message,
-        system_prompt=test_run.system_prompt,
-        results=results,
-        created_at=test_run.created_at,
-        updated_at=test_run.updated_at,
+        status=test_run.status,
+        progress_url=f"/api/v1/test-runs/{test_run.id}/progress",
+        events_url=f"/api/v1/test-runs/{test_run.id}/events",
     )
 
 
+@router.get("/{test_run_id}/sweep", response_model=TestRunSweepResponse)
+async def get_sweep(
+    test_run_id: UUID,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> TestRunSweepResponse:
+    """Get a run's results grouped by parameter combination."""
+    service = TestRunService(db)
+    sweep = await service.get_sweep(test_run_id, current_user.id)
+
+    if not sweep:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test run not found",
+        )
+    return sweep
+
+
+@router.get("/{test_run_id}/progress", response_model=TestRunProgress)
+async def get_test_run_progress(
+    test_run_id: UUID,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> TestRunProgress:
+    """Get per-model progress of a test run."""
+    service = TestRunService(db)
+    progress = await service.get_progress(test_run_id, current_user.id)
+
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test run not found",
+        )
+    return progress
+
+
+@router.get("/{test_run_id}/events")
+async def stream_test_run_progress(
+    test_run_id: UUID,
+    current_user: ActiveUser,
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Subscribe to a test run's progress as Server-Sent Events.
+
+    Sends a ``progress`` event whenever a model finishes or the run changes
+    status, and closes once the run is complete or failed.
+    """
+    progress = await TestRunService(db).get_progress(test_run_id, current_user.id)
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test run not found",
+        )
+    # Return the request's connection to the pool; each check below uses
+    # its own short session
+    await db.commit()
+
+    async def events():
+        nonlocal progress
+        while True:
+            yield f"event: progress\ndata: {progress.model_dump_json()}\n\n"
+            if progress.status in (TestRunStatus.COMPLETE, TestRunStatus.FAILED):
+                return
+
+            previous = progress
+            while progress == previous:
+                await progress_hub.wait(
+                    test_run_id, timeout=settings.job_progress_poll_seconds
+                )
+                async with async_session_maker() as session:
+                    progress = await TestRunService(session).get_progress(
+                        test_run_id, current_user.id
+                    )
+                if progress is None:
+                    return
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.websocket("/ws")
+async def stream_test_run(
+    websocket: WebSocket,
+    access_token: Annotated[str | None, Cookie()] = None,
+) -> None:
+    """
+    Execute test runs over a WebSocket, streaming tokens from every model.
+
+    The client sends a ``TestRunCreate`` JSON message; the server answers
+    with a ``run`` frame, then ``delta`` frames tagged with ``model_id`` as
+    each model generates, a ``result`` frame once a model's result is saved,
+    and a final ``done`` frame. Several runs may be sent on one connection.
+    """
+    # Browsers send the session cookie on cross-site WebSocket handshakes
+    # too, so only accept pages served from an allowed origin
+    if websocket.headers.get("origin") not in settings.cors_origin_list:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    # Authenticate with a short-lived session; don't hold one per connection
+    user = None
+    if access_token:
+        async with async_session_maker() as db:
+            user = await AuthService(db).get_current_user(access_token)
+    if not user or not user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                # Malformed JSON is reported as a validation error too
+                test_data = TestRunCreate.model_validate_json(message)
+            except ValidationError as e:
+                await websocket.send_json(
+                    {"type": "error", "detail": json.loads(e.json())}
+                )
+                continue
+
+            async with async_session_maker() as db:
+                service = TestRunService(db)
+                frames = service.stream_and_execute_test(
+                    user.id, test_data, buffer_size=settings.ws_send_buffer_size
+                )
+                # aclosing() cancels in-flight model calls if the send fails
+                async with aclosing(frames):
+                    async for frame in frames:
+                        await websocket.send_json(frame)
+
+            await websocket.send_json({"type": "done"})
+    except WebSocketDisconnect:
+        pass
+
+
 @router.get("", response_model=TestRunListSummaryResponse)
 async def get_test_runs(
     current_user: ActiveUser,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the last page"),
+    include_total: bool = Query(True, description="Count the user's runs"),
+    system_prompt_hash: str | None = Query(
+        None,
+        pattern="^[0-9a-f]{64}$",
+        description="Only runs whose system prompt has this SHA-256 (hex, UTF-8)",
+    ),
     db: AsyncSession = Depends(get_db),
 ) -> TestRunListSummaryResponse:
-    """Get paginated list of test runs for the current user."""
-    service = TestRunService(db)
-    test_runs, total = await service.get_test_runs(
-        user_id=current_user.id, skip=skip, limit=limit
-    )
+    """
+    Get paginated list of test runs for the current user.
 
-    items = [
-        TestRunSummary(
-            id=run.id,
-            user_message=run.user_message,
-            system_prompt=run.system_prompt,
-            prompt_template_id=run.prompt_template_id,
-            result_count=len(run.results),
-            created_at=run.created_at,
+    Pass ``next_cursor`` back as ``cursor`` to fetch the following page;
+    unlike ``skip``, its cost does not grow with the page number.
+    Prompts are stored by hash, so filtering on ``system_prompt_hash`` is
+    an index lookup.
+    """
+    service = TestRunService(db)
+    try:
+        test_runs = await service.get_test_runs(
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            system_prompt_hash=system_prompt_hash,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
-        for run in test_runs
-    ]
 
     return TestRunListSummaryResponse(
-        items=items,
-        total=total,
+        items=await service.summarize(test_runs.items),
+        total=test_runs.total,
+        total_exact=test_runs.total_exact,
+        next_cursor=test_runs.next_cursor,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get("/search", response_model=TestRunSearchResponse)
+async def search_test_runs(
+    current_user: ActiveUser,
+    q: str = Query(..., min_length=1, max_length=500),
+    model_id: UUID | None = Query(None, description="Only this model's results"),
+    created_from: datetime | None = Query(None, description="Runs created at or after"),
+    created_to: datetime | None = Query(None, description="Runs created before"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+) -> TestRunSearchResponse:
+    """
+    Search the current user's test runs by prompt and model response.
+
+    ``q`` accepts web search syntax: quoted phrases, ``or`` and ``-word``.
+    Hits are model results, best match first, with matching words in the
+    prompt and response excerpts wrapped in ``<mark>``.
+    """
+    service = SearchService(db)
+    hits = await service.search(
+        current_user.id,
+        q,
+        model_id=model_id,
+        created_from=created_from,
+        created_to=created_to,
         skip=skip,
         limit=limit,
     )
 
+    return TestRunSearchResponse(items=hits, query=q, skip=skip, limit=limit)
+
 
 @router.get("/{test_run_id}", response_model=TestRunResponse)
 async def get_test_run(
@@ -121,36 +363,7 @@ async def get_test_run(
             detail="Test run not found",
         )
 
-    # Build response with model names
-    results = []
-    for result in test_run.results:
-        model = await db.get(Model, result.model_id)
-        model_name = model.name if model else "Unknown"
-
-        results.append(
-            TestResultResponse(
-                id=result.id,
-                model_id=result.model_id,
-                model_name=model_name,
-                parameters=result.parameters,
-                response=result.response,
-                latency_ms=result.latency_ms,
-                token_count=result.token_count,
-                error=result.error,
-                created_at=result.created_at,
-            )
-        )
-
-    return TestRunResponse(
-        id=test_run.id,
-        user_id=test_run.user_id,
-        prompt_template_id=test_run.prompt_template_id,
-        user_message=test_run.user_message,
-        system_prompt=test_run.system_prompt,
-        results=results,
-        created_at=test_run.created_at,
-        updated_at=test_run.updated_at,
-    )
+    return await service.run_response(test_run)
 
 
 @router.delete("/{test_run_id}", status_code=status.HTTP_204_NO_CONTENT)
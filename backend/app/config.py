@@ -41,6 +41,121 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: str = "http://localhost:3000,http://localhost:5173"
 
+    # LLM client connection pool (one pool per endpoint origin)
+    llm_timeout: float = 60.0
+    llm_connect_timeout: float = 5.0
+    llm_pool_max_connections: int = 100
+    llm_pool_max_keepalive: int = 20
+    llm_pool_keepalive_expiry: float = 30.0
+    llm_http2: bool = False
+
+    # Share one upstream call among identical in-flight deterministic requests
+    llm_coalesce_requests: bool = True
+
+    # Adaptive (AIMD) concurrency limit per endpoint; a model can lower its
+    # cap with metadata {"max_concurrency": N}
+    llm_concurrency_enabled: bool = True
+    llm_concurrency_initial: int = 8
+    llm_concurrency_min: int = 1
+    llm_concurrency_max: int = 64
+    llm_concurrency_max_queue: int = 256
+    llm_concurrency_latency_tolerance: float = 2.0
+
+    # Circuit breaker per endpoint: open after N consecutive failures, probe
+    # again after the recovery period
+    llm_breaker_enabled: bool = True
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_recovery_seconds: float = 30.0
+    # Probe multi-replica models' endpoints in the background (0 disables)
+    replica_probe_seconds: float = 30.0
+
+    # Replica selection for models with several endpoints:
+    # "least_outstanding" or "power_of_two"
+    llm_load_balancing: str = "least_outstanding"
+
+    # Prefix affinity: consistent-hash requests by system prompt (or the
+    # first N message bytes) so vLLM's prefix cache is reused, as long as
+    # the replica is under load_factor x the average outstanding requests
+    llm_prefix_affinity: bool = True
+    llm_prefix_affinity_bytes: int = 1024
+    llm_prefix_affinity_load_factor: float = 1.25
+
+    # Hedging: duplicate a call that outlives the endpoint's latency
+    # percentile (needs min_samples successful calls first)
+    llm_hedge_enabled: bool = False
+    llm_hedge_percentile: float = 95.0
+    llm_hedge_min_samples: int = 20
+
+    # Retries of connection errors and 5xx with jittered exponential
+    # backoff. Retries and hedges draw from one budget: each request adds
+    # `ratio` tokens, plus `min_per_second` tokens per second
+    llm_retry_max_attempts: int = 3
+    llm_retry_base_delay: float = 0.2
+    llm_retry_max_delay: float = 5.0
+    llm_retry_budget_ratio: float = 0.1
+    llm_retry_budget_min_per_second: float = 1.0
+
+    # Deterministic response cache (temperature 0 or fixed seed)
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 1024
+    llm_cache_ttl_seconds: int = 3600
+    llm_cache_persistent: bool = False  # Also store entries in Postgres
+    llm_cache_purge_interval_seconds: float = 300.0  # Expired-entry sweep
+
+    # List endpoints count at most this many rows; past it the total is
+    # reported as a lower bound
+    pagination_count_cap: int = 10000
+
+    # In-process cache of model names for result responses; renames in
+    # other processes show up after the TTL
+    model_name_cache_seconds: float = 60.0
+
+    # Background jobs (POST /api/v1/test-runs/jobs), claimed from the jobs
+    # table by any number of worker processes
+    job_worker_enabled: bool = True  # Run a worker inside the API process
+    job_workers: int = 4  # Jobs executed concurrently per worker
+    job_lease_seconds: float = 60.0
+    job_heartbeat_seconds: float = 15.0
+    job_poll_seconds: float = 1.0
+    job_max_attempts: int = 3
+    job_retry_delay_seconds: float = 10.0
+    job_progress_poll_seconds: float = 2.0  # Progress stream re-check interval
+
+    # Batch evaluation (POST /api/v1/batches)
+    batch_max_items: int = 10000  # Dataset rows per upload
+    batch_concurrency: int = 16  # In-flight model calls per batch
+
+    # Write-behind buffer group-committing test and batch results
+    result_write_size: int = 200  # Max rows per INSERT
+    result_flush_ms: float = 20.0  # Max time a result waits for its group
+    result_buffer_max: int = 2000  # Queued results before writers block
+
+    # Responses larger than this many bytes are zstd-compressed into the
+    # test_result_blobs table and read only by detail views
+    response_offload_bytes: int = 4096
+    response_compression_level: int = 3
+    response_offload_batch: int = 500  # Rows per step of the background move
+
+    # Parameter sweeps (POST /api/v1/test-runs/sweeps)
+    sweep_max_calls: int = 200  # Expanded configs x models per sweep
+
+    # Benchmarks (POST /api/v1/benchmarks); load is sent without coalescing,
+    # retries or the adaptive limiter so the endpoint itself is measured
+    benchmark_max_concurrency: int = 256  # Highest step; also caps QPS in-flight
+    benchmark_max_steps: int = 20
+    benchmark_max_step_seconds: float = 600.0
+
+    # Capacity probes (benchmarks with mode "probe"): the knee is the last
+    # step before throughput stops growing, p50 latency grows past the
+    # tolerance or errors appear
+    probe_latency_tolerance: float = 2.0  # Multiple of the 1-call p50
+    probe_min_gain: float = 0.25  # Fraction of ideal throughput gain per step
+    probe_max_error_rate: float = 0.01
+
+    # WebSocket streaming (max frames buffered per connection before
+    # deltas are coalesced)
+    ws_send_buffer_size: int = 64
+
     @property
     def admin_email_list(self) -> list[str]:
         """Parse admin emails into a list."""
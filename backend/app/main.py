@@ -6,8 +6,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.api.v1 import auth, models, prompts, test_runs
+from app.api.v1 import auth, batches, benchmarks, llm, models, prompts, test_runs
 from app.config import get_settings
+from app.services.benchmark_jobs import benchmark_client
+from app.services.replica_probes import replica_prober
+from app.services.result_writer import result_writer
+from app.utils.llm_client import llm_client
+from app.worker import job_worker
 
 settings = get_settings()
 
@@ -17,9 +22,18 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     print(f"Starting {settings.app_name}...")
+    if settings.job_worker_enabled:
+        await job_worker.start()
+    await replica_prober.start()
     yield
     # Shutdown
     print(f"Shutting down {settings.app_name}...")
+    await replica_prober.stop()
+    await job_worker.stop()
+    # Commit results still buffered from interrupted runs
+    await result_writer.stop()
+    await llm_client.aclose()
+    await benchmark_client.aclose()
 
 
 app = FastAPI(
@@ -63,3 +77,8 @@ app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(models.router, prefix="/api/v1/models", tags=["models"])
 app.include_router(prompts.router, prefix="/api/v1/prompts", tags=["prompts"])
 app.include_router(test_runs.router, prefix="/api/v1/test-runs", tags=["test-runs"])
+app.include_router(batches.router, prefix="/api/v1/batches", tags=["batches"])
+app.include_router(
+    benchmarks.router, prefix="/api/v1/benchmarks", tags=["benchmarks"]
+)
+app.include_router(llm.router, prefix="/api/v1/llm", tags=["llm"])
@@ -3,13 +3,24 @@
 from app.models.user import User
 from app.models.model import Model
 from app.models.prompt import PromptTemplate, PromptVersion
-from app.models.test_run import TestRun, TestResult
+from app.models.text import StoredText
+from app.models.test_run import TestRun, TestResult, TestResultBlob
+from app.models.response_cache import CachedResponse
+from app.models.job import Job
+from app.models.batch import Batch
+from app.models.benchmark import Benchmark
 
 __all__ = [
     "User",
     "Model",
     "PromptTemplate",
     "PromptVersion",
+    "StoredText",
     "TestRun",
     "TestResult",
+    "TestResultBlob",
+    "CachedResponse",
+    "Job",
+    "Batch",
+    "Benchmark",
 ]
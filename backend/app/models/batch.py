@@ -0,0 +1,60 @@
+"""Batch evaluation model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base, TimestampMixin, UUIDMixin
+from app.models.test_run import TestRunStatus
+
+
+class Batch(Base, UUIDMixin, TimestampMixin):
+    """A dataset of messages evaluated against a set of model configs.
+
+    Each dataset row is stored as a ``TestRun`` (with ``batch_id`` and
+    ``item_index``) holding one result per model config.
+    """
+
+    __tablename__ = "batches"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(
+        String(20), default=TestRunStatus.PENDING, nullable=False
+    )
+    config: Mapped[dict] = mapped_column(JSONB, nullable=False)  # {models, stream}
+    item_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # item_count x model configs
+    completed: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # Results written, including failed ones
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Relationships
+    test_runs: Mapped[list["TestRun"]] = relationship(
+        "TestRun", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<Batch {self.id}>"
+
+
+# Avoid circular imports
+from app.models.test_run import TestRun
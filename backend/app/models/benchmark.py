@@ -0,0 +1,54 @@
+"""Benchmark (load test) model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TimestampMixin, UUIDMixin
+from app.models.test_run import TestRunStatus
+
+
+class Benchmark(Base, UUIDMixin, TimestampMixin):
+    """A load test driving one model at a series of concurrency or QPS steps.
+
+    Each finished step's measurements are appended to ``steps``, so a
+    benchmark resumed by another worker only reruns unfinished steps.
+    """
+
+    __tablename__ = "benchmarks"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    model_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("models.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), default=TestRunStatus.PENDING, nullable=False
+    )
+    config: Mapped[dict] = mapped_column(JSONB, nullable=False)  # BenchmarkCreate
+    steps: Mapped[list] = mapped_column(
+        JSONB, default=list, nullable=False
+    )  # BenchmarkStep per finished step
+    recommended_concurrency: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )  # Saturation knee found by a probe
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Benchmark {self.id}>"
@@ -1,6 +1,6 @@
 """LLM Model model."""
 
-from sqlalchemy import Boolean, String, Text
+from sqlalchemy import Boolean, Index, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,23 +11,35 @@ class Model(Base, UUIDMixin, TimestampMixin):
     """LLM Model configuration."""
 
     __tablename__ = "models"
+    __table_args__ = (
+        # Keyset pages of the model list, newest first
+        Index("ix_models_created", "created_at", "id"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     model_name: Mapped[str | None] = mapped_column(
         String(255), nullable=True
     )  # Actual model name for API (e.g., "meta-llama/Llama-2-7b-chat-hf")
     endpoint_url: Mapped[str] = mapped_column(String(512), nullable=False)
+    replica_urls: Mapped[list[str] | None] = mapped_column(
+        JSONB, nullable=True
+    )  # Other endpoints serving the same weights
     api_key: Mapped[str | None] = mapped_column(Text, nullable=True)  # Encrypted
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     metadata_: Mapped[dict | None] = mapped_column(
         "metadata", JSONB, nullable=True
-    )  # {max_tokens, context_length, model_type}
+    )  # {max_tokens, context_length, model_type, max_concurrency}
 
     # Relationships
     test_results: Mapped[list["TestResult"]] = relationship(
         "TestResult", back_populates="model", cascade="all, delete-orphan"
     )
 
+    @property
+    def endpoint_urls(self) -> list[str]:
+        """Primary endpoint followed by any replicas."""
+        return [self.endpoint_url, *(self.replica_urls or [])]
+
     def __repr__(self) -> str:
         return f"<Model {self.name}>"
 
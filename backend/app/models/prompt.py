@@ -2,7 +2,7 @@
 
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,10 @@ class PromptTemplate(Base, UUIDMixin, TimestampMixin):
     """Reusable system prompt template."""
 
     __tablename__ = "prompt_templates"
+    __table_args__ = (
+        # Keyset pages of a user's prompts, most recently updated first
+        Index("ix_prompt_templates_user_updated", "user_id", "updated_at", "id"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -1,18 +1,87 @@
 """Test Run and Test Result models."""
 
 import uuid
+from enum import StrEnum
 
-from sqlalchemy import ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    event,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import (
+    Mapped,
+    Session,
+    column_property,
+    mapped_column,
+    relationship,
+    validates,
+)
 
 from app.db.base import Base, TimestampMixin, UUIDMixin
+from app.models.text import StoredText, text_hash
+from app.utils.compression import decompress
+
+RESPONSE_PREVIEW_CHARS = 200
+# Full-text search: language-neutral parsing (no stemming), so prompts and
+# responses in any language match word for word
+SEARCH_CONFIG = "simple"
+SEARCH_MAX_CHARS = 100_000  # Indexed prefix of a text (tsvector max 1MB)
+
+
+class TestRunStatus(StrEnum):
+    """Lifecycle of a test run."""
+
+    PENDING = "pending"  # Queued for a background worker
+    RUNNING = "running"  # Models called, no result saved yet
+    PARTIAL = "partial"  # Some models' results saved, others still running
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+
+def _stored_text(text_hash_column) -> column_property:
+    """Read-through of a text referenced by hash, loaded with the row."""
+    return column_property(
+        select(StoredText.content)
+        .where(StoredText.hash == text_hash_column)
+        .correlate_except(StoredText)
+        .scalar_subquery()
+    )
 
 
 class TestRun(Base, UUIDMixin, TimestampMixin):
-    """A single test execution session."""
+    """
+    A single test execution session.
+
+    The user message and system prompt live once each in the ``texts``
+    table and are referenced by hash, so a prompt repeated across a batch
+    is stored once. ``user_message`` and ``system_prompt`` read through to
+    them (in Python and in queries) and can be assigned as before: the
+    texts are stored when the run is flushed.
+    """
 
     __tablename__ = "test_runs"
+    __table_args__ = (
+        # Keyset pages of a user's history, newest first (scanned backwards)
+        Index(
+            "ix_test_runs_user_history",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("batch_id IS NULL"),
+        ),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -22,8 +91,30 @@ class TestRun(Base, UUIDMixin, TimestampMixin):
         ForeignKey("prompt_templates.id", ondelete="SET NULL"),
         nullable=True,
     )
-    user_message: Mapped[str] = mapped_column(Text, nullable=False)
-    system_prompt: Mapped[str | None] = mapped_column(Text, nullable=True)
+    user_message_hash: Mapped[str] = mapped_column(
+        String(64), ForeignKey("texts.hash"), nullable=False, index=True
+    )
+    system_prompt_hash: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("texts.hash"), nullable=True, index=True
+    )
+    user_message: Mapped[str] = _stored_text(user_message_hash)
+    system_prompt: Mapped[str | None] = _stored_text(system_prompt_hash)
+    status: Mapped[str] = mapped_column(
+        String(20), default=TestRunStatus.COMPLETE, nullable=False
+    )
+    config: Mapped[dict | None] = mapped_column(
+        JSONB, nullable=True
+    )  # {models, stream} needed to execute a queued run
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    batch_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("batches.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    item_index: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )  # Row of the batch dataset
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="test_runs")
@@ -42,6 +133,15 @@ class TestResult(Base, UUIDMixin, TimestampMixin):
     """Result from a single model within a test run."""
 
     __tablename__ = "test_results"
+    __table_args__ = (
+        # One result per (row, config): the checkpoint resumed batches skip
+        Index(
+            "uq_test_results_run_config",
+            "test_run_id",
+            "config_index",
+            unique=True,
+        ),
+    )
 
     test_run_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -59,18 +159,155 @@ class TestResult(Base, UUIDMixin, TimestampMixin):
         JSONB, nullable=False
     )  # {temperature, max_tokens, top_p}
     response: Mapped[str | None] = mapped_column(Text, nullable=True)
+    response_preview: Mapped[str | None] = mapped_column(
+        String(RESPONSE_PREVIEW_CHARS), nullable=True
+    )  # Start of the response, for listings that skip the full text
+    response_offloaded: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False
+    )  # Response moved to the blob table; response is NULL
     latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     token_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ttft_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    tokens_per_second: Mapped[float | None] = mapped_column(Float, nullable=True)
+    inter_token_latency: Mapped[dict | None] = mapped_column(
+        JSONB, nullable=True
+    )  # {count, mean, p50, p90, p99, max} in ms
+    cache_hit: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False
+    )  # Served from the response cache; exclude from latency stats
+    attempts: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )  # Requests sent to the endpoint, including retries and hedges
+    config_index: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )  # Position in the run's (or batch's) model configs
+    samples: Mapped[list | None] = mapped_column(
+        JSONB, nullable=True
+    )  # Every completion of an n > 1 request; response holds the first
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Relationships
     test_run: Mapped["TestRun"] = relationship("TestRun", back_populates="results")
     model: Mapped["Model"] = relationship("Model", back_populates="test_results")
+    # Loaded only where asked for (joinedload), never lazily
+    blob: Mapped["TestResultBlob | None"] = relationship(
+        "TestResultBlob",
+        uselist=False,
+        lazy="raise",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    @validates("response")
+    def _set_preview(self, key: str, response: str | None) -> str | None:
+        self.response_preview = (
+            response[:RESPONSE_PREVIEW_CHARS] if response is not None else None
+        )
+        return response
+
+    @property
+    def full_response(self) -> str | None:
+        """The response, read from its blob if it was offloaded."""
+        if self.response_offloaded:
+            return self.blob.text if self.blob is not None else None
+        return self.response
 
     def __repr__(self) -> str:
         return f"<TestResult {self.id}>"
 
 
+class TestResultBlob(Base):
+    """Compressed text of a large response, kept out of ``test_results``."""
+
+    __tablename__ = "test_result_blobs"
+    __table_args__ = (
+        Index("ix_test_result_blobs_search", "search_vector", postgresql_using="gin"),
+    )
+
+    result_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("test_results.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    codec: Mapped[str] = mapped_column(String(10), nullable=False)
+    raw_size: Mapped[int] = mapped_column(Integer, nullable=False)  # UTF-8 bytes
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"), nullable=True, deferred=True
+    )  # Set on Postgres when written; searched like test_results'
+
+    @property
+    def text(self) -> str:
+        return decompress(self.codec, self.data).decode()
+
+    def __repr__(self) -> str:
+        return f"<TestResultBlob {self.result_id}>"
+
+
+# Generated tsvector columns with GIN indexes for full-text search. They are
+# Postgres-only DDL rather than mapped columns, so other databases create
+# the tables without them and queries select them only when searching.
+_search_ddl = {
+    StoredText.__table__: [
+        "ALTER TABLE texts ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        f"to_tsvector('{SEARCH_CONFIG}', left(content, {SEARCH_MAX_CHARS}))"
+        ") STORED",
+        "CREATE INDEX ix_texts_search ON texts USING gin (search_vector)",
+    ],
+    TestResult.__table__: [
+        "ALTER TABLE test_results ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        f"to_tsvector('{SEARCH_CONFIG}', "
+        f"left(coalesce(response, ''), {SEARCH_MAX_CHARS}))"
+        ") STORED",
+        "CREATE INDEX ix_test_results_search ON test_results "
+        "USING gin (search_vector)",
+    ],
+}
+for table, statements in _search_ddl.items():
+    for statement in statements:
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+
+
+@event.listens_for(Session, "before_flush")
+def _store_texts(session: Session, flush_context, instances) -> None:
+    """Point runs at their texts by hash, inserting texts not stored yet."""
+    texts = {}
+    for obj in (*session.new, *session.dirty):
+        if not isinstance(obj, TestRun):
+            continue
+        attrs = inspect(obj).attrs
+        new = obj in session.new
+        for name in ("user_message", "system_prompt"):
+            if not new and not attrs[name].history.has_changes():
+                continue
+            content = getattr(obj, name)
+            if new:
+                # Set even if unset: untouched read-through columns are
+                # expired after the INSERT, and reloading them is lazy IO
+                setattr(obj, name, content)
+            key = text_hash(content) if content is not None else None
+            setattr(obj, f"{name}_hash", key)
+            if key is not None:
+                texts[key] = content
+    if not texts:
+        return
+
+    connection = session.connection()
+    insert = (
+        postgresql.insert
+        if connection.dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    connection.execute(
+        insert(StoredText).on_conflict_do_nothing(index_elements=[StoredText.hash]),
+        [{"hash": key, "content": content} for key, content in texts.items()],
+    )
+
+
 # Avoid circular imports
 from app.models.user import User
 from app.models.prompt import PromptTemplate
@@ -0,0 +1,31 @@
+"""Content-addressed text model."""
+
+import hashlib
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+def text_hash(content: str) -> str:
+    """Key a text is stored under: hex SHA-256 of its UTF-8 encoding."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class StoredText(Base):
+    """A distinct prompt or message, stored once and referenced by hash."""
+
+    __tablename__ = "texts"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<StoredText {self.hash[:12]}>"
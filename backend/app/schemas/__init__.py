@@ -21,8 +21,32 @@ from app.schemas.test_run import (
     TestRunResponse,
     TestResultResponse,
     TestRunListResponse,
+    ResultPreview,
     TestRunSummary,
     TestRunListSummaryResponse,
+    TestRunSearchHit,
+    TestRunSearchResponse,
+    TestRunJobResponse,
+    ModelProgress,
+    TestRunProgress,
+    SweepAxis,
+    SweepSpec,
+    TestRunSweepCreate,
+    SweepGroup,
+    TestRunSweepResponse,
+)
+from app.schemas.batch import (
+    BatchItem,
+    BatchCreate,
+    BatchProgress,
+    BatchResponse,
+    BatchListResponse,
+)
+from app.schemas.benchmark import (
+    BenchmarkCreate,
+    BenchmarkStep,
+    BenchmarkResponse,
+    BenchmarkListResponse,
 )
 
 __all__ = [
@@ -45,6 +69,26 @@ __all__ = [
     "TestRunResponse",
     "TestResultResponse",
     "TestRunListResponse",
+    "ResultPreview",
     "TestRunSummary",
     "TestRunListSummaryResponse",
+    "TestRunSearchHit",
+    "TestRunSearchResponse",
+    "TestRunJobResponse",
+    "ModelProgress",
+    "TestRunProgress",
+    "SweepAxis",
+    "SweepSpec",
+    "TestRunSweepCreate",
+    "SweepGroup",
+    "TestRunSweepResponse",
+    "BatchItem",
+    "BatchCreate",
+    "BatchProgress",
+    "BatchResponse",
+    "BatchListResponse",
+    "BenchmarkCreate",
+    "BenchmarkStep",
+    "BenchmarkResponse",
+    "BenchmarkListResponse",
 ]
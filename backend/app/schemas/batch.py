@@ -0,0 +1,61 @@
+"""Batch evaluation schemas."""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.schemas.test_run import ModelTestConfig
+
+
+class BatchItem(BaseModel):
+    """One row of a batch dataset (a line of the uploaded JSONL file)."""
+
+    user_message: str = Field(..., min_length=1, max_length=10000)
+    system_prompt: str | None = Field(default=None, max_length=10000)
+
+
+class BatchCreate(BaseModel):
+    """Settings for a batch, sent alongside the dataset upload."""
+
+    name: str | None = Field(default=None, max_length=255)
+    system_prompt: str | None = Field(
+        default=None, max_length=10000
+    )  # Default for rows without their own
+    models: list[ModelTestConfig] = Field(..., min_length=1, max_length=10)
+    stream: bool = False
+
+
+class BatchProgress(BaseModel):
+    """Progress of a batch."""
+
+    total: int
+    completed: int
+    failed: int
+    elapsed_seconds: float | None = None
+    throughput_per_second: float | None = None  # Results written per second
+    eta_seconds: float | None = None
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch response."""
+
+    id: UUID
+    name: str | None
+    status: str
+    item_count: int
+    models: list[ModelTestConfig]
+    progress: BatchProgress
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class BatchListResponse(BaseModel):
+    """Schema for paginated batch list."""
+
+    items: list[BatchResponse]
+    total: int
+    skip: int
+    limit: int
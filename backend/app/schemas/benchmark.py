@@ -0,0 +1,98 @@
+"""Benchmark (load test) schemas."""
+
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class BenchmarkCreate(BaseModel):
+    """Schema for starting a benchmark against one model.
+
+    ``concurrency`` mode keeps each step's number of requests in flight
+    (closed loop); ``qps`` mode starts requests at each step's target rate
+    regardless of how fast they finish (open loop). ``probe`` mode doubles
+    concurrency from 1 up to ``max_concurrency``, stops at the saturation
+    knee and stores it as the model's ``max_concurrency``.
+    """
+
+    model_id: UUID
+    user_message: str = Field(..., min_length=1, max_length=10000)
+    system_prompt: str | None = Field(default=None, max_length=10000)
+    temperature: float = Field(default=0.7, ge=0.0, le=2.0)
+    max_tokens: int = Field(default=256, ge=1, le=4096)
+    mode: Literal["concurrency", "qps", "probe"] = "concurrency"
+    concurrency: list[int] = Field(
+        default_factory=lambda: [1, 2, 4, 8, 16], min_length=1
+    )  # Steps of the ramp
+    qps: list[float] | None = Field(default=None, min_length=1)  # Target rates
+    max_concurrency: int = Field(default=64, ge=1)  # Highest probe step
+    step_seconds: float = Field(default=30.0, gt=0)
+    stream: bool = True  # Needed for TTFT and decode throughput
+
+    @model_validator(mode="after")
+    def check_steps(self) -> "BenchmarkCreate":
+        if self.mode == "qps":
+            if not self.qps:
+                raise ValueError("qps mode needs target rates in qps")
+            if any(rate <= 0 for rate in self.qps):
+                raise ValueError("Target rates must be positive")
+        elif any(level < 1 for level in self.concurrency):
+            raise ValueError("Concurrency steps must be at least 1")
+        return self
+
+    @property
+    def levels(self) -> list[float]:
+        """The step values for the selected mode."""
+        if self.mode == "qps":
+            return list(self.qps)
+        if self.mode == "probe":
+            levels = []
+            level = 1
+            while level < self.max_concurrency:
+                levels.append(level)
+                level *= 2
+            return levels + [self.max_concurrency]
+        return list(self.concurrency)
+
+
+class BenchmarkStep(BaseModel):
+    """Measurements for one concurrency or QPS step."""
+
+    concurrency: int | None = None
+    target_qps: float | None = None
+    duration_seconds: float
+    requests: int
+    errors: int
+    error_rate: float
+    throughput_rps: float  # Successful requests per second
+    token_throughput: float | None = None  # Prompt + completion tokens/sec
+    latency_ms: dict | None = None  # count/mean/p50/p90/p99/max
+    ttft_ms: dict | None = None
+    tokens_per_second: dict | None = None  # Per-request decode speed
+    error_samples: list[str] = []  # A few distinct error messages
+
+
+class BenchmarkResponse(BaseModel):
+    """Schema for benchmark response."""
+
+    id: UUID
+    model_id: UUID
+    status: str
+    config: BenchmarkCreate
+    steps: list[BenchmarkStep]
+    recommended_concurrency: int | None = None  # Probe result
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class BenchmarkListResponse(BaseModel):
+    """Schema for paginated benchmark list."""
+
+    items: list[BenchmarkResponse]
+    total: int
+    skip: int
+    limit: int
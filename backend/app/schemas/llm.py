@@ -0,0 +1,202 @@
+"""LLM client monitoring schemas."""
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class LLMPoolStats(BaseModel):
+    """Connection pool statistics for one endpoint origin."""
+
+    endpoint: str
+    http2: bool
+    requests: int
+    in_flight: int
+    errors: int
+    connections: int
+    idle_connections: int
+    http2_connections: int
+    max_connections: int | None
+    max_keepalive_connections: int | None
+    keepalive_expiry: float | None
+    age_seconds: float
+
+
+class LLMPoolStatsResponse(BaseModel):
+    """Schema for connection pool statistics list."""
+
+    items: list[LLMPoolStats]
+    total: int
+
+
+class LLMCacheStats(BaseModel):
+    """Response cache statistics."""
+
+    enabled: bool
+    entries: int
+    max_entries: int
+    ttl_seconds: int
+    persistent: bool
+    memory_hits: int
+    persistent_hits: int
+    misses: int
+    evictions: int
+    purged: int
+    purge_interval_seconds: float
+    hit_rate: float
+
+
+class LLMCoalescingStats(BaseModel):
+    """Request coalescing (single-flight) statistics."""
+
+    enabled: bool
+    in_flight: int
+    leaders: int
+    followers: int
+    streams_in_flight: int
+    stream_leaders: int
+    stream_followers: int
+
+
+class LLMModelCap(BaseModel):
+    """A model's fixed concurrency cap on one endpoint."""
+
+    model: str
+    cap: int
+    in_flight: int
+    queued: int
+
+
+class LLMConcurrencyLimit(BaseModel):
+    """Adaptive concurrency limiter state for one endpoint."""
+
+    endpoint: str
+    limit: int
+    adaptive_limit: float
+    min_limit: int
+    max_limit: int
+    in_flight: int
+    queued: int
+    max_queue: int
+    completed: int
+    rejected: int
+    decreases: int
+    baseline: float | None
+    model_caps: list[LLMModelCap] = []
+
+
+class LLMConcurrencyLimitResponse(BaseModel):
+    """Schema for concurrency limiter list."""
+
+    enabled: bool
+    items: list[LLMConcurrencyLimit]
+    total: int
+
+
+class LLMCircuitBreaker(BaseModel):
+    """Circuit breaker state for one endpoint."""
+
+    endpoint: str
+    state: str
+    consecutive_failures: int
+    failure_threshold: int
+    recovery_timeout: float
+    retry_after: float
+    rejected: int
+    times_opened: int
+    last_error: str | None
+
+
+class LLMCircuitBreakerResponse(BaseModel):
+    """Schema for circuit breaker list."""
+
+    enabled: bool
+    items: list[LLMCircuitBreaker]
+    total: int
+
+
+class LLMRetryBudget(BaseModel):
+    """Global retry budget state."""
+
+    ratio: float
+    min_per_second: float
+    balance: float
+    max_balance: float
+    withdrawn: int
+    denied: int
+
+
+class LLMHedgeDelay(BaseModel):
+    """Current hedge delay for one endpoint."""
+
+    endpoint: str
+    samples: int
+    hedge_delay_ms: float | None
+
+
+class LLMRetryStats(BaseModel):
+    """Hedging and retry statistics."""
+
+    hedging_enabled: bool
+    hedge_percentile: float
+    hedges: int
+    hedge_wins: int
+    max_attempts: int
+    retries: int
+    budget: LLMRetryBudget
+    endpoints: list[LLMHedgeDelay]
+
+
+class LLMReplicaStats(BaseModel):
+    """Load balancing counters for one replica."""
+
+    endpoint: str
+    outstanding: int
+    picks: int
+    affinity_requests: int
+    affinity_hits: int
+    affinity_hit_rate: float | None
+
+
+class LLMReplicaStatsResponse(BaseModel):
+    """Schema for replica load balancing stats."""
+
+    strategy: str
+    prefix_affinity: bool
+    items: list[LLMReplicaStats]
+
+
+class ResultWriterStats(BaseModel):
+    """Test result write-behind buffer statistics."""
+
+    rows_written: int
+    flushes: int
+    failed_flushes: int
+    pending: int
+    max_pending: int
+    backpressure_waits: int
+    max_rows: int
+    flush_ms: float
+    flush_latency_ms: dict | None = None  # count/mean/p50/p90/p99/max
+    batch_size: dict | None = None  # Rows per flush
+
+
+class ResponseStorageStats(BaseModel):
+    """Inline and compressed (offloaded) response storage."""
+
+    inline_results: int
+    inline_bytes: int
+    pending_results: int  # Over the threshold but still inline
+    offloaded_results: int
+    offloaded_raw_bytes: int
+    offloaded_stored_bytes: int
+    saved_bytes: int
+    compression_ratio: float | None
+    offload_bytes: int  # Threshold
+
+
+class ResponseOffloadJob(BaseModel):
+    """A queued move of existing large responses to compressed storage."""
+
+    job_id: UUID
+    status: str
@@ -12,6 +12,7 @@ class ModelBase(BaseModel):
     name: str
     model_name: str | None = None  # Actual model name for API
     endpoint_url: str
+    replica_urls: list[str] | None = None
     api_key: str | None = None
     metadata_: dict | None = None
 
@@ -28,6 +29,7 @@ class ModelUpdate(BaseModel):
     name: str | None = None
     model_name: str | None = None
     endpoint_url: str | None = None
+    replica_urls: list[str] | None = None
     api_key: str | None = None
     is_active: bool | None = None
     metadata_: dict | None = None
@@ -40,6 +42,7 @@ class ModelResponse(BaseModel):
     name: str
     model_name: str | None = None
     endpoint_url: str
+    replica_urls: list[str] | None = None
     is_active: bool
     metadata_: dict | None = None
     created_at: datetime
@@ -54,6 +57,16 @@ class ModelWithApiKey(ModelResponse):
     api_key: str | None = None
 
 
+class EndpointHealthCheck(BaseModel):
+    """Schema for the health of one model endpoint."""
+
+    endpoint_url: str
+    is_healthy: bool
+    status_code: int | None = None
+    latency_ms: int | None = None
+    error: str | None = None
+
+
 class ModelHealthCheck(BaseModel):
     """Schema for model health check response."""
 
@@ -63,12 +76,15 @@ class ModelHealthCheck(BaseModel):
     is_healthy: bool
     latency_ms: int | None = None
     error: str | None = None
+    replicas: list[EndpointHealthCheck] | None = None  # Multi-replica models
 
 
 class ModelListResponse(BaseModel):
     """Schema for paginated model list."""
 
     items: list[ModelResponse]
-    total: int
+    total: int | None  # None unless include_total
+    total_exact: bool = True  # False when total is a capped lower bound
+    next_cursor: str | None = None
     page: int
     size: int
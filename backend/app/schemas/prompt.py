@@ -47,7 +47,9 @@ class PromptListResponse(BaseModel):
     """Schema for paginated prompt list."""
 
     items: list[PromptResponse]
-    total: int
+    total: int | None  # None unless include_total
+    total_exact: bool = True  # False when total is a capped lower bound
+    next_cursor: str | None = None
     page: int
     size: int
 
@@ -1,9 +1,10 @@
 """Test Run and Test Result schemas."""
 
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class ModelTestConfig(BaseModel):
@@ -13,6 +14,8 @@ class ModelTestConfig(BaseModel):
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: int = Field(default=512, ge=1, le=4096)
     top_p: float = Field(default=1.0, ge=0.0, le=1.0)
+    seed: int | None = None  # Fixed seed makes sampling reproducible
+    n: int = Field(default=1, ge=1, le=16)  # Completions sampled in one request
 
 
 class TestRunCreate(BaseModel):
@@ -22,6 +25,7 @@ class TestRunCreate(BaseModel):
     system_prompt: str | None = Field(default=None, max_length=10000)
     prompt_template_id: UUID | None = None
     models: list[ModelTestConfig] = Field(..., min_length=1, max_length=10)
+    stream: bool = False  # Stream completions to capture TTFT and tokens/sec
 
 
 class TestResultResponse(BaseModel):
@@ -34,6 +38,12 @@ class TestResultResponse(BaseModel):
     response: str | None
     latency_ms: int | None
     token_count: int | None
+    ttft_ms: int | None = None
+    tokens_per_second: float | None = None
+    inter_token_latency: dict | None = None
+    cache_hit: bool = False
+    attempts: int | None = None
+    samples: list[str | None] | None = None  # All n completions when n > 1
     error: str | None
     created_at: datetime
 
@@ -48,6 +58,8 @@ class TestRunResponse(BaseModel):
     prompt_template_id: UUID | None
     user_message: str
     system_prompt: str | None
+    status: str = "complete"
+    error: str | None = None
     results: list[TestResultResponse] = []
     created_at: datetime
     updated_at: datetime
@@ -64,6 +76,15 @@ class TestRunListResponse(BaseModel):
     limit: int
 
 
+class ResultPreview(BaseModel):
+    """Start of one model's response in a test run summary."""
+
+    model_id: UUID
+    model_name: str
+    response_preview: str | None
+    failed: bool = False
+
+
 class TestRunSummary(BaseModel):
     """Schema for test run summary (without full results)."""
 
@@ -71,7 +92,13 @@ class TestRunSummary(BaseModel):
     user_message: str
     system_prompt: str | None
     prompt_template_id: UUID | None
+    status: str = "complete"
     result_count: int
+    error_count: int = 0
+    min_latency_ms: int | None = None
+    max_latency_ms: int | None = None
+    model_names: list[str] = []
+    previews: list[ResultPreview] = []  # First result of each model
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -81,6 +108,127 @@ class TestRunListSummaryResponse(BaseModel):
     """Schema for paginated test run summary list."""
 
     items: list[TestRunSummary]
-    total: int
+    total: int | None  # None unless include_total
+    total_exact: bool = True  # False when total is a capped lower bound
+    next_cursor: str | None = None
     skip: int
     limit: int
+
+
+class TestRunSearchHit(BaseModel):
+    """One model result matching a search, with highlighted excerpts."""
+
+    test_run_id: UUID
+    result_id: UUID
+    model_id: UUID
+    model_name: str | None
+    rank: float
+    user_message: str  # Matches wrapped in <mark></mark>
+    response: str | None
+    created_at: datetime
+
+
+class TestRunSearchResponse(BaseModel):
+    """Schema for ranked search results."""
+
+    items: list[TestRunSearchHit]
+    query: str
+    skip: int
+    limit: int
+
+
+class TestRunJobResponse(BaseModel):
+    """Schema for a test run accepted for background execution."""
+
+    id: UUID
+    status: str
+    progress_url: str
+    events_url: str
+
+
+class ModelProgress(BaseModel):
+    """Progress of one model within a test run."""
+
+    model_id: UUID
+    model_name: str
+    status: str  # pending, running, complete, failed
+    latency_ms: int | None = None
+    error: str | None = None
+
+
+class TestRunProgress(BaseModel):
+    """Schema for test run progress."""
+
+    id: UUID
+    status: str
+    total: int
+    completed: int
+    error: str | None = None
+    models: list[ModelProgress]
+
+
+class SweepAxis(BaseModel):
+    """Values of one sampling parameter in a sweep.
+
+    Grid sweeps use ``values``; random sweeps pick from ``values`` or draw
+    uniformly between ``min`` and ``max``.
+    """
+
+    values: list[float] | None = Field(default=None, min_length=1, max_length=50)
+    min: float | None = None
+    max: float | None = None
+
+    @model_validator(mode="after")
+    def check_bounds(self) -> "SweepAxis":
+        if self.values is None:
+            if self.min is None or self.max is None:
+                raise ValueError("Give either values or both min and max")
+            if self.min > self.max:
+                raise ValueError("min must not exceed max")
+        return self
+
+
+class SweepSpec(BaseModel):
+    """Sampling parameters to sweep; unset axes keep their defaults."""
+
+    strategy: Literal["grid", "random"] = "grid"
+    temperature: SweepAxis | None = None
+    top_p: SweepAxis | None = None
+    max_tokens: SweepAxis | None = None
+    samples: int = Field(default=10, ge=1, le=200)  # Configs drawn when random
+    seed: int | None = None  # Makes random sweeps repeatable
+    n: int = Field(default=1, ge=1, le=16)  # Completions per config, one request
+
+    @model_validator(mode="after")
+    def check_grid_values(self) -> "SweepSpec":
+        if self.strategy == "grid":
+            for name in ("temperature", "top_p", "max_tokens"):
+                axis = getattr(self, name)
+                if axis is not None and axis.values is None:
+                    raise ValueError(f"Grid sweeps need values for {name}")
+        return self
+
+
+class TestRunSweepCreate(BaseModel):
+    """Schema for a parameter sweep over one or more models."""
+
+    user_message: str = Field(..., min_length=1, max_length=10000)
+    system_prompt: str | None = Field(default=None, max_length=10000)
+    prompt_template_id: UUID | None = None
+    model_ids: list[UUID] = Field(..., min_length=1, max_length=10)
+    sweep: SweepSpec
+
+
+class SweepGroup(BaseModel):
+    """Results of every model for one parameter combination."""
+
+    parameters: dict
+    results: list[TestResultResponse]
+
+
+class TestRunSweepResponse(BaseModel):
+    """Schema for sweep results grouped by parameter combination."""
+
+    id: UUID
+    status: str
+    groups: list[SweepGroup]
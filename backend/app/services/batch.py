@@ -0,0 +1,181 @@
+"""Batch evaluation service."""
+
+import json
+from datetime import datetime, timezone
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.models.batch import Batch
+from app.models.job import JobKind
+from app.models.model import Model
+from app.models.test_run import TestResult, TestRun, TestRunStatus
+from app.schemas.batch import BatchCreate, BatchItem, BatchProgress
+from app.services.jobs import JobQueue
+
+settings = get_settings()
+
+
+class BatchService:
+    """Service for batch evaluations."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def parse_dataset(content: bytes) -> list[BatchItem]:
+        """
+        Parse a JSONL dataset.
+
+        Each non-empty line is either an object with ``user_message`` (and
+        optionally ``system_prompt``) or a bare JSON string. Raises
+        ``ValueError`` naming the first bad line.
+        """
+        try:
+            text = content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise ValueError("Dataset must be UTF-8 encoded JSONL")
+
+        items = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                if isinstance(row, str):
+                    row = {"user_message": row}
+                items.append(BatchItem.model_validate(row))
+            except (json.JSONDecodeError, ValidationError) as e:
+                raise ValueError(f"Line {line_number}: {e}") from e
+            if len(items) > settings.batch_max_items:
+                raise ValueError(
+                    f"Dataset exceeds {settings.batch_max_items} rows"
+                )
+
+        if not items:
+            raise ValueError("Dataset is empty")
+        return items
+
+    async def create_batch(
+        self, user_id: UUID, batch_data: BatchCreate, items: list[BatchItem]
+    ) -> Batch:
+        """
+        Persist a batch and its rows, and queue it for a worker.
+
+        Raises ``ValueError`` if any model is missing or inactive.
+        """
+        model_ids = {config.model_id for config in batch_data.models}
+        result = await self.db.execute(
+            select(func.count(Model.id)).where(
+                Model.id.in_(model_ids), Model.is_active == True
+            )
+        )
+        if result.scalar() != len(model_ids):
+            raise ValueError("One or more models not found or inactive")
+
+        batch = Batch(
+            user_id=user_id,
+            name=batch_data.name,
+            status=TestRunStatus.PENDING,
+            config=batch_data.model_dump(mode="json", include={"models", "stream"}),
+            item_count=len(items),
+            total=len(items) * len(batch_data.models),
+        )
+        self.db.add(batch)
+        await self.db.flush()
+
+        self.db.add_all(
+            TestRun(
+                user_id=user_id,
+                batch_id=batch.id,
+                item_index=index,
+                user_message=item.user_message,
+                system_prompt=item.system_prompt or batch_data.system_prompt,
+                status=TestRunStatus.PENDING,
+            )
+            for index, item in enumerate(items)
+        )
+        JobQueue.enqueue(
+            self.db, JobKind.BATCH, batch.id, max_attempts=settings.job_max_attempts
+        )
+        await self.db.commit()
+        return batch
+
+    async def get_batch_by_id(self, batch_id: UUID, user_id: UUID) -> Batch | None:
+        """Get a batch by ID."""
+        result = await self.db.execute(
+            select(Batch).where(Batch.id == batch_id, Batch.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_batches(
+        self, user_id: UUID, skip: int = 0, limit: int = 20
+    ) -> tuple[list[Batch], int]:
+        """Get paginated list of batches for a user."""
+        count_result = await self.db.execute(
+            select(func.count(Batch.id)).where(Batch.user_id == user_id)
+        )
+        total = count_result.scalar() or 0
+
+        result = await self.db.execute(
+            select(Batch)
+            .where(Batch.user_id == user_id)
+            .order_by(Batch.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    async def get_results(
+        self, batch_id: UUID, skip: int = 0, limit: int = 50
+    ) -> list[TestRun]:
+        """Get a page of a batch's rows with their results, in dataset order."""
+        result = await self.db.execute(
+            select(TestRun)
+            .options(selectinload(TestRun.results).joinedload(TestResult.blob))
+            .where(TestRun.batch_id == batch_id)
+            .order_by(TestRun.item_index)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def delete_batch(self, batch_id: UUID, user_id: UUID) -> bool:
+        """Delete a batch with all its rows and results."""
+        batch = await self.get_batch_by_id(batch_id, user_id)
+        if not batch:
+            return False
+
+        await self.db.delete(batch)
+        await self.db.commit()
+        return True
+
+    @staticmethod
+    def progress(batch: Batch) -> BatchProgress:
+        """Progress with throughput and ETA from the batch's counters."""
+        progress = BatchProgress(
+            total=batch.total, completed=batch.completed, failed=batch.failed
+        )
+        if batch.started_at is None:
+            return progress
+
+        started_at = batch.started_at
+        if started_at.tzinfo is None:
+            started_at = started_at.replace(tzinfo=timezone.utc)
+        end = batch.finished_at or datetime.now(timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        elapsed = max((end - started_at).total_seconds(), 0.0)
+        progress.elapsed_seconds = round(elapsed, 1)
+
+        if elapsed > 0 and batch.completed:
+            throughput = batch.completed / elapsed
+            progress.throughput_per_second = round(throughput, 2)
+            if batch.finished_at is None:
+                remaining = batch.total - batch.completed
+                progress.eta_seconds = round(remaining / throughput, 1)
+        return progress
@@ -0,0 +1,245 @@
+"""Background execution of batch evaluations."""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import async_session_maker
+from app.models.batch import Batch
+from app.models.model import Model
+from app.models.test_run import TestResult, TestRun, TestRunStatus
+from app.schemas.test_run import ModelTestConfig
+from app.services.result_writer import OnSaved, ResultWriter, result_writer
+from app.services.test_run import TestRunService
+from app.utils.progress import ProgressHub, progress_hub
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Saved results of a batch row
+_result_count = (
+    select(func.count(TestResult.id))
+    .where(TestResult.test_run_id == TestRun.id)
+    .scalar_subquery()
+)
+
+
+class BatchRunner:
+    """
+    Execute a queued batch: every dataset row against every model config.
+
+    ``concurrency`` coroutines pull (row, config) pairs from a shared
+    iterator, so at most that many model calls are in flight. Results are
+    group-committed by the shared result writer, which advances the batch's
+    progress counters and completes finished rows in the same transaction;
+    a full writer buffer pauses the callers until it catches up.
+
+    Saved results are the checkpoint: each carries its ``config_index`` and
+    (row, config) is unique, so a batch resumed after a crash or deploy only
+    calls models for pairs without a result. Results already handed to the
+    writer when the worker is stopped are still committed; a duplicate
+    written by a worker that lost its lease is dropped by the unique index.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        hub: ProgressHub = progress_hub,
+        concurrency: int = settings.batch_concurrency,
+        writer: ResultWriter = result_writer,
+    ):
+        self.session_factory = session_factory
+        self.hub = hub
+        self.concurrency = concurrency
+        self.writer = writer
+
+    async def run(self, batch_id: UUID) -> None:
+        """Execute (or resume) a batch; finished batches are skipped."""
+        async with self.session_factory() as db:
+            batch = await db.get(Batch, batch_id)
+            if batch is None or batch.status not in (
+                TestRunStatus.PENDING,
+                TestRunStatus.RUNNING,
+            ):
+                return
+
+            configs = [
+                ModelTestConfig.model_validate(config)
+                for config in batch.config["models"]
+            ]
+            stream = batch.config.get("stream", False)
+            result = await db.execute(
+                select(Model).where(
+                    Model.id.in_([config.model_id for config in configs]),
+                    Model.is_active == True,
+                )
+            )
+            models = {m.id: m for m in result.scalars().all()}
+            work = await self._pending_work(db, batch_id, configs)
+
+            batch.status = TestRunStatus.RUNNING
+            if batch.started_at is None:
+                batch.started_at = datetime.now(timezone.utc)
+            await db.commit()
+        self.hub.publish(batch_id)
+
+        status, error = TestRunStatus.COMPLETE, None
+        try:
+            await self._execute_all(batch_id, work, len(configs), models, stream)
+        except Exception as e:
+            logger.exception("Batch %s failed", batch_id)
+            status, error = TestRunStatus.FAILED, str(e)
+        # On cancellation the batch stays "running" so its job can resume it
+        await self._finish(batch_id, status, error, len(configs))
+
+    async def fail(self, batch_id: UUID, error: str) -> None:
+        """Mark a batch failed once its job has given up on it."""
+        async with self.session_factory() as db:
+            batch = await db.get(Batch, batch_id)
+            if batch is None or batch.status not in (
+                TestRunStatus.PENDING,
+                TestRunStatus.RUNNING,
+            ):
+                return
+            batch.status = TestRunStatus.FAILED
+            batch.error = error
+            batch.finished_at = datetime.now(timezone.utc)
+            await db.commit()
+        self.hub.publish(batch_id)
+
+    @staticmethod
+    async def _pending_work(
+        db: AsyncSession, batch_id: UUID, configs: list[ModelTestConfig]
+    ) -> list[tuple[tuple, int, ModelTestConfig]]:
+        """(row, config index, config) pairs without a saved result."""
+        unfinished = (
+            TestRun.batch_id == batch_id,
+            TestRun.status != TestRunStatus.COMPLETE,
+        )
+        rows = await db.execute(
+            select(TestRun.id, TestRun.user_message, TestRun.system_prompt)
+            .where(*unfinished)
+            .order_by(TestRun.item_index)
+        )
+        saved = await db.execute(
+            select(TestResult.test_run_id, TestResult.config_index)
+            .join(TestRun, TestResult.test_run_id == TestRun.id)
+            .where(*unfinished)
+        )
+        done = set(saved.all())
+
+        return [
+            (row, index, config)
+            for row in rows.all()
+            for index, config in enumerate(configs)
+            if (row.id, index) not in done
+        ]
+
+    async def _execute_all(
+        self,
+        batch_id: UUID,
+        work: list[tuple[tuple, int, ModelTestConfig]],
+        config_count: int,
+        models: dict[UUID, Model],
+        stream: bool,
+    ) -> None:
+        pairs = iter(work)
+        on_saved = self.on_saved(batch_id, config_count)
+
+        async def execute() -> None:
+            for row, index, config in pairs:
+                model = models.get(config.model_id)
+                result = await self._execute(row, model, config, stream)
+                result.config_index = index
+                await self.writer.write(result, on_saved)
+                self.hub.publish(batch_id)
+
+        await asyncio.gather(
+            *(execute() for _ in range(min(self.concurrency, len(work))))
+        )
+
+    @staticmethod
+    async def _execute(
+        row: tuple, model: Model | None, config: ModelTestConfig, stream: bool
+    ) -> TestResult:
+        if model is None:
+            return TestResult(
+                test_run_id=row.id,
+                model_id=config.model_id,
+                parameters=TestRunService._parameters(config),
+                error="Model not found or inactive",
+            )
+        try:
+            return await TestRunService.execute_model(
+                row.id, model, row.user_message, row.system_prompt, config, stream
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return TestResult(
+                test_run_id=row.id,
+                model_id=model.id,
+                parameters=TestRunService._parameters(config),
+                error=f"Execution error: {str(e)}",
+            )
+
+    @staticmethod
+    def on_saved(batch_id: UUID, config_count: int) -> OnSaved:
+        """Writer hook advancing a batch's counters as its results commit.
+
+        Rows that now have a result for every config are marked complete.
+        """
+
+        async def advance(db: AsyncSession, saved: list[TestResult]) -> None:
+            await db.execute(
+                update(Batch)
+                .where(Batch.id == batch_id)
+                .values(
+                    completed=Batch.completed + len(saved),
+                    failed=Batch.failed + sum(1 for r in saved if r.error),
+                )
+            )
+            await db.execute(
+                update(TestRun)
+                .where(
+                    TestRun.id.in_({result.test_run_id for result in saved}),
+                    _result_count >= config_count,
+                )
+                .values(status=TestRunStatus.COMPLETE)
+                .execution_options(synchronize_session=False)
+            )
+
+        return advance
+
+    async def _finish(
+        self,
+        batch_id: UUID,
+        status: TestRunStatus,
+        error: str | None,
+        config_count: int,
+    ) -> None:
+        async with self.session_factory() as db:
+            # Rows completed by another worker, or whose last result was
+            # saved just before an interruption
+            await db.execute(
+                update(TestRun)
+                .where(
+                    TestRun.batch_id == batch_id,
+                    TestRun.status != TestRunStatus.COMPLETE,
+                    _result_count >= config_count,
+                )
+                .values(status=TestRunStatus.COMPLETE)
+                .execution_options(synchronize_session=False)
+            )
+            batch = await db.get(Batch, batch_id)
+            if batch is not None:
+                batch.status = status
+                batch.error = error
+                batch.finished_at = datetime.now(timezone.utc)
+                await db.commit()
+        self.hub.publish(batch_id)
@@ -0,0 +1,117 @@
+"""Benchmark (load test) service."""
+
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.benchmark import Benchmark
+from app.models.job import JobKind
+from app.models.model import Model
+from app.models.test_run import TestRunStatus
+from app.schemas.benchmark import BenchmarkCreate
+from app.services.jobs import JobQueue
+
+settings = get_settings()
+
+
+class BenchmarkService:
+    """Service for benchmarks."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_benchmark(
+        self, user_id: UUID, benchmark_data: BenchmarkCreate
+    ) -> Benchmark:
+        """
+        Persist a benchmark and queue it for a worker.
+
+        Raises ``ValueError`` if the model is missing or inactive, or the
+        steps exceed the configured limits.
+        """
+        if len(benchmark_data.levels) > settings.benchmark_max_steps:
+            raise ValueError(
+                f"At most {settings.benchmark_max_steps} steps are allowed"
+            )
+        if benchmark_data.step_seconds > settings.benchmark_max_step_seconds:
+            raise ValueError(
+                f"Steps may last at most {settings.benchmark_max_step_seconds}s"
+            )
+        if (
+            benchmark_data.mode != "qps"
+            and max(benchmark_data.levels) > settings.benchmark_max_concurrency
+        ):
+            raise ValueError(
+                f"Concurrency is limited to {settings.benchmark_max_concurrency}"
+            )
+
+        model = await self.db.get(Model, benchmark_data.model_id)
+        if model is None or not model.is_active:
+            raise ValueError("Model not found or inactive")
+
+        benchmark = Benchmark(
+            user_id=user_id,
+            model_id=model.id,
+            status=TestRunStatus.PENDING,
+            config=benchmark_data.model_dump(mode="json"),
+            steps=[],
+        )
+        self.db.add(benchmark)
+        await self.db.flush()
+        JobQueue.enqueue(
+            self.db,
+            JobKind.BENCHMARK,
+            benchmark.id,
+            max_attempts=settings.job_max_attempts,
+        )
+        await self.db.commit()
+        return benchmark
+
+    async def get_benchmark_by_id(
+        self, benchmark_id: UUID, user_id: UUID
+    ) -> Benchmark | None:
+        """Get a benchmark by ID."""
+        result = await self.db.execute(
+            select(Benchmark).where(
+                Benchmark.id == benchmark_id, Benchmark.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_benchmarks(
+        self,
+        user_id: UUID,
+        model_id: UUID | None = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[list[Benchmark], int]:
+        """Get paginated list of benchmarks for a user, optionally by model."""
+        conditions = [Benchmark.user_id == user_id]
+        if model_id is not None:
+            conditions.append(Benchmark.model_id == model_id)
+
+        count_result = await self.db.execute(
+            select(func.count(Benchmark.id)).where(*conditions)
+        )
+        total = count_result.scalar() or 0
+
+        result = await self.db.execute(
+            select(Benchmark)
+            .where(*conditions)
+            .order_by(Benchmark.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    async def delete_benchmark(self, benchmark_id: UUID, user_id: UUID) -> bool:
+        """Delete a benchmark."""
+        benchmark = await self.get_benchmark_by_id(benchmark_id, user_id)
+        if not benchmark:
+            return False
+
+        await self.db.delete(benchmark)
+        await self.db.commit()
+        return True
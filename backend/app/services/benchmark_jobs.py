@@ -0,0 +1,341 @@
+"""Background execution of benchmarks (load tests)."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import async_session_maker
+from app.models.benchmark import Benchmark
+from app.models.model import Model
+from app.models.test_run import TestRunStatus
+from app.schemas.benchmark import BenchmarkCreate, BenchmarkStep
+from app.utils.llm_client import LLMClient, LLMResponse
+from app.utils.stats import summarize
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MAX_ERROR_SAMPLES = 5
+
+# Requests go straight to the endpoint: no coalescing of identical requests,
+# no retries or hedges, and no adaptive limiter queueing in front of it
+benchmark_client = LLMClient(
+    timeout=settings.llm_timeout,
+    connect_timeout=settings.llm_connect_timeout,
+    max_connections=settings.benchmark_max_concurrency,
+    max_keepalive_connections=settings.benchmark_max_concurrency,
+    http2=settings.llm_http2,
+    coalesce=False,
+)
+
+
+def find_knee(
+    steps: list[BenchmarkStep],
+    latency_tolerance: float = settings.probe_latency_tolerance,
+    min_gain: float = settings.probe_min_gain,
+    max_error_rate: float = settings.probe_max_error_rate,
+) -> tuple[BenchmarkStep | None, bool]:
+    """
+    The last concurrency step before the endpoint saturates.
+
+    A step is past the knee when its error rate exceeds ``max_error_rate``,
+    its throughput grew by less than ``min_gain`` of what the extra
+    concurrency would ideally add (a plateau), or its p50 latency exceeds
+    ``latency_tolerance`` times the first step's. Returns the knee step
+    (``None`` if even the first step failed) and whether saturation was
+    seen; without saturation the highest step is returned.
+    """
+    knee = None
+    baseline = None
+    for step in steps:
+        latency = step.latency_ms["p50"] if step.latency_ms else None
+        if step.error_rate > max_error_rate or latency is None:
+            return knee, True
+        if knee is None:
+            baseline = latency
+        else:
+            ideal = step.concurrency / knee.concurrency - 1
+            gain = (
+                (step.throughput_rps / knee.throughput_rps - 1) / ideal
+                if knee.throughput_rps > 0 and ideal > 0
+                else 0.0
+            )
+            if gain < min_gain or latency > baseline * latency_tolerance:
+                return knee, True
+        knee = step
+    return knee, False
+
+
+class BenchmarkRunner:
+    """
+    Execute a queued benchmark, one step at a time.
+
+    In ``concurrency`` mode each step runs that many looping callers for
+    ``step_seconds``; a caller starts its next request as soon as the
+    previous one finishes. In ``qps`` mode requests are started on a fixed
+    schedule whether or not earlier ones have finished, so a saturated
+    endpoint shows up as growing latency rather than a lower send rate;
+    at most ``max_in_flight`` are outstanding and requests beyond that are
+    counted as errors.
+
+    Every request is measured (latency, TTFT and decode speed when
+    streaming) and each step is summarised into percentiles, throughput
+    and error rate. Finished steps are saved as they complete; a resumed
+    benchmark reruns only the remaining ones.
+
+    A ``probe`` is a concurrency ramp that stops once ``find_knee`` sees
+    saturation; the knee becomes the model's ``max_concurrency``, which
+    test runs and batches already apply as the model's cap on the endpoint.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        client: LLMClient = benchmark_client,
+        max_in_flight: int = settings.benchmark_max_concurrency,
+    ):
+        self.session_factory = session_factory
+        self.client = client
+        self.max_in_flight = max_in_flight
+
+    async def run(self, benchmark_id: UUID) -> None:
+        """Execute (or resume) a benchmark; finished benchmarks are skipped."""
+        async with self.session_factory() as db:
+            benchmark = await db.get(Benchmark, benchmark_id)
+            if benchmark is None or benchmark.status not in (
+                TestRunStatus.PENDING,
+                TestRunStatus.RUNNING,
+            ):
+                return
+
+            config = BenchmarkCreate.model_validate(benchmark.config)
+            model = await db.get(Model, benchmark.model_id)
+            if model is None or not model.is_active:
+                benchmark.status = TestRunStatus.FAILED
+                benchmark.error = "Model not found or inactive"
+                await db.commit()
+                return
+
+            request = dict(
+                endpoint_url=model.endpoint_url,
+                api_key=model.api_key,
+                model_name=model.model_name or model.name,
+                user_message=config.user_message,
+                system_prompt=config.system_prompt,
+                temperature=config.temperature,
+                max_tokens=config.max_tokens,
+            )
+            steps = [BenchmarkStep.model_validate(step) for step in benchmark.steps]
+            levels = config.levels[len(steps) :]
+
+            benchmark.status = TestRunStatus.RUNNING
+            if benchmark.started_at is None:
+                benchmark.started_at = datetime.now(timezone.utc)
+            await db.commit()
+
+        status, error = TestRunStatus.COMPLETE, None
+        try:
+            for level in levels:
+                if config.mode == "probe" and find_knee(steps)[1]:
+                    break
+                step = await self.run_step(request, config, level)
+                steps.append(step)
+                await self._save_step(benchmark_id, step)
+            if config.mode == "probe":
+                await self._apply_knee(benchmark_id, find_knee(steps)[0])
+        except Exception as e:
+            logger.exception("Benchmark %s failed", benchmark_id)
+            status, error = TestRunStatus.FAILED, str(e)
+        # On cancellation the benchmark stays "running" so its job can resume it
+        await self._finish(benchmark_id, status, error)
+
+    async def fail(self, benchmark_id: UUID, error: str) -> None:
+        """Mark a benchmark failed once its job has given up on it."""
+        await self._finish(benchmark_id, TestRunStatus.FAILED, error)
+
+    async def run_step(
+        self, request: dict, config: BenchmarkCreate, level: float
+    ) -> BenchmarkStep:
+        """Drive the endpoint at one concurrency or QPS level and measure it."""
+        samples: list[LLMResponse] = []
+        started = time.perf_counter()
+        deadline = started + config.step_seconds
+
+        if config.mode == "qps":
+            await self._open_loop(request, config.stream, level, deadline, samples)
+        else:
+            await self._closed_loop(
+                request, config.stream, int(level), deadline, samples
+            )
+
+        return self.summarize_step(
+            samples,
+            time.perf_counter() - started,
+            concurrency=int(level) if config.mode != "qps" else None,
+            target_qps=level if config.mode == "qps" else None,
+        )
+
+    async def _closed_loop(
+        self,
+        request: dict,
+        stream: bool,
+        concurrency: int,
+        deadline: float,
+        samples: list[LLMResponse],
+    ) -> None:
+        async def caller() -> None:
+            while time.perf_counter() < deadline:
+                samples.append(await self._call(request, stream))
+
+        await asyncio.gather(*(caller() for _ in range(concurrency)))
+
+    async def _open_loop(
+        self,
+        request: dict,
+        stream: bool,
+        rate: float,
+        deadline: float,
+        samples: list[LLMResponse],
+    ) -> None:
+        async def fire() -> None:
+            samples.append(await self._call(request, stream))
+
+        interval = 1.0 / rate
+        next_at = time.perf_counter()
+        tasks: set[asyncio.Task] = set()
+        try:
+            while next_at < deadline:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if len(tasks) >= self.max_in_flight:
+                    samples.append(
+                        LLMResponse(
+                            content=None,
+                            latency_ms=0,
+                            token_count=None,
+                            error="Benchmark in-flight limit reached",
+                        )
+                    )
+                else:
+                    task = asyncio.create_task(fire())
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                next_at += interval
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _call(self, request: dict, stream: bool) -> LLMResponse:
+        """Send one request; the final streamed delta carries the measurements."""
+        started = time.perf_counter()
+        try:
+            if not stream:
+                return await self.client.chat_completion(**request)
+            async for delta in self.client.stream_chat_completion(**request):
+                if delta.response is not None:
+                    return delta.response
+            error = "Stream ended without a final response"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        return LLMResponse(
+            content=None,
+            latency_ms=int((time.perf_counter() - started) * 1000),
+            token_count=None,
+            error=error,
+        )
+
+    @staticmethod
+    def summarize_step(
+        samples: list[LLMResponse],
+        elapsed: float,
+        concurrency: int | None = None,
+        target_qps: float | None = None,
+    ) -> BenchmarkStep:
+        """Percentiles, throughput and error rate of one step's requests."""
+        ok = [s for s in samples if s.error is None]
+        errors = len(samples) - len(ok)
+        elapsed = max(elapsed, 1e-9)
+        tokens = [s.token_count for s in ok if s.token_count is not None]
+
+        error_samples: list[str] = []
+        for sample in samples:
+            if sample.error is not None and sample.error not in error_samples:
+                error_samples.append(sample.error)
+                if len(error_samples) == MAX_ERROR_SAMPLES:
+                    break
+
+        return BenchmarkStep(
+            concurrency=concurrency,
+            target_qps=target_qps,
+            duration_seconds=round(elapsed, 2),
+            requests=len(samples),
+            errors=errors,
+            error_rate=round(errors / len(samples), 4) if samples else 0.0,
+            throughput_rps=round(len(ok) / elapsed, 3),
+            token_throughput=round(sum(tokens) / elapsed, 2) if tokens else None,
+            latency_ms=summarize([s.latency_ms for s in ok]),
+            ttft_ms=summarize([s.ttft_ms for s in ok if s.ttft_ms is not None]),
+            tokens_per_second=summarize(
+                [s.tokens_per_second for s in ok if s.tokens_per_second is not None]
+            ),
+            error_samples=error_samples,
+        )
+
+    async def _save_step(self, benchmark_id: UUID, step: BenchmarkStep) -> None:
+        async with self.session_factory() as db:
+            benchmark = await db.get(Benchmark, benchmark_id)
+            if benchmark is not None:
+                # Reassign so the JSONB change is detected
+                benchmark.steps = [*benchmark.steps, step.model_dump(mode="json")]
+                await db.commit()
+
+    async def _apply_knee(
+        self, benchmark_id: UUID, knee: BenchmarkStep | None
+    ) -> None:
+        """Record a probe's knee and make it the model's concurrency cap."""
+        if knee is None:
+            return
+        async with self.session_factory() as db:
+            benchmark = await db.get(Benchmark, benchmark_id)
+            if benchmark is None:
+                return
+            benchmark.recommended_concurrency = knee.concurrency
+            model = await db.get(Model, benchmark.model_id)
+            if model is not None:
+                # Reassign so the JSONB change is detected
+                model.metadata_ = {
+                    **(model.metadata_ or {}),
+                    "max_concurrency": knee.concurrency,
+                    "capacity_probe": {
+                        "benchmark_id": str(benchmark_id),
+                        "throughput_rps": knee.throughput_rps,
+                        "latency_p50_ms": (knee.latency_ms or {}).get("p50"),
+                        "probed_at": datetime.now(timezone.utc).isoformat(),
+                    },
+                }
+            await db.commit()
+
+    async def _finish(
+        self, benchmark_id: UUID, status: TestRunStatus, error: str | None
+    ) -> None:
+        async with self.session_factory() as db:
+            benchmark = await db.get(Benchmark, benchmark_id)
+            if benchmark is None or benchmark.status not in (
+                TestRunStatus.PENDING,
+                TestRunStatus.RUNNING,
+            ):
+                return
+            benchmark.status = status
+            benchmark.error = error
+            benchmark.finished_at = datetime.now(timezone.utc)
+            await db.commit()
@@ -0,0 +1,344 @@
+"""Durable Postgres job queue and worker loop."""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[uuid.UUID], Awaitable[None]]
+FailureHandler = Callable[[uuid.UUID, str], Awaitable[None]]
+
+
+@dataclass
+class ClaimedJob:
+    """A job leased to this worker."""
+
+    id: uuid.UUID
+    kind: str
+    target_id: uuid.UUID
+    attempts: int
+    max_attempts: int
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """
+    Job table operations, each in its own short transaction.
+
+    Workers claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` so any
+    number of processes can poll the same table without blocking each other
+    or claiming the same row. A claim is a lease: the owner renews it with
+    heartbeats, and a job whose lease expired (its worker crashed) becomes
+    claimable again.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def enqueue(
+        db: AsyncSession, kind: str, target_id: uuid.UUID, max_attempts: int = 3
+    ) -> Job:
+        """Add a job to the caller's session, committed with the target row."""
+        job = Job(
+            kind=kind,
+            target_id=target_id,
+            status=JobStatus.QUEUED,
+            max_attempts=max_attempts,
+        )
+        db.add(job)
+        return job
+
+    async def claim(
+        self, worker_id: str, limit: int, lease_seconds: float
+    ) -> list[ClaimedJob]:
+        """Lease up to ``limit`` queued (or abandoned) jobs, oldest first.
+
+        Jobs whose ``attempts`` now exceed ``max_attempts`` kept losing their
+        worker; the caller should fail them rather than run them again.
+        """
+        now = _now()
+        claimable = (
+            select(Job.id)
+            .where(
+                or_(
+                    and_(
+                        Job.status == JobStatus.QUEUED,
+                        or_(Job.run_after.is_(None), Job.run_after <= now),
+                    ),
+                    and_(
+                        Job.status == JobStatus.RUNNING,
+                        Job.lease_expires_at < now,
+                    ),
+                )
+            )
+            .order_by(Job.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(Job)
+            .where(Job.id.in_(claimable.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                locked_by=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                heartbeat_at=now,
+                attempts=Job.attempts + 1,
+            )
+            .returning(
+                Job.id, Job.kind, Job.target_id, Job.attempts, Job.max_attempts
+            )
+            .execution_options(synchronize_session=False)
+        )
+        async with self.session_factory() as db:
+            result = await db.execute(statement)
+            jobs = [ClaimedJob(*row) for row in result.all()]
+            await db.commit()
+        return jobs
+
+    async def heartbeat(
+        self, job: ClaimedJob, worker_id: str, lease_seconds: float
+    ) -> bool:
+        """Extend the lease; False if this worker no longer owns the job."""
+        now = _now()
+        return await self._update_owned(
+            job,
+            worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            heartbeat_at=now,
+        )
+
+    async def complete(self, job: ClaimedJob, worker_id: str) -> None:
+        await self._update_owned(
+            job,
+            worker_id,
+            status=JobStatus.DONE,
+            locked_by=None,
+            lease_expires_at=None,
+            error=None,
+        )
+
+    async def fail(
+        self,
+        job: ClaimedJob,
+        worker_id: str,
+        error: str,
+        retry_delay: float | None = None,
+    ) -> bool:
+        """Record a failure, re-queueing the job after ``retry_delay`` seconds
+        while it has attempts left. Returns True if the job is now failed
+        for good."""
+        retry = retry_delay is not None and job.attempts < job.max_attempts
+        if retry:
+            values = dict(
+                status=JobStatus.QUEUED,
+                run_after=_now() + timedelta(seconds=retry_delay),
+            )
+        else:
+            values = dict(status=JobStatus.FAILED)
+        owned = await self._update_owned(
+            job,
+            worker_id,
+            locked_by=None,
+            lease_expires_at=None,
+            error=error,
+            **values,
+        )
+        return owned and not retry
+
+    async def release(self, job: ClaimedJob, worker_id: str) -> None:
+        """Hand a job back without counting the attempt (e.g. on shutdown)."""
+        await self._update_owned(
+            job,
+            worker_id,
+            status=JobStatus.QUEUED,
+            locked_by=None,
+            lease_expires_at=None,
+            attempts=Job.attempts - 1,
+        )
+
+    async def _update_owned(self, job: ClaimedJob, worker_id: str, **values) -> bool:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Job)
+                .where(
+                    Job.id == job.id,
+                    Job.locked_by == worker_id,
+                    Job.status == JobStatus.RUNNING,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+
+class JobWorker:
+    """
+    Claim and execute jobs with bounded concurrency.
+
+    Runs up to ``concurrency`` jobs at once, polling for work every
+    ``poll_seconds`` (or immediately after :meth:`notify`). Each running job
+    renews its lease every ``heartbeat_seconds``; if the lease is lost the
+    job is cancelled here because another worker has taken it over. Any
+    number of workers, in any number of processes, can share one table.
+
+    When a job fails for good, ``failure_handlers[kind]`` is called with its
+    target id and error so the target row can record the failure.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: dict[str, JobHandler],
+        failure_handlers: dict[str, FailureHandler] | None = None,
+        concurrency: int = 4,
+        lease_seconds: float = 60.0,
+        heartbeat_seconds: float = 15.0,
+        poll_seconds: float = 1.0,
+        retry_delay: float = 10.0,
+        worker_id: str | None = None,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.failure_handlers = failure_handlers or {}
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.retry_delay = retry_delay
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._running: dict[uuid.UUID, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._loop: asyncio.Task | None = None
+        self.completed = 0
+        self.failed = 0
+
+    def notify(self) -> None:
+        """Poll for work now instead of waiting for the next interval."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        self._loop = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop claiming, cancel running jobs and hand them back to the queue."""
+        if self._loop is not None:
+            self._loop.cancel()
+            await asyncio.gather(self._loop, return_exceptions=True)
+            self._loop = None
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_once(self) -> int:
+        """Claim as many jobs as there are free slots; returns how many."""
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return 0
+        jobs = await self.queue.claim(self.worker_id, free, self.lease_seconds)
+        for job in jobs:
+            if job.attempts > job.max_attempts:
+                # Crashed its worker too many times: give up on it
+                self.failed += 1
+                await self._give_up(job, "Lease expired too many times")
+            else:
+                self._running[job.id] = asyncio.create_task(self._execute(job))
+        return len(jobs)
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "running": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def _poll(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Failed to claim jobs")
+                claimed = 0
+            if claimed and len(self._running) < self.concurrency:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        lease_lost = False
+
+        async def keep_alive(task: asyncio.Task) -> None:
+            nonlocal lease_lost
+            while True:
+                await asyncio.sleep(self.heartbeat_seconds)
+                try:
+                    owned = await self.queue.heartbeat(
+                        job, self.worker_id, self.lease_seconds
+                    )
+                except Exception:
+                    logger.exception("Heartbeat failed for job %s", job.id)
+                    continue
+                if not owned:
+                    lease_lost = True
+                    task.cancel()
+                    return
+
+        heartbeat = asyncio.create_task(keep_alive(asyncio.current_task()))
+        try:
+            handler = self.handlers.get(job.kind)
+            if handler is None:
+                raise ValueError(f"No handler for job kind '{job.kind}'")
+            await handler(job.target_id)
+            await self.queue.complete(job, self.worker_id)
+            self.completed += 1
+        except asyncio.CancelledError:
+            if lease_lost:
+                logger.warning("Lost lease on job %s; abandoning it", job.id)
+                return
+            await asyncio.shield(self.queue.release(job, self.worker_id))
+            raise
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            self.failed += 1
+            await self._give_up(job, str(e), self.retry_delay)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job.id, None)
+            self._wakeup.set()
+
+    async def _give_up(
+        self, job: ClaimedJob, error: str, retry_delay: float | None = None
+    ) -> None:
+        """Fail a job (or re-queue it) and let its target record a final failure."""
+        if not await self.queue.fail(job, self.worker_id, error, retry_delay):
+            return
+        on_failure = self.failure_handlers.get(job.kind)
+        if on_failure is not None:
+            try:
+                await on_failure(job.target_id, error)
+            except Exception:
+                logger.exception("Failure handler for job %s failed", job.id)
@@ -1,14 +1,67 @@
 """Model management service."""
 
+import asyncio
 import time
+from collections.abc import Iterable
 from uuid import UUID
 
 import httpx
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.models.model import Model
-from app.schemas.model import ModelCreate, ModelHealthCheck, ModelUpdate
+from app.schemas.model import (
+    EndpointHealthCheck,
+    ModelCreate,
+    ModelHealthCheck,
+    ModelUpdate,
+)
+from app.utils.llm_client import build_models_url, endpoint_origin, llm_client
+from app.utils.pagination import Page, paginate
+
+settings = get_settings()
+
+
+class ModelNameCache:
+    """
+    Model names by id, for building result responses.
+
+    Names missing from the cache are loaded with a single query, so a
+    response costs at most one lookup however many results it has.
+    ``ModelService`` invalidates a model's entry when it is updated or
+    deleted; other processes see the change once the entry expires.
+    """
+
+    def __init__(self, ttl_seconds: float = settings.model_name_cache_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._names: dict[UUID, tuple[str, float]] = {}
+
+    async def get(self, db: AsyncSession, model_ids: Iterable[UUID]) -> dict[UUID, str]:
+        """Names of the given models; deleted models are left out."""
+        now = time.monotonic()
+        names = {}
+        missing = set()
+        for model_id in set(model_ids):
+            entry = self._names.get(model_id)
+            if entry is not None and entry[1] > now:
+                names[model_id] = entry[0]
+            else:
+                missing.add(model_id)
+        if missing:
+            result = await db.execute(
+                select(Model.id, Model.name).where(Model.id.in_(missing))
+            )
+            for model_id, name in result.all():
+                self.remember(model_id, name)
+                names[model_id] = name
+        return names
+
+    def remember(self, model_id: UUID, name: str) -> None:
+        self._names[model_id] = (name, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, model_id: UUID) -> None:
+        self._names.pop(model_id, None)
 
 
 class ModelService:
@@ -32,31 +85,32 @@ class ModelService:
         skip: int = 0,
         limit: int = 20,
         active_only: bool = True,
-    ) -> tuple[list[Model], int]:
-        """Get paginated list of models."""
+        cursor: str | None = None,
+        include_total: bool = True,
+    ) -> Page[Model]:
+        """Get a page of models, newest first."""
         query = select(Model)
-        count_query = select(func.count(Model.id))
-
         if active_only:
             query = query.where(Model.is_active == True)
-            count_query = count_query.where(Model.is_active == True)
-
-        # Get total count
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
-        # Get paginated results
-        query = query.offset(skip).limit(limit).order_by(Model.created_at.desc())
-        result = await self.db.execute(query)
-        models = list(result.scalars().all())
 
-        return models, total
+        return await paginate(
+            self.db,
+            query,
+            Model.created_at,
+            Model.id,
+            limit,
+            cursor=cursor,
+            skip=skip,
+            include_total=include_total,
+            count_cap=settings.pagination_count_cap,
+        )
 
     async def create_model(self, model_data: ModelCreate) -> Model:
         """Create a new model."""
         model = Model(
             name=model_data.name,
             endpoint_url=model_data.endpoint_url,
+            replica_urls=model_data.replica_urls,
             api_key=model_data.api_key,  # TODO: Encrypt before storing
             metadata_=model_data.metadata_,
         )
@@ -79,6 +133,7 @@ class ModelService:
 
         await self.db.flush()
         await self.db.refresh(model)
+        model_names.invalidate(model.id)
         return model
 
     async def delete_model(self, model_id: UUID) -> bool:
@@ -89,6 +144,7 @@ class ModelService:
 
         model.is_active = False
         await self.db.flush()
+        model_names.invalidate(model.id)
         return True
 
     async def hard_delete_model(self, model_id: UUID) -> bool:
@@ -99,10 +155,11 @@ class ModelService:
 
         await self.db.delete(model)
         await self.db.flush()
+        model_names.invalidate(model_id)
         return True
 
     async def health_check(self, model_id: UUID) -> ModelHealthCheck:
-        """Check if a model endpoint is healthy."""
+        """Check if a model's endpoints are healthy."""
         model = await self.get_model_by_id(model_id)
         if not model:
             return ModelHealthCheck(
@@ -113,24 +170,62 @@ class ModelService:
                 error="Model not found",
             )
 
+        checks = await self.probe_endpoints(model.endpoint_urls, model.api_key)
+        primary = checks[0]
+        healthy = [check for check in checks if check.is_healthy]
+        return ModelHealthCheck(
+            model_id=model.id,
+            model_name=model.name,
+            endpoint_url=model.endpoint_url,
+            is_healthy=bool(healthy),
+            latency_ms=primary.latency_ms,
+            error=None if healthy else primary.error,
+            replicas=checks if len(checks) > 1 else None,
+        )
+
+    @classmethod
+    async def probe_endpoints(
+        cls, endpoint_urls: list[str], api_key: str | None
+    ) -> list[EndpointHealthCheck]:
+        """Probe every endpoint and record the outcomes in their breakers."""
+        checks = await asyncio.gather(
+            *(cls._probe(url, api_key) for url in endpoint_urls)
+        )
+        for check in checks:
+            # Probes feed the same breakers as real calls: an unreachable or
+            # 5xx replica is ejected from load balancing, a passing one is
+            # restored. A 4xx (bad key, unknown route) says nothing about the
+            # endpoint and leaves its breaker alone.
+            if check.status_code is not None and 400 <= check.status_code < 500:
+                continue
+            llm_client.breakers.record(
+                endpoint_origin(check.endpoint_url), check.is_healthy, check.error
+            )
+        return list(checks)
+
+    @staticmethod
+    async def _probe(endpoint_url: str, api_key: str | None) -> EndpointHealthCheck:
+        """Probe one endpoint's OpenAI-compatible /v1/models route."""
         start_time = time.time()
         is_healthy = False
         error = None
         latency_ms = None
+        status_code = None
 
         try:
             async with httpx.AsyncClient(timeout=10.0) as client:
                 # Try to hit the models endpoint (OpenAI-compatible)
                 headers = {}
-                if model.api_key:
-                    headers["Authorization"] = f"Bearer {model.api_key}"
+                if api_key:
+                    headers["Authorization"] = f"Bearer {api_key}"
 
                 response = await client.get(
-                    f"{model.endpoint_url}/v1/models",
+                    build_models_url(endpoint_url),
                     headers=headers,
                 )
 
                 latency_ms = int((time.time() - start_time) * 1000)
+                status_code = response.status_code
 
                 if response.status_code == 200:
                     is_healthy = True
@@ -145,11 +240,14 @@ class ModelService:
         except Exception as e:
             error = str(e)
 
-        return ModelHealthCheck(
-            model_id=model.id,
-            model_name=model.name,
-            endpoint_url=model.endpoint_url,
+        return EndpointHealthCheck(
+            endpoint_url=endpoint_url,
             is_healthy=is_healthy,
+            status_code=status_code,
             latency_ms=latency_ms,
             error=error,
         )
+
+
+# Singleton instance
+model_names = ModelNameCache()
@@ -6,8 +6,12 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import get_settings
 from app.models.prompt import PromptTemplate, PromptVersion
 from app.schemas.prompt import PromptCreate, PromptUpdate
+from app.utils.pagination import Page, paginate
+
+settings = get_settings()
 
 
 class PromptService:
@@ -46,32 +50,30 @@ class PromptService:
         limit: int = 20,
         tags: list[str] | None = None,
         favorites_only: bool = False,
-    ) -> tuple[list[PromptTemplate], int]:
-        """Get paginated list of prompts for a user."""
+        cursor: str | None = None,
+        include_total: bool = True,
+    ) -> Page[PromptTemplate]:
+        """Get a page of a user's prompts, most recently updated first."""
         query = select(PromptTemplate).where(PromptTemplate.user_id == user_id)
-        count_query = select(func.count(PromptTemplate.id)).where(
-            PromptTemplate.user_id == user_id
-        )
 
         if favorites_only:
             query = query.where(PromptTemplate.is_favorite == True)
-            count_query = count_query.where(PromptTemplate.is_favorite == True)
 
         if tags:
             # Filter by any of the provided tags
             query = query.where(PromptTemplate.tags.overlap(tags))
-            count_query = count_query.where(PromptTemplate.tags.overlap(tags))
-
-        # Get total count
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
 
-        # Get paginated results
-        query = query.offset(skip).limit(limit).order_by(PromptTemplate.updated_at.desc())
-        result = await self.db.execute(query)
-        prompts = list(result.scalars().all())
-
-        return prompts, total
+        return await paginate(
+            self.db,
+            query,
+            PromptTemplate.updated_at,
+            PromptTemplate.id,
+            limit,
+            cursor=cursor,
+            skip=skip,
+            include_total=include_total,
+            count_cap=settings.pagination_count_cap,
+        )
 
     async def create_prompt(
         self, user_id: UUID, prompt_data: PromptCreate
@@ -0,0 +1,80 @@
+"""Periodic health probes of multi-replica models."""
+
+import asyncio
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import async_session_maker
+from app.models.model import Model
+from app.services.model import ModelService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ReplicaProber:
+    """
+    Probe the endpoints of active multi-replica models on a timer.
+
+    Each round feeds the per-endpoint circuit breakers the same way as
+    ``POST /models/{id}/health``: a dead replica is ejected from load
+    balancing before real calls have to fail on it, and a recovered one is
+    restored without waiting for traffic. Breakers are per process, so
+    every API and worker process runs its own prober.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        interval: float = settings.replica_probe_seconds,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def probe_all(self) -> int:
+        """Probe every replica of each active multi-replica model once.
+
+        Returns the number of endpoints probed.
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Model.endpoint_url, Model.replica_urls, Model.api_key).where(
+                    Model.is_active == True
+                )
+            )
+            # Read everything up front; no session is held while probing
+            targets = [
+                ([row.endpoint_url, *row.replica_urls], row.api_key)
+                for row in result.all()
+                if row.replica_urls
+            ]
+        await asyncio.gather(
+            *(ModelService.probe_endpoints(urls, key) for urls, key in targets)
+        )
+        return sum(len(urls) for urls, _ in targets)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.probe_all()
+            except Exception:
+                logger.exception("Replica probe round failed")
+
+
+# Singleton instance
+replica_prober = ReplicaProber()
@@ -0,0 +1,182 @@
+"""Compressed storage of large test result responses."""
+
+import logging
+import uuid
+from uuid import UUID
+
+from sqlalchemy import LargeBinary, cast, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import async_session_maker
+from app.models.job import Job, JobKind
+from app.models.test_run import (
+    RESPONSE_PREVIEW_CHARS,
+    SEARCH_MAX_CHARS,
+    TestResult,
+    TestResultBlob,
+)
+from app.services.jobs import JobQueue
+from app.services.search import REGCONFIG
+from app.utils.compression import compress
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Stored size of an inline response, in bytes
+_inline_bytes = func.length(cast(TestResult.response, LargeBinary))
+
+
+def offload_response(values: dict) -> str | None:
+    """
+    Take a large response out of a result's INSERT values.
+
+    The row keeps a NULL response and ``response_offloaded``; the returned
+    text is for ``insert_blobs``. Returns None if the response stays inline.
+    """
+    response = values.get("response")
+    if response is None or len(response.encode()) <= settings.response_offload_bytes:
+        return None
+    values["response"] = None
+    values["response_offloaded"] = True
+    return response
+
+
+async def insert_blobs(db: AsyncSession, responses: dict[UUID, str]) -> None:
+    """Compress responses into blob rows keyed by result id."""
+    if not responses:
+        return
+    rows = []
+    for result_id, text in responses.items():
+        raw = text.encode()
+        codec, data = compress(raw, settings.response_compression_level)
+        row = {
+            "result_id": result_id,
+            "codec": codec,
+            "raw_size": len(raw),
+            "data": data,
+        }
+        if db.bind.dialect.name == "postgresql":
+            # Indexed here, since the stored text is compressed
+            row["search_vector"] = func.to_tsvector(
+                REGCONFIG, text[:SEARCH_MAX_CHARS]
+            )
+        rows.append(row)
+    await db.execute(insert(TestResultBlob).values(rows))
+
+
+async def storage_report(db: AsyncSession) -> dict:
+    """Sizes of inline and offloaded responses and the bytes saved."""
+    inline = (
+        await db.execute(
+            select(
+                func.count(TestResult.id),
+                func.coalesce(func.sum(_inline_bytes), 0),
+                func.count(TestResult.id).filter(
+                    _inline_bytes > settings.response_offload_bytes
+                ),
+            ).where(TestResult.response.is_not(None))
+        )
+    ).one()
+    offloaded = (
+        await db.execute(
+            select(
+                func.count(TestResultBlob.result_id),
+                func.coalesce(func.sum(TestResultBlob.raw_size), 0),
+                func.coalesce(func.sum(func.length(TestResultBlob.data)), 0),
+            )
+        )
+    ).one()
+
+    raw_bytes, stored_bytes = offloaded[1], offloaded[2]
+    return {
+        "inline_results": inline[0],
+        "inline_bytes": inline[1],
+        "pending_results": inline[2],  # Large enough to offload, still inline
+        "offloaded_results": offloaded[0],
+        "offloaded_raw_bytes": raw_bytes,
+        "offloaded_stored_bytes": stored_bytes,
+        "saved_bytes": raw_bytes - stored_bytes,
+        "compression_ratio": (
+            round(raw_bytes / stored_bytes, 2) if stored_bytes else None
+        ),
+        "offload_bytes": settings.response_offload_bytes,
+    }
+
+
+class ResponseOffloader:
+    """
+    Background move of existing large responses into the blob table.
+
+    Walks ``test_results`` in id order, ``batch_size`` offloadable rows per
+    transaction, so each step continues a primary-key range scan instead of
+    rescanning the table. Moved rows no longer match, so a restarted job
+    only finds the rest. Rows locked by another offloader are skipped.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        batch_size: int = settings.response_offload_batch,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    @staticmethod
+    def enqueue(db: AsyncSession) -> Job:
+        """Queue a migration job in the caller's session."""
+        return JobQueue.enqueue(db, JobKind.RESPONSE_OFFLOAD, uuid.uuid4())
+
+    async def run(self, job_id: UUID) -> None:
+        """Offload every inline response over the threshold."""
+        moved, after = 0, None
+        while True:
+            count, after = await self.offload_batch(after)
+            moved += count
+            if after is None:
+                break
+        logger.info("Response offload %s moved %d responses", job_id, moved)
+
+    async def offload_batch(
+        self, after: UUID | None = None
+    ) -> tuple[int, UUID | None]:
+        """
+        Offload one batch of results with ids past ``after``.
+
+        Returns the number moved and the id to continue after (None once
+        there is nothing left).
+        """
+        query = (
+            select(TestResult.id, TestResult.response)
+            .where(
+                TestResult.response_offloaded == False,
+                _inline_bytes > settings.response_offload_bytes,
+            )
+            .order_by(TestResult.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        if after is not None:
+            query = query.where(TestResult.id > after)
+
+        async with self.session_factory() as db:
+            rows = (await db.execute(query)).all()
+            if not rows:
+                return 0, None
+            await insert_blobs(db, {row.id: row.response for row in rows})
+            await db.execute(
+                update(TestResult)
+                .where(TestResult.id.in_([row.id for row in rows]))
+                .values(
+                    response=None,
+                    response_offloaded=True,
+                    # Rows from before previews were stored
+                    response_preview=func.coalesce(
+                        TestResult.response_preview,
+                        func.substr(TestResult.response, 1, RESPONSE_PREVIEW_CHARS),
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        return len(rows), rows[-1].id
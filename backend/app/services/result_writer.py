@@ -0,0 +1,273 @@
+"""Write-behind buffer that group-commits test results."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from functools import partial
+from typing import NamedTuple
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import async_session_maker
+from app.models.test_run import TestResult, TestRun, TestRunStatus
+from app.services.response_store import insert_blobs, offload_response
+from app.utils.stats import LatencyWindow, summarize
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Called in the flush transaction with the results a caller's writes saved
+OnSaved = Callable[[AsyncSession, list[TestResult]], Awaitable[None]]
+
+
+class _Item(NamedTuple):
+    result: TestResult
+    on_saved: OnSaved | None
+    done: asyncio.Future
+
+
+def _insert_values(result: TestResult) -> dict:
+    """Column values of an unsaved result for a multi-row INSERT.
+
+    Unset columns take their Python-side defaults, so every row has the
+    same keys. The id and timestamps are assigned here (and set on the
+    object) so callers can use them without reading the row back.
+    """
+    if result.id is None:
+        result.id = uuid.uuid4()
+    if result.created_at is None:
+        result.created_at = result.updated_at = datetime.now(timezone.utc)
+
+    values = {}
+    for column in TestResult.__table__.columns:
+        value = getattr(result, column.key)
+        if value is None and column.default is not None:
+            value = column.default.arg
+        values[column.key] = value
+    return values
+
+
+async def insert_results(db: AsyncSession, results: list[TestResult]) -> list:
+    """
+    Insert results with one multi-row INSERT; returns the ids written.
+
+    A result for a (run, config index) that already has one is skipped, so
+    a duplicate from a resumed run is dropped. Large responses are written
+    compressed to the blob table; the result objects keep their text.
+    """
+    insert = (
+        postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    )
+    rows = [_insert_values(result) for result in results]
+    offloaded = {}
+    for row in rows:
+        response = offload_response(row)
+        if response is not None:
+            offloaded[row["id"]] = response
+    saved = await db.execute(
+        insert(TestResult)
+        .on_conflict_do_nothing(
+            index_elements=[TestResult.test_run_id, TestResult.config_index]
+        )
+        .returning(TestResult.id),
+        rows,
+    )
+    saved_ids = list(saved.scalars())
+    await insert_blobs(
+        db, {key: offloaded[key] for key in saved_ids if key in offloaded}
+    )
+    return saved_ids
+
+
+class ResultWriter:
+    """
+    Collect ``TestResult`` rows from concurrent runs and group-commit them.
+
+    ``write`` queues a result and returns once the transaction holding it
+    has committed, so callers keep their durability guarantee. A single
+    background task inserts up to ``max_rows`` queued results at a time
+    with one multi-row INSERT, waiting at most ``flush_ms`` for a group to
+    fill, and moves each affected ``running`` run to ``partial`` in the
+    same transaction. A caller can pass ``on_saved`` to update its own
+    state (e.g. a batch's counters) in that transaction too.
+
+    At most ``max_pending`` results wait in the queue; beyond that
+    ``write`` blocks until the writer catches up. If a group fails, its
+    rows are retried one at a time. ``stop`` flushes everything queued
+    before returning. If the background task dies, every waiting ``write``
+    fails instead of hanging; the next ``write`` starts a new task.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        max_rows: int = settings.result_write_size,
+        flush_ms: float = settings.result_flush_ms,
+        max_pending: int = settings.result_buffer_max,
+    ):
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.flush_ms = flush_ms
+        self.max_pending = max_pending
+        # Created with the task, on the loop that runs it
+        self._queue: asyncio.Queue[_Item | None] | None = None
+        self._task: asyncio.Task | None = None
+        self._group: list[_Item] = []  # Taken off the queue, not yet written
+        # Metrics
+        self.rows_written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.backpressure_waits = 0  # Writes that found the buffer full
+        self._flush_latency = LatencyWindow()
+        self._batch_sizes = LatencyWindow()
+
+    async def write(
+        self, result: TestResult, on_saved: OnSaved | None = None
+    ) -> None:
+        """
+        Queue a result and wait until it is committed.
+
+        ``on_saved(db, results)`` is called before the commit with the
+        results of this group that were inserted (duplicates are skipped)
+        and share that ``on_saved``.
+        """
+        task = self._start()
+        done = asyncio.get_running_loop().create_future()
+        if self._queue.full():
+            self.backpressure_waits += 1
+        await self._queue.put(_Item(result, on_saved, done))
+        if task.done():
+            raise RuntimeError("Result writer stopped")
+        await done
+
+    async def stop(self) -> None:
+        """Flush every queued result and stop the background task."""
+        if not self._running():
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def _running(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is asyncio.get_running_loop()
+        )
+
+    def _start(self) -> asyncio.Task:
+        if not self._running():
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = asyncio.create_task(self._run(self._queue))
+            self._task.add_done_callback(partial(self._on_stopped, self._queue))
+        return self._task
+
+    def _on_stopped(self, queue: asyncio.Queue, task: asyncio.Task) -> None:
+        """Fail every write still waiting on a writer task that has exited."""
+        pending = self._group
+        self._group = []
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                pending.append(item)
+        if not pending:
+            return
+        if task.cancelled():
+            error = RuntimeError("Result writer was cancelled")
+        else:
+            cause = task.exception()
+            logger.error("Result writer stopped unexpectedly", exc_info=cause)
+            error = RuntimeError("Result writer stopped")
+            error.__cause__ = cause
+        for item in pending:
+            if not item.done.done():
+                item.done.set_exception(error)
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Flush groups of ``max_rows`` (or after ``flush_ms``) until stopped."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            group = self._group = []
+            deadline = loop.time() + self.flush_ms / 1000
+            while item is not None:
+                group.append(item)
+                if len(group) >= self.max_rows:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+            if group:
+                await self._flush(group)
+            self._group = []
+            if item is None:
+                return
+
+    async def _flush(self, group: list[_Item]) -> None:
+        started = time.perf_counter()
+        try:
+            async with self.session_factory() as db:
+                saved = set(
+                    await insert_results(db, [item.result for item in group])
+                )
+                hooks: dict[OnSaved, list[TestResult]] = {}
+                for item in group:
+                    if item.on_saved is not None and item.result.id in saved:
+                        hooks.setdefault(item.on_saved, []).append(item.result)
+                await db.execute(
+                    update(TestRun)
+                    .where(
+                        TestRun.id.in_({item.result.test_run_id for item in group}),
+                        TestRun.status == TestRunStatus.RUNNING,
+                    )
+                    .values(status=TestRunStatus.PARTIAL)
+                )
+                for on_saved, results in hooks.items():
+                    await on_saved(db, results)
+                await db.commit()
+        except Exception as e:
+            self.failed_flushes += 1
+            if len(group) > 1:
+                # Retry one by one so a bad row (e.g. its run was deleted)
+                # only fails its own writer
+                for item in group:
+                    await self._flush([item])
+                return
+            logger.exception("Failed to write a test result")
+            if not group[0].done.done():
+                group[0].done.set_exception(e)
+            return
+
+        self.flushes += 1
+        self.rows_written += len(group)
+        self._flush_latency.add((time.perf_counter() - started) * 1000)
+        self._batch_sizes.add(len(group))
+        for item in group:
+            if not item.done.done():
+                item.done.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "max_pending": self.max_pending,
+            "backpressure_waits": self.backpressure_waits,
+            "max_rows": self.max_rows,
+            "flush_ms": self.flush_ms,
+            # Over the most recent flushes
+            "flush_latency_ms": summarize(list(self._flush_latency)),
+            "batch_size": summarize(list(self._batch_sizes)),
+        }
+
+
+# Singleton instance
+result_writer = ResultWriter()
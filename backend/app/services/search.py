@@ -0,0 +1,215 @@
+"""Full-text search over test runs and their results."""
+
+import re
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Select, func, literal, literal_column, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.model import Model
+from app.models.text import StoredText
+from app.models.test_run import (
+    SEARCH_CONFIG,
+    SEARCH_MAX_CHARS,
+    TestResult,
+    TestResultBlob,
+    TestRun,
+)
+from app.schemas.test_run import TestRunSearchHit
+
+# Highlighted excerpts: up to two fragments of the matching text
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+)
+EXCERPT_CHARS = 80  # Context either side of a match, without Postgres
+REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+class SearchService:
+    """
+    Search a user's test runs by prompt and model response.
+
+    On Postgres the query is parsed with ``websearch_to_tsquery`` (quoted
+    phrases, ``or``, ``-word``) and matched against the generated
+    ``search_vector`` columns of results, blobs and the shared texts of
+    prompts and messages through their GIN indexes; hits are ranked
+    with ``ts_rank`` and only the returned page is passed to
+    ``ts_headline``. Other databases fall back to a case-insensitive
+    substring match ordered by date.
+
+    Offloaded responses are matched through their blob's ``search_vector``;
+    their excerpt comes from the stored preview, since the full text is
+    compressed.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(
+        self,
+        user_id: UUID,
+        query: str,
+        model_id: UUID | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> list[TestRunSearchHit]:
+        """
+        Results of the user's runs whose prompt or response matches ``query``.
+
+        Each hit is one model's result; a run matching on its prompt yields
+        a hit for each of its results.
+        """
+        filters = [TestRun.user_id == user_id]
+        if model_id is not None:
+            filters.append(TestResult.model_id == model_id)
+        if created_from is not None:
+            filters.append(TestRun.created_at >= created_from)
+        if created_to is not None:
+            filters.append(TestRun.created_at < created_to)
+
+        if self.db.bind.dialect.name == "postgresql":
+            rows = await self.db.execute(
+                self._full_text_query(user_id, query, filters, skip, limit)
+            )
+            return [TestRunSearchHit.model_validate(row._mapping) for row in rows]
+
+        rows = await self.db.execute(
+            self._substring_query(query, filters, skip, limit)
+        )
+        return [
+            TestRunSearchHit.model_validate(
+                {
+                    **row._mapping,
+                    "user_message": highlight(row.user_message, query),
+                    "response": highlight(row.response, query),
+                }
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _full_text_query(
+        user_id: UUID, query: str, filters: list, skip: int, limit: int
+    ) -> Select:
+        tsquery = func.websearch_to_tsquery(REGCONFIG, query)
+        result_vector = literal_column("test_results.search_vector")
+        message = aliased(StoredText, name="message_text")
+        prompt = aliased(StoredText, name="prompt_text")
+
+        def text_rank(alias: str):
+            vector = literal_column(f"{alias}.search_vector")
+            return func.coalesce(func.ts_rank(vector, tsquery), 0)
+
+        # Each branch is a GIN index lookup (texts are shared, so a prompt
+        # repeated across runs is matched once); an OR across the joins
+        # could use no index
+        texts = (
+            select(StoredText.hash)
+            .where(literal_column("texts.search_vector").bool_op("@@")(tsquery))
+            .scalar_subquery()
+        )
+        matches = union(
+            select(TestResult.id).where(result_vector.bool_op("@@")(tsquery)),
+            select(TestResultBlob.result_id).where(
+                TestResultBlob.search_vector.bool_op("@@")(tsquery)
+            ),
+            *(
+                select(TestResult.id)
+                .join(TestRun, TestResult.test_run_id == TestRun.id)
+                .where(text_column.in_(texts), TestRun.user_id == user_id)
+                for text_column in (
+                    TestRun.user_message_hash,
+                    TestRun.system_prompt_hash,
+                )
+            ),
+        )
+        # The message weighs like a response, the system prompt less
+        rank = (
+            text_rank("message_text")
+            + text_rank("prompt_text") * 0.4
+            + func.ts_rank(result_vector, tsquery)
+            + func.coalesce(func.ts_rank(TestResultBlob.search_vector, tsquery), 0)
+        )
+        page = (
+            select(TestResult.id.label("result_id"), rank.label("rank"))
+            .join(TestRun, TestResult.test_run_id == TestRun.id)
+            .join(message, message.hash == TestRun.user_message_hash)
+            .outerjoin(prompt, prompt.hash == TestRun.system_prompt_hash)
+            .outerjoin(TestResultBlob, TestResultBlob.result_id == TestResult.id)
+            .where(TestResult.id.in_(matches), *filters)
+            .order_by(rank.desc(), TestResult.id)
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+
+        def headline(text):
+            return func.ts_headline(REGCONFIG, text, tsquery, HEADLINE_OPTIONS)
+
+        response = func.coalesce(
+            func.left(TestResult.response, SEARCH_MAX_CHARS),
+            TestResult.response_preview,
+        )
+        return (
+            select(
+                TestResult.test_run_id,
+                page.c.result_id,
+                TestResult.model_id,
+                Model.name.label("model_name"),
+                page.c.rank,
+                headline(TestRun.user_message).label("user_message"),
+                headline(response).label("response"),
+                TestRun.created_at,
+            )
+            .select_from(page)
+            .join(TestResult, TestResult.id == page.c.result_id)
+            .join(TestRun, TestResult.test_run_id == TestRun.id)
+            .outerjoin(Model, TestResult.model_id == Model.id)
+            .order_by(page.c.rank.desc(), page.c.result_id)
+        )
+
+    @staticmethod
+    def _substring_query(query: str, filters: list, skip: int, limit: int) -> Select:
+        response = func.coalesce(TestResult.response, TestResult.response_preview)
+        return (
+            select(
+                TestResult.test_run_id,
+                TestResult.id.label("result_id"),
+                TestResult.model_id,
+                Model.name.label("model_name"),
+                literal(0.0).label("rank"),
+                TestRun.user_message,
+                response.label("response"),
+                TestRun.created_at,
+            )
+            .join(TestRun, TestResult.test_run_id == TestRun.id)
+            .outerjoin(Model, TestResult.model_id == Model.id)
+            .where(
+                or_(
+                    TestRun.user_message.icontains(query, autoescape=True),
+                    TestRun.system_prompt.icontains(query, autoescape=True),
+                    response.icontains(query, autoescape=True),
+                ),
+                *filters,
+            )
+            .order_by(TestRun.created_at.desc(), TestResult.id)
+            .offset(skip)
+            .limit(limit)
+        )
+
+
+def highlight(text: str | None, query: str) -> str | None:
+    """Excerpt of ``text`` around the first match of ``query``, marked up."""
+    if text is None:
+        return None
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    match = pattern.search(text)
+    if match is None:
+        return text[: EXCERPT_CHARS * 2]
+    start = max(match.start() - EXCERPT_CHARS, 0)
+    excerpt = text[start : match.end() + EXCERPT_CHARS]
+    return pattern.sub(lambda m: f"<mark>{m.group()}</mark>", excerpt)
@@ -1,23 +1,64 @@
 """Test Run service for executing tests against LLM models."""
 
 import asyncio
+import itertools
+import json
+import math
+import random
+import time
+from collections.abc import AsyncIterator
 from uuid import UUID
 
+from pydantic import ValidationError
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.config import get_settings
+from app.models.job import JobKind
 from app.models.model import Model
-from app.models.test_run import TestResult, TestRun
-from app.schemas.test_run import ModelTestConfig, TestRunCreate
-from app.utils.llm_client import llm_client
+from app.models.test_run import (
+    RESPONSE_PREVIEW_CHARS,
+    TestResult,
+    TestRun,
+    TestRunStatus,
+)
+from app.schemas.test_run import (
+    ModelProgress,
+    ModelTestConfig,
+    ResultPreview,
+    SweepGroup,
+    SweepSpec,
+    TestResultResponse,
+    TestRunCreate,
+    TestRunProgress,
+    TestRunResponse,
+    TestRunSummary,
+    TestRunSweepCreate,
+    TestRunSweepResponse,
+)
+from app.services.jobs import JobQueue
+from app.services.model import model_names
+from app.services.result_writer import ResultWriter, result_writer
+from app.utils.llm_client import (
+    LLMResponse,
+    build_messages,
+    is_deterministic,
+    llm_client,
+)
+from app.utils.pagination import Page, paginate
+from app.utils.response_cache import make_cache_key, response_cache
+
+settings = get_settings()
 
 
 class TestRunService:
     """Service for managing test runs and executions."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, writer: ResultWriter = result_writer):
         self.db = db
+        # Group-commits per-model results outside the request's session
+        self.writer = writer
 
     async def create_and_execute_test(
         self, user_id: UUID, test_data: TestRunCreate
@@ -25,6 +66,11 @@ class TestRunService:
         """
         Create a new test run and execute it against specified models.
 
+        The run is committed as ``running`` before any model is called, and
+        each model's result is committed as soon as that model finishes (the
+        run turns ``partial``), so readers see results progressively and
+        finished results survive a crash.
+
         Args:
             user_id: ID of the user creating the test
             test_data: Test configuration including message and model configs
@@ -38,6 +84,7 @@ class TestRunService:
             user_message=test_data.user_message,
             system_prompt=test_data.system_prompt,
             prompt_template_id=test_data.prompt_template_id,
+            status=TestRunStatus.RUNNING,
         )
         self.db.add(test_run)
         await self.db.flush()
@@ -48,45 +95,346 @@ class TestRunService:
             select(Model).where(Model.id.in_(model_ids), Model.is_active == True)
         )
         models = {m.id: m for m in result.scalars().all()}
+        await self.db.commit()
 
-        # Create tasks for concurrent model calls
-        tasks = []
-        for config in test_data.models:
-            model = models.get(config.model_id)
-            if model:
-                task = self._execute_single_model(
-                    test_run.id,
-                    model,
-                    test_data.user_message,
-                    test_data.system_prompt,
-                    config,
+        status = TestRunStatus.FAILED
+        error = "Request ended before every model finished"
+        try:
+            # Execute all model calls concurrently, saving each as it ends
+            await asyncio.gather(
+                *(
+                    self._execute_and_save(
+                        test_run.id,
+                        models[config.model_id],
+                        test_data.user_message,
+                        test_data.system_prompt,
+                        config,
+                        test_data.stream,
+                    )
+                    for config in test_data.models
+                    if config.model_id in models
                 )
-                tasks.append(task)
+            )
+            status, error = TestRunStatus.COMPLETE, None
+        finally:
+            test_run.status = status
+            test_run.error = error
+            await self.db.commit()
+
+        # Reload with results, which other sessions wrote
+        return await self.get_test_run_by_id(test_run.id, user_id)
+
+    async def _execute_and_save(
+        self,
+        test_run_id: UUID,
+        model: Model,
+        user_message: str,
+        system_prompt: str | None,
+        config: ModelTestConfig,
+        stream: bool,
+    ) -> None:
+        """Execute one model and wait for its result to be committed."""
+        try:
+            test_result = await self.execute_model(
+                test_run_id, model, user_message, system_prompt, config, stream
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            test_result = TestResult(
+                test_run_id=test_run_id,
+                model_id=model.id,
+                parameters=self._parameters(config),
+                error=f"Execution error: {str(e)}",
+            )
 
-        # Execute all model calls concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await self.writer.write(test_result)
 
-        # Add results to session
-        for result in results:
-            if isinstance(result, TestResult):
-                self.db.add(result)
+    async def create_test_run_job(
+        self, user_id: UUID, test_data: TestRunCreate
+    ) -> TestRun:
+        """
+        Persist a test run for background execution.
 
-        await self.db.commit()
+        The run is committed with status ``pending`` and the model configs
+        needed to execute it, together with a job row that any worker
+        process can claim.
+        """
+        return await self._queue_test_run(
+            user_id,
+            test_data.user_message,
+            test_data.system_prompt,
+            test_data.prompt_template_id,
+            test_data.model_dump(mode="json", include={"models", "stream"}),
+        )
 
-        # Refresh with relationships
-        await self.db.refresh(test_run, ["results"])
-        return test_run
+    async def create_sweep_job(
+        self, user_id: UUID, sweep_data: TestRunSweepCreate
+    ) -> TestRun:
+        """
+        Expand a parameter sweep and queue it as one background test run.
 
-    async def _execute_single_model(
+        Raises ``ValueError`` if the sweep expands to invalid parameters or
+        more than ``sweep_max_calls`` configs.
+        """
+        configs = self.expand_sweep(
+            sweep_data.sweep, sweep_data.model_ids, settings.sweep_max_calls
+        )
+        return await self._queue_test_run(
+            user_id,
+            sweep_data.user_message,
+            sweep_data.system_prompt,
+            sweep_data.prompt_template_id,
+            {
+                "models": [c.model_dump(mode="json") for c in configs],
+                "stream": False,
+                "sweep": sweep_data.sweep.model_dump(mode="json"),
+            },
+        )
+
+    async def _queue_test_run(
         self,
+        user_id: UUID,
+        user_message: str,
+        system_prompt: str | None,
+        prompt_template_id: UUID | None,
+        config: dict,
+    ) -> TestRun:
+        test_run = TestRun(
+            user_id=user_id,
+            user_message=user_message,
+            system_prompt=system_prompt,
+            prompt_template_id=prompt_template_id,
+            status=TestRunStatus.PENDING,
+            config=config,
+        )
+        self.db.add(test_run)
+        await self.db.flush()
+        JobQueue.enqueue(
+            self.db,
+            JobKind.TEST_RUN,
+            test_run.id,
+            max_attempts=settings.job_max_attempts,
+        )
+        await self.db.commit()
+        return test_run
+
+    @staticmethod
+    def expand_sweep(
+        spec: SweepSpec,
+        model_ids: list[UUID],
+        max_calls: int = settings.sweep_max_calls,
+    ) -> list[ModelTestConfig]:
+        """
+        Expand a sweep into one config per model and parameter combination.
+
+        Configs are ordered model by model, so a model's calls go out
+        together over its pooled connections and, sharing one prompt, hit
+        the same replica's prefix cache. Raises ``ValueError`` for values
+        outside the allowed parameter ranges, or if the sweep could expand
+        to more than ``max_calls`` configs (checked before expanding).
+        """
+        axes = {
+            name: getattr(spec, name)
+            for name in ("temperature", "top_p", "max_tokens")
+            if getattr(spec, name) is not None
+        }
+
+        if spec.strategy == "grid":
+            size = math.prod(len(axis.values) for axis in axes.values())
+        else:
+            size = spec.samples
+        if size * len(model_ids) > max_calls:
+            raise ValueError(
+                f"Sweep expands to {size * len(model_ids)} calls "
+                f"(limit {max_calls})"
+            )
+
+        if spec.strategy == "grid":
+            combinations = [
+                dict(zip(axes, values))
+                for values in itertools.product(*(a.values for a in axes.values()))
+            ]
+        else:
+            rng = random.Random(spec.seed)
+            combinations = []
+            for _ in range(spec.samples):
+                combination = {}
+                for name, axis in axes.items():
+                    if axis.values is not None:
+                        value = rng.choice(axis.values)
+                    elif name == "max_tokens":
+                        value = rng.randint(int(axis.min), int(axis.max))
+                    else:
+                        value = round(rng.uniform(axis.min, axis.max), 3)
+                    combination[name] = value
+                combinations.append(combination)
+
+        unique = []
+        seen = set()
+        for combination in combinations:
+            if "max_tokens" in combination:
+                combination["max_tokens"] = int(combination["max_tokens"])
+            key = tuple(combination.items())
+            if key not in seen:
+                seen.add(key)
+                unique.append(combination)
+
+        try:
+            return [
+                ModelTestConfig(model_id=model_id, n=spec.n, **combination)
+                for model_id in model_ids
+                for combination in unique
+            ]
+        except ValidationError as e:
+            raise ValueError(f"Invalid sweep parameters: {e}") from e
+
+    async def get_sweep(
+        self, test_run_id: UUID, user_id: UUID
+    ) -> TestRunSweepResponse | None:
+        """Group a run's results by parameter combination, models side by side."""
+        test_run = await self.get_test_run_by_id(test_run_id, user_id)
+        if not test_run or not test_run.config:
+            return None
+
+        configs = [
+            ModelTestConfig.model_validate(c) for c in test_run.config["models"]
+        ]
+        names = await model_names.get(
+            self.db, (config.model_id for config in configs)
+        )
+        results = {r.config_index: r for r in test_run.results}
+
+        groups: dict[str, SweepGroup] = {}
+        for index, config in enumerate(configs):
+            parameters = self._parameters(config)
+            key = json.dumps(parameters, sort_keys=True)
+            group = groups.setdefault(key, SweepGroup(parameters=parameters, results=[]))
+            result = results.get(index)
+            if result is not None:
+                group.results.append(
+                    self.result_response(
+                        result, names.get(result.model_id, "Unknown")
+                    )
+                )
+
+        return TestRunSweepResponse(
+            id=test_run.id, status=test_run.status, groups=list(groups.values())
+        )
+
+    async def get_progress(
+        self, test_run_id: UUID, user_id: UUID
+    ) -> TestRunProgress | None:
+        """Get per-model progress of a test run."""
+        test_run = await self.get_test_run_by_id(test_run_id, user_id)
+        if not test_run:
+            return None
+
+        if test_run.config:
+            model_ids = [UUID(c["model_id"]) for c in test_run.config["models"]]
+        else:
+            model_ids = [result.model_id for result in test_run.results]
+        names = await model_names.get(self.db, model_ids)
+        indexed = {
+            r.config_index: r for r in test_run.results if r.config_index is not None
+        }
+        # Older results have no config index: match them by model, in order
+        results: dict[UUID, list[TestResult]] = {}
+        for result in sorted(test_run.results, key=lambda r: r.created_at):
+            if result.config_index is None:
+                results.setdefault(result.model_id, []).append(result)
+
+        waiting = (
+            "running"
+            if test_run.status in (TestRunStatus.RUNNING, TestRunStatus.PARTIAL)
+            else "pending"
+        )
+        models = []
+        for index, model_id in enumerate(model_ids):
+            result = indexed.get(index)
+            if result is None:
+                pending_results = results.get(model_id)
+                result = pending_results.pop(0) if pending_results else None
+            models.append(
+                ModelProgress(
+                    model_id=model_id,
+                    model_name=names.get(model_id, "Unknown"),
+                    status=(
+                        waiting
+                        if result is None
+                        else "failed" if result.error else "complete"
+                    ),
+                    latency_ms=result.latency_ms if result else None,
+                    error=result.error if result else None,
+                )
+            )
+
+        return TestRunProgress(
+            id=test_run.id,
+            status=test_run.status,
+            total=len(model_ids),
+            completed=len(test_run.results),
+            error=test_run.error,
+            models=models,
+        )
+
+    @classmethod
+    async def execute_model(
+        cls,
         test_run_id: UUID,
         model: Model,
         user_message: str,
         system_prompt: str | None,
         config: ModelTestConfig,
+        stream: bool = False,
     ) -> TestResult:
-        """Execute a single model test and return the result."""
-        response = await llm_client.chat_completion(
+        """Execute a single model test and return the (unsaved) result.
+
+        Uses no database session, so callers can run it without holding one.
+        """
+        cache_key, response = await cls._lookup_cached(
+            model, user_message, system_prompt, config
+        )
+
+        if response is None:
+            request = cls._llm_request(model, user_message, system_prompt, config)
+
+            if stream and config.n == 1:
+                # Consume the stream so TTFT and decode throughput are measured
+                async for delta in llm_client.stream_chat_completion(**request):
+                    if delta.response is not None:
+                        response = delta.response
+            else:
+                # n > 1 is sampled in one non-streaming request
+                response = await llm_client.chat_completion(**request, n=config.n)
+
+            await cls._store_cached(cache_key, model, response)
+
+        return TestResult(
+            test_run_id=test_run_id,
+            model_id=model.id,
+            parameters=cls._parameters(config),
+            response=response.content,
+            latency_ms=response.latency_ms,
+            token_count=response.token_count,
+            ttft_ms=response.ttft_ms,
+            tokens_per_second=response.tokens_per_second,
+            inter_token_latency=response.inter_token_latency,
+            cache_hit=response.cached,
+            attempts=response.attempts,
+            samples=response.samples,
+            error=response.error,
+        )
+
+    @staticmethod
+    def _llm_request(
+        model: Model,
+        user_message: str,
+        system_prompt: str | None,
+        config: ModelTestConfig,
+    ) -> dict:
+        """Keyword arguments for an LLM client call against one model."""
+        return dict(
             endpoint_url=model.endpoint_url,
             api_key=model.api_key,
             model_name=model.model_name or model.name,
@@ -95,58 +443,431 @@ class TestRunService:
             temperature=config.temperature,
             max_tokens=config.max_tokens,
             top_p=config.top_p,
+            seed=config.seed,
+            # Per-model cap on concurrent calls to its endpoint
+            max_concurrency=(model.metadata_ or {}).get("max_concurrency"),
+            replica_urls=model.replica_urls,
         )
 
-        return TestResult(
-            test_run_id=test_run_id,
-            model_id=model.id,
-            parameters={
-                "temperature": config.temperature,
-                "max_tokens": config.max_tokens,
-                "top_p": config.top_p,
-            },
-            response=response.content,
-            latency_ms=response.latency_ms,
+    @staticmethod
+    def _parameters(config: ModelTestConfig) -> dict:
+        """Sampling parameters as stored on TestResult."""
+        parameters = {
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens,
+            "top_p": config.top_p,
+        }
+        if config.seed is not None:
+            parameters["seed"] = config.seed
+        if config.n > 1:
+            parameters["n"] = config.n
+        return parameters
+
+    @classmethod
+    async def _lookup_cached(
+        cls,
+        model: Model,
+        user_message: str,
+        system_prompt: str | None,
+        config: ModelTestConfig,
+    ) -> tuple[str | None, LLMResponse | None]:
+        """
+        Look up a deterministic completion in the response cache.
+
+        Returns:
+            The cache key (None when the request isn't cacheable) and the
+            cached response on a hit. Hits report the lookup time as latency
+            and are flagged ``cached`` so latency stats can exclude them.
+        """
+        if (
+            not response_cache.enabled
+            or config.n > 1
+            or not is_deterministic(config.temperature, config.seed)
+        ):
+            return None, None
+
+        cache_key = make_cache_key(
+            model.endpoint_url,
+            model.model_name or model.name,
+            build_messages(user_message, system_prompt),
+            cls._parameters(config),
+        )
+        start_time = time.perf_counter()
+        cached = await response_cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+
+        return cache_key, LLMResponse(
+            content=cached.content,
+            latency_ms=int((time.perf_counter() - start_time) * 1000),
+            token_count=cached.token_count,
+            error=None,
+            cached=True,
+            attempts=0,
+        )
+
+    @staticmethod
+    async def _store_cached(
+        cache_key: str | None, model: Model, response: LLMResponse
+    ) -> None:
+        """Cache a successful deterministic completion."""
+        if cache_key is None or response.error or response.content is None:
+            return
+        await response_cache.set(
+            cache_key,
+            endpoint_url=model.endpoint_url,
+            model_name=model.model_name or model.name,
+            content=response.content,
             token_count=response.token_count,
-            error=response.error,
+            latency_ms=response.latency_ms,
+        )
+
+    async def stream_and_execute_test(
+        self, user_id: UUID, test_data: TestRunCreate, buffer_size: int
+    ) -> AsyncIterator[dict]:
+        """
+        Create a test run and stream every model's output as it is generated.
+
+        Models run concurrently and push frames into a queue bounded by
+        ``buffer_size``. When the consumer falls behind and the queue is full,
+        a model keeps appending its deltas to one pending frame instead of
+        queueing more, so memory per connection stays bounded. Each model's
+        ``TestResult`` is committed as soon as that model finishes.
+
+        Yields:
+            JSON-serialisable frames: ``run``, ``delta``, ``result`` and
+            ``error``, each tagged with ``model_id`` where applicable
+        """
+        test_run = TestRun(
+            user_id=user_id,
+            user_message=test_data.user_message,
+            system_prompt=test_data.system_prompt,
+            prompt_template_id=test_data.prompt_template_id,
+            status=TestRunStatus.RUNNING,
+        )
+        self.db.add(test_run)
+        await self.db.flush()
+
+        model_ids = [config.model_id for config in test_data.models]
+        result = await self.db.execute(
+            select(Model).where(Model.id.in_(model_ids), Model.is_active == True)
+        )
+        models = {m.id: m for m in result.scalars().all()}
+        await self.db.commit()
+
+        queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=buffer_size)
+        tasks: list[asyncio.Task] = []
+        status = TestRunStatus.FAILED
+        error = "Stream closed before every model finished"
+        try:
+            yield {"type": "run", "test_run_id": str(test_run.id)}
+
+            tasks = [
+                asyncio.create_task(
+                    self._stream_single_model(
+                        test_run.id,
+                        models[config.model_id],
+                        test_data.user_message,
+                        test_data.system_prompt,
+                        config,
+                        queue,
+                    )
+                )
+                for config in test_data.models
+                if config.model_id in models
+            ]
+
+            pending = set(tasks)
+            while pending or not queue.empty():
+                if queue.empty():
+                    getter = asyncio.ensure_future(queue.get())
+                    done, _ = await asyncio.wait(
+                        pending | {getter}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    pending -= done
+                    if getter not in done:
+                        getter.cancel()
+                        continue
+                    yield getter.result()
+                else:
+                    yield queue.get_nowait()
+            status, error = TestRunStatus.COMPLETE, None
+        finally:
+            # Consumer went away (e.g. WebSocket closed): stop upstream calls
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            test_run.status = status
+            test_run.error = error
+            await self.db.commit()
+
+    async def _stream_single_model(
+        self,
+        test_run_id: UUID,
+        model: Model,
+        user_message: str,
+        system_prompt: str | None,
+        config: ModelTestConfig,
+        queue: asyncio.Queue,
+    ) -> None:
+        """Stream one model's deltas into the queue and persist its result."""
+        model_id = str(model.id)
+        pending = ""
+
+        try:
+            cache_key, response = await self._lookup_cached(
+                model, user_message, system_prompt, config
+            )
+            if response is not None:
+                pending = response.content
+            else:
+                async for delta in llm_client.stream_chat_completion(
+                    **self._llm_request(model, user_message, system_prompt, config)
+                ):
+                    if delta.response is not None:
+                        response = delta.response
+                        continue
+
+                    pending += delta.content
+                    try:
+                        queue.put_nowait(
+                            {"type": "delta", "model_id": model_id, "content": pending}
+                        )
+                        pending = ""
+                    except asyncio.QueueFull:
+                        # Slow consumer: coalesce into the next frame instead
+                        pass
+
+                await self._store_cached(cache_key, model, response)
+
+            if pending:
+                await queue.put(
+                    {"type": "delta", "model_id": model_id, "content": pending}
+                )
+
+            test_result = TestResult(
+                test_run_id=test_run_id,
+                model_id=model.id,
+                parameters=self._parameters(config),
+                response=response.content,
+                latency_ms=response.latency_ms,
+                token_count=response.token_count,
+                ttft_ms=response.ttft_ms,
+                tokens_per_second=response.tokens_per_second,
+                inter_token_latency=response.inter_token_latency,
+                cache_hit=response.cached,
+                attempts=response.attempts,
+                error=response.error,
+            )
+            await self.writer.write(test_result)
+
+            result_response = self.result_response(test_result, model.name)
+            await queue.put(
+                {
+                    "type": "result",
+                    "model_id": model_id,
+                    "result": result_response.model_dump(mode="json"),
+                }
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(
+                {"type": "error", "model_id": model_id, "detail": str(e)}
+            )
+
+    @staticmethod
+    def result_response(result: TestResult, model_name: str) -> TestResultResponse:
+        """Response schema of a saved result."""
+        return TestResultResponse(
+            id=result.id,
+            model_id=result.model_id,
+            model_name=model_name,
+            parameters=result.parameters,
+            response=result.full_response,
+            latency_ms=result.latency_ms,
+            token_count=result.token_count,
+            ttft_ms=result.ttft_ms,
+            tokens_per_second=result.tokens_per_second,
+            inter_token_latency=result.inter_token_latency,
+            cache_hit=result.cache_hit,
+            attempts=result.attempts,
+            samples=result.samples,
+            error=result.error,
+            created_at=result.created_at,
+        )
+
+    async def run_response(self, test_run: TestRun) -> TestRunResponse:
+        """Response schema of a run and its results, with model names.
+
+        Names come from the model name cache: at most one query per
+        response, however many results it has.
+        """
+        names = await model_names.get(
+            self.db, (result.model_id for result in test_run.results)
+        )
+        return TestRunResponse(
+            id=test_run.id,
+            user_id=test_run.user_id,
+            prompt_template_id=test_run.prompt_template_id,
+            user_message=test_run.user_message,
+            system_prompt=test_run.system_prompt,
+            status=test_run.status,
+            error=test_run.error,
+            results=[
+                self.result_response(
+                    result, names.get(result.model_id, "Unknown")
+                )
+                for result in test_run.results
+            ],
+            created_at=test_run.created_at,
+            updated_at=test_run.updated_at,
         )
 
     async def get_test_run_by_id(
         self, test_run_id: UUID, user_id: UUID
     ) -> TestRun | None:
-        """Get a test run by ID with all results."""
+        """Get a test run by ID with all results, their models and blobs."""
+        load_results = selectinload(TestRun.results)
         result = await self.db.execute(
             select(TestRun)
-            .options(selectinload(TestRun.results))
+            .options(
+                load_results.joinedload(TestResult.model),
+                load_results.joinedload(TestResult.blob),
+            )
             .where(TestRun.id == test_run_id, TestRun.user_id == user_id)
+            .execution_options(populate_existing=True)
         )
-        return result.scalar_one_or_none()
+        test_run = result.scalar_one_or_none()
+        if test_run is not None:
+            # Loaded anyway: refresh the cache so responses need no lookup
+            for test_result in test_run.results:
+                if test_result.model is not None:
+                    model_names.remember(test_result.model_id, test_result.model.name)
+        return test_run
 
     async def get_test_runs(
         self,
         user_id: UUID,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[TestRun], int]:
-        """Get paginated list of test runs for a user."""
-        # Count query
-        count_result = await self.db.execute(
-            select(func.count(TestRun.id)).where(TestRun.user_id == user_id)
+        cursor: str | None = None,
+        include_total: bool = True,
+        system_prompt_hash: str | None = None,
+    ) -> Page[TestRun]:
+        """
+        Get a page of a user's test runs, newest first.
+
+        Pass the previous page's ``next_cursor`` to continue after it;
+        ``skip`` is only used without a cursor. Raises ``ValueError`` for
+        a malformed cursor. ``system_prompt_hash`` (see ``text_hash``)
+        keeps only runs with exactly that system prompt.
+        """
+        # Batch rows are listed under their batch, not in the history;
+        # results are summarized separately
+        query = select(TestRun).where(
+            TestRun.user_id == user_id, TestRun.batch_id.is_(None)
+        )
+        if system_prompt_hash is not None:
+            query = query.where(TestRun.system_prompt_hash == system_prompt_hash)
+        return await paginate(
+            self.db,
+            query,
+            TestRun.created_at,
+            TestRun.id,
+            limit,
+            cursor=cursor,
+            skip=skip,
+            include_total=include_total,
+            count_cap=settings.pagination_count_cap,
         )
-        total = count_result.scalar() or 0
 
-        # Main query
-        result = await self.db.execute(
-            select(TestRun)
-            .options(selectinload(TestRun.results))
-            .where(TestRun.user_id == user_id)
-            .order_by(TestRun.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+    async def summarize(self, test_runs: list[TestRun]) -> list[TestRunSummary]:
+        """
+        Summaries of runs without loading their results.
+
+        Counts and latency range come from one aggregate query, previews
+        (the stored start of each model's first response) from another,
+        so a page costs the same memory however long the responses are.
+        """
+        run_ids = [run.id for run in test_runs]
+        if not run_ids:
+            return []
+
+        stats_result = await self.db.execute(
+            select(
+                TestResult.test_run_id,
+                func.count(TestResult.id),
+                func.count(TestResult.error),
+                func.min(TestResult.latency_ms),
+                func.max(TestResult.latency_ms),
+            )
+            .where(TestResult.test_run_id.in_(run_ids))
+            .group_by(TestResult.test_run_id)
         )
-        test_runs = list(result.scalars().all())
+        stats = {row[0]: row[1:] for row in stats_result.all()}
 
-        return test_runs, total
+        ranked = (
+            select(
+                TestResult.test_run_id,
+                TestResult.model_id,
+                # Rows saved before previews existed: cut the text in SQL
+                func.coalesce(
+                    TestResult.response_preview,
+                    func.substr(TestResult.response, 1, RESPONSE_PREVIEW_CHARS),
+                ).label("preview"),
+                TestResult.error.is_not(None).label("failed"),
+                func.row_number()
+                .over(
+                    partition_by=(TestResult.test_run_id, TestResult.model_id),
+                    order_by=(TestResult.config_index, TestResult.created_at),
+                )
+                .label("rank"),
+            )
+            .where(TestResult.test_run_id.in_(run_ids))
+            .subquery()
+        )
+        previews_result = await self.db.execute(
+            select(ranked).where(ranked.c.rank == 1)
+        )
+        previews: dict[UUID, list] = {}
+        for row in previews_result.all():
+            previews.setdefault(row.test_run_id, []).append(row)
+        names = await model_names.get(
+            self.db, (row.model_id for rows in previews.values() for row in rows)
+        )
+
+        summaries = []
+        for run in test_runs:
+            count, errors, min_latency, max_latency = stats.get(
+                run.id, (0, 0, None, None)
+            )
+            run_previews = [
+                ResultPreview(
+                    model_id=row.model_id,
+                    model_name=names.get(row.model_id, "Unknown"),
+                    response_preview=row.preview,
+                    failed=row.failed,
+                )
+                for row in previews.get(run.id, [])
+            ]
+            summaries.append(
+                TestRunSummary(
+                    id=run.id,
+                    user_message=run.user_message,
+                    system_prompt=run.system_prompt,
+                    prompt_template_id=run.prompt_template_id,
+                    status=run.status,
+                    result_count=count,
+                    error_count=errors,
+                    min_latency_ms=min_latency,
+                    max_latency_ms=max_latency,
+                    model_names=sorted({p.model_name for p in run_previews}),
+                    previews=run_previews,
+                    created_at=run.created_at,
+                )
+            )
+        return summaries
 
     async def delete_test_run(self, test_run_id: UUID, user_id: UUID) -> bool:
         """Delete a test run and all its results."""
@@ -0,0 +1,159 @@
+"""Background execution of queued test runs."""
+
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.session import async_session_maker
+from app.models.model import Model
+from app.models.test_run import TestResult, TestRun, TestRunStatus
+from app.schemas.test_run import ModelTestConfig
+from app.services.result_writer import ResultWriter, result_writer
+from app.services.test_run import TestRunService
+from app.utils.progress import ProgressHub, progress_hub
+
+logger = logging.getLogger(__name__)
+
+
+class TestRunJobRunner:
+    """
+    Execute a queued test run.
+
+    Database sessions are opened only for short writes: loading the run,
+    saving each model's result as soon as it finishes (group-committed by
+    the result writer), and recording the final status. No session (or
+    pooled connection) is held across LLM calls.
+
+    A run left ``running`` by an interrupted worker is resumed: model
+    configs that already have a saved result are not called again.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+        hub: ProgressHub = progress_hub,
+        writer: ResultWriter = result_writer,
+    ):
+        self.session_factory = session_factory
+        self.hub = hub
+        self.writer = writer
+
+    async def run(self, test_run_id: UUID) -> None:
+        """Execute (or resume) a test run; finished runs are skipped."""
+        async with self.session_factory() as db:
+            test_run = await db.get(TestRun, test_run_id)
+            if test_run is None or test_run.status not in (
+                TestRunStatus.PENDING,
+                TestRunStatus.RUNNING,
+                TestRunStatus.PARTIAL,
+            ):
+                return
+
+            done = await db.execute(
+                select(TestResult.config_index).where(
+                    TestResult.test_run_id == test_run_id
+                )
+            )
+            saved = set(done.scalars().all())
+            configs = [
+                (index, ModelTestConfig.model_validate(config))
+                for index, config in enumerate(test_run.config["models"])
+                if index not in saved
+            ]
+            stream = test_run.config.get("stream", False)
+            result = await db.execute(
+                select(Model).where(
+                    Model.id.in_([config.model_id for _, config in configs]),
+                    Model.is_active == True,
+                )
+            )
+            models = {m.id: m for m in result.scalars().all()}
+            user_message = test_run.user_message
+            system_prompt = test_run.system_prompt
+
+            test_run.status = (
+                TestRunStatus.PARTIAL if saved else TestRunStatus.RUNNING
+            )
+            await db.commit()
+        self.hub.publish(test_run_id)
+
+        status, error = TestRunStatus.COMPLETE, None
+        try:
+            await asyncio.gather(
+                *(
+                    self._run_model(
+                        test_run_id,
+                        models[config.model_id],
+                        user_message,
+                        system_prompt,
+                        index,
+                        config,
+                        stream,
+                    )
+                    for index, config in configs
+                    if config.model_id in models
+                )
+            )
+        except Exception as e:
+            logger.exception("Test run %s failed", test_run_id)
+            status, error = TestRunStatus.FAILED, str(e)
+        # On cancellation the run stays "running" so its job can resume it
+        await self._finish(test_run_id, status, error)
+
+    async def fail(self, test_run_id: UUID, error: str) -> None:
+        """Mark a run failed once its job has given up on it."""
+        async with self.session_factory() as db:
+            test_run = await db.get(TestRun, test_run_id)
+            if test_run is None or test_run.status not in (
+                TestRunStatus.PENDING,
+                TestRunStatus.RUNNING,
+                TestRunStatus.PARTIAL,
+            ):
+                return
+            test_run.status = TestRunStatus.FAILED
+            test_run.error = error
+            await db.commit()
+        self.hub.publish(test_run_id)
+
+    async def _run_model(
+        self,
+        test_run_id: UUID,
+        model: Model,
+        user_message: str,
+        system_prompt: str | None,
+        index: int,
+        config: ModelTestConfig,
+        stream: bool,
+    ) -> None:
+        """Execute one model and save its result through the writer."""
+        try:
+            test_result = await TestRunService.execute_model(
+                test_run_id, model, user_message, system_prompt, config, stream
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            test_result = TestResult(
+                test_run_id=test_run_id,
+                model_id=model.id,
+                parameters=TestRunService._parameters(config),
+                error=f"Execution error: {str(e)}",
+            )
+        test_result.config_index = index
+
+        await self.writer.write(test_result)
+        self.hub.publish(test_run_id)
+
+    async def _finish(
+        self, test_run_id: UUID, status: TestRunStatus, error: str | None
+    ) -> None:
+        async with self.session_factory() as db:
+            test_run = await db.get(TestRun, test_run_id)
+            if test_run is not None:
+                test_run.status = status
+                test_run.error = error
+                await db.commit()
+        self.hub.publish(test_run_id)
@@ -0,0 +1,161 @@
+"""Per-endpoint circuit breakers for fast-failing unhealthy model endpoints."""
+
+import time
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one endpoint.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail immediately. Once ``recovery_timeout`` seconds have passed a
+    single probe call is let through (half-open): success closes the circuit,
+    failure re-opens it for another timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._probe_started_at: float | None = None
+        self.rejected = 0
+        self.times_opened = 0
+        self.last_error: str | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self.opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_started_at = None
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (0 if calls are allowed)."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    @property
+    def available(self) -> bool:
+        """Whether a call would be let through, without claiming the probe."""
+        state = self.state
+        if state == CircuitState.HALF_OPEN:
+            return (
+                self._probe_started_at is None
+                or time.monotonic() - self._probe_started_at
+                >= self.recovery_timeout
+            )
+        return state == CircuitState.CLOSED
+
+    def allow_request(self) -> bool:
+        """Whether a call may go through; claims the probe when half-open."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN:
+            now = time.monotonic()
+            # One probe at a time; a probe that never reported back expires
+            if (
+                self._probe_started_at is None
+                or now - self._probe_started_at >= self.recovery_timeout
+            ):
+                self._probe_started_at = now
+                return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self._state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self, error: str | None = None) -> None:
+        self.last_error = error
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or (
+            self._state == CircuitState.CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def trip(self, error: str | None = None) -> None:
+        """Open the circuit immediately (e.g. after a failed health probe)."""
+        self.last_error = error
+        self.consecutive_failures = max(
+            self.consecutive_failures + 1, self.failure_threshold
+        )
+        self._open()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+        self._probe_started_at = None
+        self.times_opened += 1
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "retry_after": round(self.retry_after(), 1),
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "last_error": self.last_error,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by endpoint."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ):
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+            self._breakers[endpoint] = breaker
+        return breaker
+
+    def record(self, endpoint: str, ok: bool, error: str | None = None) -> None:
+        """Feed a health probe result: success closes, failure ejects."""
+        if not self.enabled:
+            return
+        breaker = self.get(endpoint)
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.trip(error)
+
+    def available(self, endpoint: str) -> bool:
+        """Whether calls to the endpoint are currently let through."""
+        return not self.enabled or self.get(endpoint).available
+
+    def stats(self) -> list[dict]:
+        return [
+            {"endpoint": endpoint, **breaker.stats()}
+            for endpoint, breaker in self._breakers.items()
+        ]
@@ -0,0 +1,35 @@
+"""Compression of stored response text.
+
+Blobs record the codec that wrote them, so rows stay readable if the
+preferred codec changes. ``zstandard`` is used when installed (it is in
+requirements.txt); otherwise new blobs fall back to the standard library's
+zlib.
+"""
+
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+ZSTD = "zstd"
+ZLIB = "zlib"
+
+
+def compress(raw: bytes, level: int = 3) -> tuple[str, bytes]:
+    """Compress ``raw`` with the preferred codec; returns (codec, data)."""
+    if zstandard is not None:
+        return ZSTD, zstandard.ZstdCompressor(level=level).compress(raw)
+    return ZLIB, zlib.compress(raw, level)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    """Inverse of ``compress``."""
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd blobs")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown codec: {codec}")
@@ -0,0 +1,225 @@
+"""Adaptive per-endpoint concurrency limiting for outbound model calls."""
+
+import asyncio
+from collections import deque
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """Raised when an endpoint's wait queue is full."""
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for a single endpoint.
+
+    The limit grows by ``1 / limit`` per successful call (roughly +1 per
+    round trip) while latency stays within ``latency_tolerance`` times the
+    observed no-load baseline, and is multiplied by ``backoff`` when latency
+    exceeds it or the endpoint signals overload (timeouts, 429, 5xx).
+
+    LLM latency scales with output length, so the latency signal is
+    normalised per generated token when a token count is available.
+
+    Callers beyond the limit wait in a FIFO queue; once ``max_queue``
+    callers are waiting, further calls are rejected immediately.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        max_queue: int = 256,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.9,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.in_flight = 0
+        self.baseline: float | None = None
+        self.completed = 0
+        self.rejected = 0
+        self.decreases = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def effective_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in line if the endpoint is at its limit."""
+        if not self._waiters and self.in_flight < self.effective_limit():
+            self.in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise ConcurrencyLimitExceeded(
+                f"{self.in_flight} requests in flight and "
+                f"{len(self._waiters)} queued (limit {self.effective_limit()})"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we were cancelled
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(
+        self,
+        latency_ms: float | None = None,
+        tokens: int | None = None,
+        overloaded: bool = False,
+    ) -> None:
+        """Return a slot and adapt the limit from the call's outcome."""
+        self.in_flight -= 1
+        self.completed += 1
+
+        if overloaded:
+            self._decrease()
+        elif latency_ms is not None:
+            signal = latency_ms / tokens if tokens else latency_ms
+            if self.baseline is None or signal < self.baseline:
+                self.baseline = signal
+            else:
+                # Let the baseline drift up slowly as workloads change
+                self.baseline += (signal - self.baseline) * 0.01
+
+            if signal > self.baseline * self.latency_tolerance:
+                self._decrease()
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._wake()
+
+    def _decrease(self) -> None:
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        self.decreases += 1
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters in FIFO order."""
+        while self._waiters and self.in_flight < self.effective_limit():
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.effective_limit(),
+            "adaptive_limit": round(self.limit, 2),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "decreases": self.decreases,
+            "baseline": round(self.baseline, 3) if self.baseline else None,
+        }
+
+
+class ModelCap:
+    """Fixed cap on one model's concurrent calls to an endpoint.
+
+    Taken before the endpoint's adaptive limiter, so a capped model waits
+    only on its own calls and never holds up other models' traffic.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if not self._waiters and self.in_flight < self.limit:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        return {"cap": self.limit, "in_flight": self.in_flight, "queued": self.queued}
+
+
+class ConcurrencyController:
+    """Registry of adaptive limiters keyed by endpoint, plus per-model caps."""
+
+    def __init__(self, enabled: bool = True, **limiter_options):
+        self.enabled = enabled
+        self._limiter_options = limiter_options
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+        self._caps: dict[tuple[str, str], ModelCap] = {}
+
+    def get(self, endpoint: str) -> AdaptiveLimiter:
+        limiter = self._limiters.get(endpoint)
+        if limiter is None:
+            limiter = AdaptiveLimiter(**self._limiter_options)
+            self._limiters[endpoint] = limiter
+        return limiter
+
+    def cap(self, endpoint: str, model: str, limit: int) -> ModelCap:
+        """The cap for ``model`` on ``endpoint``, updated to ``limit``."""
+        cap = self._caps.get((endpoint, model))
+        if cap is None:
+            cap = ModelCap(limit)
+            self._caps[(endpoint, model)] = cap
+        elif cap.limit != limit:
+            cap.limit = max(1, limit)
+            cap._wake()
+        return cap
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "endpoint": endpoint,
+                **limiter.stats(),
+                "model_caps": [
+                    {"model": model, **cap.stats()}
+                    for (cap_endpoint, model), cap in self._caps.items()
+                    if cap_endpoint == endpoint
+                ],
+            }
+            for endpoint, limiter in self._limiters.items()
+        ]
@@ -1,10 +1,30 @@
 """LLM Client for vLLM and OpenAI-compatible endpoints."""
 
+import asyncio
+import hashlib
+import json
 import time
-from dataclasses import dataclass
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
 
 import httpx
 
+from app.config import get_settings
+from app.utils.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from app.utils.concurrency import (
+    AdaptiveLimiter,
+    ConcurrencyController,
+    ConcurrencyLimitExceeded,
+)
+from app.utils.load_balancer import LoadBalancer
+from app.utils.retry import RetryBudget, backoff_delay
+from app.utils.single_flight import SingleFlight, StreamBroadcast
+from app.utils.stats import LatencyWindow, summarize
+
+settings = get_settings()
+
 
 @dataclass
 class LLMResponse:
@@ -14,13 +34,318 @@ class LLMResponse:
     latency_ms: int
     token_count: int | None
     error: str | None
+    status_code: int | None = None
+    ttft_ms: int | None = None
+    tokens_per_second: float | None = None
+    inter_token_latency: dict | None = None
+    cached: bool = False
+    attempts: int = 1  # Requests sent, including retries and hedges
+    retryable: bool = False  # Connection error or 5xx
+    samples: list[str | None] | None = None  # Every choice when n > 1
+
+
+@dataclass
+class StreamDelta:
+    """Incremental content from a streamed chat completion.
+
+    The final delta of a stream has empty content and carries the complete
+    ``LLMResponse`` (including TTFT and decode throughput) in ``response``.
+    """
+
+    content: str
+    response: LLMResponse | None = None
+
+
+@dataclass
+class EndpointPoolStats:
+    """Request counters for one pooled endpoint."""
+
+    requests: int = 0
+    in_flight: int = 0
+    errors: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+def build_chat_url(endpoint_url: str) -> str:
+    """Ensure endpoint URL ends with /v1/chat/completions."""
+    url = endpoint_url.rstrip("/")
+    if not url.endswith("/v1/chat/completions"):
+        if not url.endswith("/v1"):
+            url = f"{url}/v1"
+        url = f"{url}/chat/completions"
+    return url
+
+
+def build_models_url(endpoint_url: str) -> str:
+    """The /v1/models URL for an endpoint given in any form build_chat_url accepts."""
+    url = endpoint_url.rstrip("/").removesuffix("/chat/completions")
+    url = url.removesuffix("/v1")
+    return f"{url}/v1/models"
+
+
+def build_messages(user_message: str, system_prompt: str | None) -> list[dict]:
+    """Build the OpenAI-style message list for a single-turn chat."""
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+def is_deterministic(temperature: float, seed: int | None) -> bool:
+    """Whether sampling parameters make a completion reproducible."""
+    return temperature == 0 or seed is not None
+
+
+def prefix_key(messages: list[dict], prefix_bytes: int = 1024) -> str:
+    """Hash identifying a request's prompt prefix for replica affinity.
+
+    The system prompt when there is one, otherwise the first
+    ``prefix_bytes`` bytes of the serialized messages.
+    """
+    if messages and messages[0].get("role") == "system":
+        prefix = (messages[0].get("content") or "").encode()
+    else:
+        prefix = json.dumps(messages, ensure_ascii=False).encode()[:prefix_bytes]
+    return hashlib.sha256(prefix).hexdigest()
+
+
+def is_endpoint_failure(response: LLMResponse) -> bool:
+    """Whether a failed call indicates the endpoint itself is unhealthy.
+
+    Connection errors and timeouts (no status code) and 5xx count; 4xx
+    responses are the caller's fault and say nothing about the endpoint.
+    """
+    if response.error is None:
+        return False
+    return response.status_code is None or response.status_code >= 500
+
+
+def is_overload(response: LLMResponse) -> bool:
+    """Whether a failed call indicates the endpoint is unavailable or saturated."""
+    return is_endpoint_failure(response) or response.status_code == 429
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """Whether a transport error means the request never reached the model."""
+    return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+def endpoint_origin(url: str) -> str:
+    """Get the scheme://host:port origin a connection pool is keyed on."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
 
 
 class LLMClient:
-    """Client for calling vLLM/OpenAI-compatible APIs."""
+    """Client for calling vLLM/OpenAI-compatible APIs.
+
+    Keeps one long-lived ``httpx.AsyncClient`` per endpoint origin so that
+    repeated calls reuse keep-alive connections instead of paying TCP/TLS
+    setup on every request. Pools are created lazily on first use and closed
+    by :meth:`aclose` (called from the application lifespan).
+    """
+
+    def __init__(
+        self,
+        timeout: float = 60.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        coalesce: bool = True,
+        concurrency: ConcurrencyController | None = None,
+        breakers: CircuitBreakerRegistry | None = None,
+        connect_timeout: float | None = None,
+        hedge: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+        max_attempts: int = 1,
+        retry_base_delay: float = 0.2,
+        retry_max_delay: float = 5.0,
+        retry_budget: RetryBudget | None = None,
+        balancer: LoadBalancer | None = None,
+        prefix_affinity: bool = False,
+        prefix_bytes: int = 1024,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        # A short connect timeout fails fast on dead hosts without cutting
+        # off long generations
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout or timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, EndpointPoolStats] = {}
+        # Identical deterministic requests in flight share one upstream call
+        self.coalesce = coalesce
+        self._single_flight: SingleFlight[LLMResponse] = SingleFlight()
+        self._broadcasts: dict[str, StreamBroadcast[StreamDelta]] = {}
+        self._stream_leaders = 0
+        self._stream_followers = 0
+        # Adaptive per-endpoint concurrency limits
+        self.concurrency = concurrency or ConcurrencyController(enabled=False)
+        # Per-endpoint circuit breakers
+        self.breakers = breakers or CircuitBreakerRegistry(enabled=False)
+        # Hedging: once a call outlives the endpoint's hedge_percentile
+        # latency, send a duplicate and keep whichever answers first
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies: dict[str, LatencyWindow] = {}
+        self.hedges = 0
+        self.hedge_wins = 0
+        # Retries of connection errors and 5xx; hedges and retries share
+        # one global budget
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.retry_budget = retry_budget or RetryBudget()
+        self.retries = 0
+        # Replica selection for models served from several endpoints
+        self.balancer = balancer or LoadBalancer()
+        # Route shared prompt prefixes to one replica to reuse its KV cache
+        self.prefix_affinity = prefix_affinity
+        self.prefix_bytes = prefix_bytes
+
+    def _get_client(self, url: str) -> httpx.AsyncClient:
+        """Get (or create) the pooled client for the URL's origin."""
+        origin = endpoint_origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self._transport,
+            )
+            self._clients[origin] = client
+            self._stats[origin] = EndpointPoolStats()
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client and drop its connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._stats.clear()
+        for client in clients:
+            await client.aclose()
+
+    def pool_stats(self) -> list[dict]:
+        """Snapshot of connection pool usage per endpoint origin."""
+        snapshot = []
+        for origin, client in self._clients.items():
+            stats = self._stats[origin]
+            connections = _pool_connections(client)
+            snapshot.append(
+                {
+                    "endpoint": origin,
+                    "http2": self.http2,
+                    "requests": stats.requests,
+                    "in_flight": stats.in_flight,
+                    "errors": stats.errors,
+                    "connections": len(connections),
+                    "idle_connections": sum(1 for c in connections if c.is_idle()),
+                    "http2_connections": sum(
+                        1
+                        for c in connections
+                        if (c.info() or "").startswith("HTTP/2")
+                    ),
+                    "max_connections": self.limits.max_connections,
+                    "max_keepalive_connections": (
+                        self.limits.max_keepalive_connections
+                    ),
+                    "keepalive_expiry": self.limits.keepalive_expiry,
+                    "age_seconds": round(time.time() - stats.created_at, 1),
+                }
+            )
+        return snapshot
+
+    def coalescing_stats(self) -> dict:
+        """Counters for shared (coalesced) upstream calls."""
+        return {
+            "enabled": self.coalesce,
+            "in_flight": self._single_flight.in_flight,
+            "leaders": self._single_flight.leaders,
+            "followers": self._single_flight.followers,
+            "streams_in_flight": len(self._broadcasts),
+            "stream_leaders": self._stream_leaders,
+            "stream_followers": self._stream_followers,
+        }
+
+    def balancer_stats(self) -> dict:
+        """Replica picks and outstanding requests for multi-replica models."""
+        return {
+            "strategy": self.balancer.strategy,
+            "prefix_affinity": self.prefix_affinity,
+            "items": self.balancer.stats(),
+        }
+
+    def retry_stats(self) -> dict:
+        """Counters for hedged and retried calls, with per-endpoint hedge delays."""
+        return {
+            "hedging_enabled": self.hedge,
+            "hedge_percentile": self.hedge_percentile,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "max_attempts": self.max_attempts,
+            "retries": self.retries,
+            "budget": self.retry_budget.stats(),
+            "endpoints": [
+                {
+                    "endpoint": origin,
+                    "samples": len(window),
+                    "hedge_delay_ms": self._hedge_delay(origin),
+                }
+                for origin, window in self._latencies.items()
+            ],
+        }
 
-    def __init__(self, timeout: float = 60.0):
-        self.timeout = timeout
+    def _request_key(self, url: str, headers: dict, payload: dict) -> str:
+        """Identity of a request for coalescing (includes the API key)."""
+        material = json.dumps(
+            [url, headers.get("Authorization"), payload],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def _build_request(
+        self,
+        endpoint_url: str,
+        api_key: str | None,
+        model_name: str,
+        user_message: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int,
+        top_p: float,
+        seed: int | None = None,
+        n: int = 1,
+    ) -> tuple[str, dict, dict]:
+        """Build the URL, headers and JSON payload for a chat completion."""
+        messages = build_messages(user_message, system_prompt)
+
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+
+        payload = {
+            "model": model_name,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": top_p,
+        }
+        if seed is not None:
+            payload["seed"] = seed
+        if n > 1:
+            payload["n"] = n
+        return build_chat_url(endpoint_url), headers, payload
 
     async def chat_completion(
         self,
@@ -32,6 +357,10 @@ class LLMClient:
         temperature: float = 0.7,
         max_tokens: int = 512,
         top_p: float = 1.0,
+        seed: int | None = None,
+        max_concurrency: int | None = None,
+        replica_urls: list[str] | None = None,
+        n: int = 1,
     ) -> LLMResponse:
         """
         Call the chat completion API.
@@ -45,58 +374,318 @@ class LLMClient:
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             top_p: Nucleus sampling parameter
+            seed: Optional sampling seed for reproducible outputs
+            max_concurrency: Optional cap on this model's concurrent calls to
+                each endpoint, independent of other models' traffic
+            replica_urls: Other endpoints serving the same model; each call
+                goes to the replica with the fewest outstanding requests
+            n: Completions to sample in one request (vLLM/OpenAI ``n``);
+                all of them are returned in ``samples``
 
         Returns:
             LLMResponse with content, latency, token count, or error
         """
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": user_message})
+        url, headers, payload = self._build_request(
+            endpoint_url,
+            api_key,
+            model_name,
+            user_message,
+            system_prompt,
+            temperature,
+            max_tokens,
+            top_p,
+            seed,
+            n,
+        )
+        urls = self._replica_chat_urls(url, replica_urls)
 
-        headers = {"Content-Type": "application/json"}
-        if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
+        if self.coalesce and is_deterministic(temperature, seed):
+            return await self._single_flight.do(
+                self._request_key(url, headers, payload),
+                lambda: self._resilient_completion(
+                    urls, headers, payload, max_concurrency
+                ),
+            )
+        return await self._resilient_completion(
+            urls, headers, payload, max_concurrency
+        )
 
-        payload = {
-            "model": model_name,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "top_p": top_p,
-        }
+    @staticmethod
+    def _replica_chat_urls(url: str, replica_urls: list[str] | None) -> list[str]:
+        """Chat URLs of the primary endpoint and its replicas, deduplicated."""
+        urls = [url, *(build_chat_url(replica) for replica in replica_urls or [])]
+        return list(dict.fromkeys(urls))
 
-        # Ensure endpoint URL ends with /v1/chat/completions
-        url = endpoint_url.rstrip("/")
-        if not url.endswith("/v1/chat/completions"):
-            if not url.endswith("/v1"):
-                url = f"{url}/v1"
-            url = f"{url}/chat/completions"
+    def _choose(
+        self, urls: list[str], payload: dict, exclude: tuple[str, ...] = ()
+    ) -> str:
+        """Pick a replica, skipping ones whose circuit is open (ejected).
+
+        With prefix affinity on, requests sharing a prompt prefix are routed
+        to the same replica; otherwise by outstanding requests.
+        """
+        if len(urls) == 1:
+            return urls[0]
+
+        def healthy(url: str) -> bool:
+            return self.breakers.available(endpoint_origin(url))
+
+        if self.prefix_affinity:
+            key = prefix_key(payload["messages"], self.prefix_bytes)
+            return self.balancer.choose_affine(
+                urls, key, healthy=healthy, exclude=exclude
+            )
+        return self.balancer.choose(urls, healthy=healthy, exclude=exclude)
+
+    async def _resilient_completion(
+        self,
+        urls: list[str],
+        headers: dict,
+        payload: dict,
+        max_concurrency: int | None,
+    ) -> LLMResponse:
+        """Send a completion, hedging stragglers and retrying transient failures.
+
+        Connection errors and 5xx are retried up to ``max_attempts`` times
+        with jittered exponential backoff, as long as the retry budget allows.
+        Retries prefer replicas that haven't failed yet.
+        """
+        self.retry_budget.deposit()
+        attempts = 0
+        tries = 0
+        failed: tuple[str, ...] = ()
+        while True:
+            tries += 1
+            url = self._choose(urls, payload, exclude=failed)
+            response, sent = await self._hedged_completion(
+                url, urls, headers, payload, max_concurrency
+            )
+            attempts += sent
+            failed += (url,)
+            if (
+                not response.retryable
+                or tries >= self.max_attempts
+                or not self.retry_budget.withdraw()
+            ):
+                break
+            self.retries += 1
+            await asyncio.sleep(
+                backoff_delay(tries, self.retry_base_delay, self.retry_max_delay)
+            )
+        response.attempts = attempts
+        return response
+
+    def _hedge_delay(self, origin: str) -> float | None:
+        """Milliseconds to wait before hedging, once enough samples exist."""
+        window = self._latencies.get(origin)
+        if window is None or len(window) < self.hedge_min_samples:
+            return None
+        return round(window.percentile(self.hedge_percentile), 1)
+
+    async def _hedged_completion(
+        self,
+        url: str,
+        urls: list[str],
+        headers: dict,
+        payload: dict,
+        max_concurrency: int | None,
+    ) -> tuple[LLMResponse, int]:
+        """Send a completion, duplicating it if it outlives the hedge delay.
+
+        The duplicate goes to another replica when the model has one.
+
+        Returns:
+            The first successful response (or the last failure) and the
+            number of requests sent
+        """
+        delay = self._hedge_delay(endpoint_origin(url)) if self.hedge else None
+        if delay is None:
+            response = await self._guarded_completion(
+                url, headers, payload, max_concurrency
+            )
+            return response, response.attempts
+
+        primary = asyncio.ensure_future(
+            self._guarded_completion(url, headers, payload, max_concurrency)
+        )
+        pending = {primary}
+        sent = 1
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay / 1000)
+            if not done and self.retry_budget.withdraw():
+                self.hedges += 1
+                sent += 1
+                pending.add(
+                    asyncio.ensure_future(
+                        self._guarded_completion(
+                            self._choose(urls, payload, exclude=(url,)),
+                            headers,
+                            payload,
+                            max_concurrency,
+                        )
+                    )
+                )
+
+            response = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    response = task.result()
+                    if response.error is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return response, sent
+            return response, sent
+        finally:
+            # Cancel the loser
+            for task in pending:
+                task.cancel()
+
+    def _admit(self, origin: str) -> tuple[CircuitBreaker | None, str | None]:
+        """Check the endpoint's circuit breaker before a call.
+
+        Returns:
+            The breaker to report the outcome to, and an error message if
+            the call must fail fast because the circuit is open
+        """
+        if not self.breakers.enabled:
+            return None, None
+        breaker = self.breakers.get(origin)
+        if breaker.allow_request():
+            return breaker, None
+        return breaker, (
+            f"Circuit open: {origin} failed {breaker.consecutive_failures} "
+            f"consecutive calls (last error: {breaker.last_error}); "
+            f"retrying in {breaker.retry_after():.0f}s"
+        )
+
+    @asynccontextmanager
+    async def _model_slot(
+        self, origin: str, model: str, max_concurrency: int | None
+    ) -> AsyncIterator[None]:
+        """Hold one of the model's capped slots, if it has a cap."""
+        if max_concurrency is None or not self.concurrency.enabled:
+            yield
+            return
+        cap = self.concurrency.cap(origin, model, max_concurrency)
+        await cap.acquire()
+        try:
+            yield
+        finally:
+            cap.release()
+
+    async def _acquire_slot(
+        self, origin: str
+    ) -> tuple[AdaptiveLimiter | None, str | None]:
+        """Take a concurrency slot; returns an error message on rejection."""
+        if not self.concurrency.enabled:
+            return None, None
+        limiter = self.concurrency.get(origin)
+        try:
+            await limiter.acquire()
+        except ConcurrencyLimitExceeded as e:
+            return None, f"Concurrency limit exceeded: {str(e)}"
+        return limiter, None
+
+    @staticmethod
+    def _record_outcome(
+        breaker: CircuitBreaker | None,
+        limiter: AdaptiveLimiter | None,
+        response: LLMResponse | None,
+        latency_ms: float | None = None,
+        tokens: int | None = None,
+    ) -> None:
+        """Feed a call's outcome to the breaker and limiter."""
+        if limiter is not None:
+            if response is None:
+                limiter.release()
+            else:
+                limiter.release(
+                    latency_ms=latency_ms,
+                    tokens=tokens,
+                    overloaded=is_overload(response),
+                )
+        if breaker is not None and response is not None:
+            if is_endpoint_failure(response):
+                breaker.record_failure(response.error)
+            else:
+                breaker.record_success()
+
+    async def _guarded_completion(
+        self, url: str, headers: dict, payload: dict, max_concurrency: int | None
+    ) -> LLMResponse:
+        """Send a completion through the endpoint's breaker and limiter.
+
+        The call counts as outstanding on ``url`` for load balancing from
+        the moment it starts waiting for a concurrency slot.
+        """
+        with self.balancer.track(url):
+            origin = endpoint_origin(url)
+            breaker, error = self._admit(origin)
+            if error is not None:
+                return _rejected(error)
+
+            async with self._model_slot(origin, payload["model"], max_concurrency):
+                limiter, error = await self._acquire_slot(origin)
+                if error is not None:
+                    return _rejected(error)
+
+                response = None
+                try:
+                    response = await self._send_completion(url, headers, payload)
+                    if response.error is None:
+                        self._latencies.setdefault(origin, LatencyWindow()).add(
+                            response.latency_ms
+                        )
+                    return response
+                finally:
+                    self._record_outcome(
+                        breaker,
+                        limiter,
+                        response,
+                        latency_ms=response.latency_ms if response else None,
+                        tokens=response.token_count if response else None,
+                    )
+
+    async def _send_completion(
+        self, url: str, headers: dict, payload: dict
+    ) -> LLMResponse:
+        """Send one non-streaming chat completion request."""
+        client = self._get_client(url)
+        stats = self._stats[endpoint_origin(url)]
+        stats.requests += 1
+        stats.in_flight += 1
 
         start_time = time.perf_counter()
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, json=payload, headers=headers)
+            response = await client.post(url, json=payload, headers=headers)
 
             latency_ms = int((time.perf_counter() - start_time) * 1000)
 
             if response.status_code != 200:
+                stats.errors += 1
                 return LLMResponse(
                     content=None,
                     latency_ms=latency_ms,
                     token_count=None,
                     error=f"HTTP {response.status_code}: {response.text}",
+                    status_code=response.status_code,
+                    retryable=response.status_code >= 500,
                 )
 
             data = response.json()
 
             # Extract content from OpenAI-compatible response
-            content = None
-            if "choices" in data and len(data["choices"]) > 0:
-                choice = data["choices"][0]
-                if "message" in choice and "content" in choice["message"]:
-                    content = choice["message"]["content"]
+            choices = [
+                (choice.get("message") or {}).get("content")
+                for choice in sorted(
+                    data.get("choices") or [], key=lambda c: c.get("index", 0)
+                )
+            ]
+            content = choices[0] if choices else None
 
             # Extract token count from usage
             token_count = None
@@ -108,25 +697,32 @@ class LLMClient:
                 latency_ms=latency_ms,
                 token_count=token_count,
                 error=None,
+                status_code=response.status_code,
+                samples=choices if len(choices) > 1 else None,
             )
 
-        except httpx.TimeoutException:
+        except httpx.TimeoutException as e:
+            stats.errors += 1
             latency_ms = int((time.perf_counter() - start_time) * 1000)
             return LLMResponse(
                 content=None,
                 latency_ms=latency_ms,
                 token_count=None,
                 error="Request timeout",
+                retryable=is_retryable_error(e),
             )
         except httpx.RequestError as e:
+            stats.errors += 1
             latency_ms = int((time.perf_counter() - start_time) * 1000)
             return LLMResponse(
                 content=None,
                 latency_ms=latency_ms,
                 token_count=None,
                 error=f"Request error: {str(e)}",
+                retryable=is_retryable_error(e),
             )
         except Exception as e:
+            stats.errors += 1
             latency_ms = int((time.perf_counter() - start_time) * 1000)
             return LLMResponse(
                 content=None,
@@ -134,7 +730,311 @@ class LLMClient:
                 token_count=None,
                 error=f"Unexpected error: {str(e)}",
             )
+        finally:
+            stats.in_flight -= 1
+
+    async def stream_chat_completion(
+        self,
+        endpoint_url: str,
+        api_key: str | None,
+        model_name: str,
+        user_message: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 512,
+        top_p: float = 1.0,
+        seed: int | None = None,
+        max_concurrency: int | None = None,
+        replica_urls: list[str] | None = None,
+    ) -> AsyncIterator[StreamDelta]:
+        """
+        Stream a chat completion as Server-Sent Events (``stream: true``).
+
+        Yields a ``StreamDelta`` per content chunk as it arrives, followed by
+        a final delta whose ``response`` holds the full content, total
+        latency, time to first token, inter-token gap distribution and
+        decode throughput (tokens/sec after the first token).
+
+        Identical deterministic streams in flight share one upstream
+        request: a caller joining late replays the deltas generated so far
+        and then follows the live stream.
+        """
+        url, headers, payload = self._build_request(
+            endpoint_url,
+            api_key,
+            model_name,
+            user_message,
+            system_prompt,
+            temperature,
+            max_tokens,
+            top_p,
+            seed,
+        )
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+        urls = self._replica_chat_urls(url, replica_urls)
+
+        if not (self.coalesce and is_deterministic(temperature, seed)):
+            async for delta in self._resilient_stream(
+                urls, headers, payload, max_concurrency
+            ):
+                yield delta
+            return
+
+        key = self._request_key(url, headers, payload)
+        broadcast = self._broadcasts.get(key)
+        if broadcast is None or broadcast.done:
+            broadcast = StreamBroadcast(
+                self._resilient_stream(urls, headers, payload, max_concurrency)
+            )
+            self._broadcasts[key] = broadcast
+
+            def forget(_task, broadcast=broadcast):
+                if self._broadcasts.get(key) is broadcast:
+                    del self._broadcasts[key]
+
+            broadcast.add_done_callback(forget)
+            self._stream_leaders += 1
+        else:
+            self._stream_followers += 1
+
+        async for delta in broadcast.subscribe():
+            yield delta
+
+    async def _resilient_stream(
+        self,
+        urls: list[str],
+        headers: dict,
+        payload: dict,
+        max_concurrency: int | None,
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream a completion, retrying failures that happen before any content.
+
+        Once content has been yielded a failed stream can't be replayed, so
+        only connection errors and 5xx before the first token are retried.
+        Streams are not hedged.
+        """
+        self.retry_budget.deposit()
+        attempts = 0
+        tries = 0
+        failed: tuple[str, ...] = ()
+        while True:
+            tries += 1
+            url = self._choose(urls, payload, exclude=failed)
+            failed += (url,)
+            response = None
+            streamed = False
+            async for delta in self._guarded_stream(
+                url, headers, payload, max_concurrency
+            ):
+                if delta.response is not None:
+                    response = delta.response
+                else:
+                    streamed = True
+                    yield delta
+            attempts += response.attempts
+            if (
+                streamed
+                or not response.retryable
+                or tries >= self.max_attempts
+                or not self.retry_budget.withdraw()
+            ):
+                break
+            self.retries += 1
+            await asyncio.sleep(
+                backoff_delay(tries, self.retry_base_delay, self.retry_max_delay)
+            )
+        response.attempts = attempts
+        yield StreamDelta(content="", response=response)
+
+    async def _guarded_stream(
+        self, url: str, headers: dict, payload: dict, max_concurrency: int | None
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream a completion through the endpoint's breaker and limiter.
+
+        The limiter slot is held for the whole stream. Time to first token is
+        its latency signal, since total stream time mostly reflects how many
+        tokens were requested.
+        """
+        with self.balancer.track(url):
+            origin = endpoint_origin(url)
+            breaker, error = self._admit(origin)
+            if error is not None:
+                yield StreamDelta(content="", response=_rejected(error))
+                return
+
+            async with self._model_slot(origin, payload["model"], max_concurrency):
+                limiter, error = await self._acquire_slot(origin)
+                if error is not None:
+                    yield StreamDelta(content="", response=_rejected(error))
+                    return
+
+                response = None
+                try:
+                    async for delta in self._stream_completion(
+                        url, headers, payload
+                    ):
+                        if delta.response is not None:
+                            response = delta.response
+                        yield delta
+                finally:
+                    self._record_outcome(
+                        breaker,
+                        limiter,
+                        response,
+                        latency_ms=response.ttft_ms if response else None,
+                    )
+
+    async def _stream_completion(
+        self, url: str, headers: dict, payload: dict
+    ) -> AsyncIterator[StreamDelta]:
+        """Send one streaming request and yield its deltas."""
+        client = self._get_client(url)
+        stats = self._stats[endpoint_origin(url)]
+        stats.requests += 1
+        stats.in_flight += 1
+
+        parts: list[str] = []
+        gaps_ms: list[float] = []
+        chunk_count = 0
+        completion_tokens = None
+        total_tokens = None
+        first_token_at = None
+        last_token_at = None
+        error = None
+        status_code = None
+        retryable = False
+
+        start_time = time.perf_counter()
+
+        try:
+            async with client.stream(
+                "POST", url, json=payload, headers=headers
+            ) as response:
+                status_code = response.status_code
+                if response.status_code != 200:
+                    body = await response.aread()
+                    error = (
+                        f"HTTP {response.status_code}: "
+                        f"{body.decode(errors='replace')}"
+                    )
+                    retryable = response.status_code >= 500
+                else:
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:") :].strip()
+                        if data == "[DONE]":
+                            break
+
+                        chunk = json.loads(data)
+                        usage = chunk.get("usage")
+                        if usage:
+                            completion_tokens = usage.get("completion_tokens")
+                            total_tokens = usage.get("total_tokens")
+
+                        for choice in chunk.get("choices") or []:
+                            delta = (choice.get("delta") or {}).get("content")
+                            if not delta:
+                                continue
+                            now = time.perf_counter()
+                            if first_token_at is None:
+                                first_token_at = now
+                            else:
+                                gaps_ms.append((now - last_token_at) * 1000)
+                            last_token_at = now
+                            chunk_count += 1
+                            parts.append(delta)
+                            yield StreamDelta(content=delta)
+        except httpx.TimeoutException as e:
+            error = "Request timeout"
+            retryable = is_retryable_error(e)
+        except httpx.RequestError as e:
+            error = f"Request error: {str(e)}"
+            retryable = is_retryable_error(e)
+        except Exception as e:
+            error = f"Unexpected error: {str(e)}"
+        finally:
+            stats.in_flight -= 1
+
+        latency_ms = int((time.perf_counter() - start_time) * 1000)
+        if error:
+            stats.errors += 1
+
+        ttft_ms = None
+        tokens_per_second = None
+        if first_token_at is not None:
+            ttft_ms = int((first_token_at - start_time) * 1000)
+            decoded = (completion_tokens or chunk_count) - 1
+            decode_seconds = last_token_at - first_token_at
+            if decoded > 0 and decode_seconds > 0:
+                tokens_per_second = round(decoded / decode_seconds, 2)
+
+        yield StreamDelta(
+            content="",
+            response=LLMResponse(
+                content="".join(parts) if parts else None,
+                latency_ms=latency_ms,
+                token_count=total_tokens,
+                error=error,
+                status_code=status_code,
+                ttft_ms=ttft_ms,
+                tokens_per_second=tokens_per_second,
+                inter_token_latency=summarize(gaps_ms),
+                retryable=retryable,
+            ),
+        )
+
+
+def _rejected(error: str) -> LLMResponse:
+    """Response for a call failed locally without reaching the endpoint."""
+    return LLMResponse(
+        content=None, latency_ms=0, token_count=None, error=error, attempts=0
+    )
+
+
+def _pool_connections(client: httpx.AsyncClient) -> list:
+    """Best-effort access to the httpcore connections behind a client."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    return list(getattr(pool, "connections", []) or [])
 
 
 # Singleton instance
-llm_client = LLMClient()
+llm_client = LLMClient(
+    timeout=settings.llm_timeout,
+    connect_timeout=settings.llm_connect_timeout,
+    max_connections=settings.llm_pool_max_connections,
+    max_keepalive_connections=settings.llm_pool_max_keepalive,
+    keepalive_expiry=settings.llm_pool_keepalive_expiry,
+    http2=settings.llm_http2,
+    coalesce=settings.llm_coalesce_requests,
+    concurrency=ConcurrencyController(
+        enabled=settings.llm_concurrency_enabled,
+        initial_limit=settings.llm_concurrency_initial,
+        min_limit=settings.llm_concurrency_min,
+        max_limit=settings.llm_concurrency_max,
+        max_queue=settings.llm_concurrency_max_queue,
+        latency_tolerance=settings.llm_concurrency_latency_tolerance,
+    ),
+    breakers=CircuitBreakerRegistry(
+        enabled=settings.llm_breaker_enabled,
+        failure_threshold=settings.llm_breaker_failure_threshold,
+        recovery_timeout=settings.llm_breaker_recovery_seconds,
+    ),
+    hedge=settings.llm_hedge_enabled,
+    hedge_percentile=settings.llm_hedge_percentile,
+    hedge_min_samples=settings.llm_hedge_min_samples,
+    max_attempts=settings.llm_retry_max_attempts,
+    retry_base_delay=settings.llm_retry_base_delay,
+    retry_max_delay=settings.llm_retry_max_delay,
+    retry_budget=RetryBudget(
+        ratio=settings.llm_retry_budget_ratio,
+        min_per_second=settings.llm_retry_budget_min_per_second,
+    ),
+    balancer=LoadBalancer(
+        strategy=settings.llm_load_balancing,
+        load_factor=settings.llm_prefix_affinity_load_factor,
+    ),
+    prefix_affinity=settings.llm_prefix_affinity,
+    prefix_bytes=settings.llm_prefix_affinity_bytes,
+)
@@ -0,0 +1,164 @@
+"""Replica selection for models served from several endpoints."""
+
+import bisect
+import hashlib
+import math
+import random
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+LEAST_OUTSTANDING = "least_outstanding"
+POWER_OF_TWO = "power_of_two"
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.sha1(value.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes.
+
+    Adding or removing a replica only remaps the keys that hashed to it, so
+    the other replicas keep their warm prefix caches.
+    """
+
+    def __init__(self, nodes: list[str], vnodes: int = 100):
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+        self._distinct = len(set(nodes))
+
+    def walk(self, key: str) -> Iterator[str]:
+        """Distinct nodes in ring order, starting at the key's position."""
+        start = bisect.bisect(self._hashes, _hash(key))
+        seen = set()
+        for i in range(len(self._nodes)):
+            node = self._nodes[(start + i) % len(self._nodes)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == self._distinct:
+                    return
+
+
+class LoadBalancer:
+    """Pick a replica by outstanding requests or prompt-prefix affinity.
+
+    ``least_outstanding`` compares every replica; ``power_of_two`` compares
+    two picked at random, which avoids herding when many callers choose at
+    once from slightly stale counts. Outstanding counts include calls still
+    waiting for a concurrency slot. Ties are broken randomly.
+    """
+
+    def __init__(
+        self, strategy: str = LEAST_OUTSTANDING, load_factor: float = 1.25
+    ):
+        if strategy not in (LEAST_OUTSTANDING, POWER_OF_TWO):
+            raise ValueError(f"Unknown load balancing strategy: {strategy}")
+        self.strategy = strategy
+        self.load_factor = load_factor
+        self._outstanding: dict[str, int] = defaultdict(int)
+        self._picks: dict[str, int] = defaultdict(int)
+        self._rings: dict[tuple[str, ...], HashRing] = {}
+        self._affinity_requests: dict[str, int] = defaultdict(int)
+        self._affinity_hits: dict[str, int] = defaultdict(int)
+
+    def outstanding(self, url: str) -> int:
+        return self._outstanding[url]
+
+    def choose(
+        self,
+        urls: list[str],
+        healthy: Callable[[str], bool] | None = None,
+        exclude: tuple[str, ...] = (),
+    ) -> str:
+        """Pick a replica, preferring healthy ones not in ``exclude``.
+
+        Falls back to excluded or unhealthy replicas rather than failing
+        when nothing else is left.
+        """
+        candidates = [url for url in urls if url not in exclude] or list(urls)
+        if healthy is not None:
+            candidates = [url for url in candidates if healthy(url)] or candidates
+
+        if len(candidates) > 2 and self.strategy == POWER_OF_TWO:
+            candidates = random.sample(candidates, 2)
+        url = min(
+            candidates,
+            key=lambda url: (self._outstanding[url], random.random()),
+        )
+        self._picks[url] += 1
+        return url
+
+    def choose_affine(
+        self,
+        urls: list[str],
+        key: str,
+        healthy: Callable[[str], bool] | None = None,
+        exclude: tuple[str, ...] = (),
+    ) -> str:
+        """Pick the replica ``key`` hashes to, within a load bound.
+
+        Requests sharing a prompt prefix land on the same replica so its
+        prefix cache is reused. A replica only takes the request while its
+        outstanding count is under ``load_factor`` times the average
+        (consistent hashing with bounded loads); otherwise the next replica
+        along the ring does. A pick counts as an affinity hit when it is
+        the key's home replica.
+        """
+        candidates = [url for url in urls if url not in exclude] or list(urls)
+        if healthy is not None:
+            candidates = [url for url in candidates if healthy(url)] or candidates
+
+        ring = self._rings.get(tuple(urls))
+        if ring is None:
+            ring = self._rings[tuple(urls)] = HashRing(urls)
+        total = sum(self._outstanding[url] for url in urls)
+        bound = math.ceil(self.load_factor * (total + 1) / len(urls))
+
+        home = None
+        choice = None
+        for url in ring.walk(key):
+            home = home or url
+            if url in candidates and self._outstanding[url] < bound:
+                choice = url
+                break
+        if choice is None:
+            choice = self.choose(candidates)
+        else:
+            self._picks[choice] += 1
+
+        self._affinity_requests[choice] += 1
+        if choice == home:
+            self._affinity_hits[choice] += 1
+        return choice
+
+    @contextmanager
+    def track(self, url: str) -> Iterator[None]:
+        """Count a call as outstanding on ``url`` while the block runs."""
+        self._outstanding[url] += 1
+        try:
+            yield
+        finally:
+            self._outstanding[url] -= 1
+
+    def stats(self) -> list[dict]:
+        snapshot = []
+        for url, picks in self._picks.items():
+            requests = self._affinity_requests[url]
+            hits = self._affinity_hits[url]
+            hit_rate = round(hits / requests, 4) if requests else None
+            snapshot.append(
+                {
+                    "endpoint": url,
+                    "outstanding": self._outstanding[url],
+                    "picks": picks,
+                    "affinity_requests": requests,
+                    "affinity_hits": hits,
+                    "affinity_hit_rate": hit_rate,
+                }
+            )
+        return snapshot
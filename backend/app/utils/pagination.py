@@ -0,0 +1,125 @@
+"""Keyset (cursor) pagination helpers.
+
+Lists are ordered newest first by a timestamp column, with the id as a
+tie-breaker. A cursor encodes the (timestamp, id) of the last item of a
+page; the next page continues strictly after it, so each page is an index
+range scan instead of an ``OFFSET`` that reads and discards every earlier
+row. Cursors are opaque to clients.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a list and the cursor of the next one."""
+
+    items: list[T]
+    next_cursor: str | None
+    total: int | None = None  # Only when requested
+    total_exact: bool = True  # False once the count passed its cap
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """Opaque cursor pointing just past the given row."""
+    raw = json.dumps([sort_value.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_page(
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+    skip: int = 0,
+) -> Select:
+    """
+    Order ``query`` newest first and select one page of it.
+
+    With a cursor the page starts after the cursor's row; without one it
+    falls back to ``skip`` (the first page, by default).
+    """
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(sort_column, id_column)
+            < tuple_(
+                literal(sort_value, sort_column.type),
+                literal(row_id, id_column.type),
+            )
+        )
+    elif skip:
+        query = query.offset(skip)
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit)
+
+
+def next_cursor(items: list, sort_attr: str, limit: int) -> str | None:
+    """Cursor for the page after ``items``; None once a page comes back short."""
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
+
+
+async def count_up_to(db: AsyncSession, query: Select, cap: int) -> tuple[int, bool]:
+    """
+    Count the rows of ``query``, stopping after ``cap``.
+
+    Returns the count and whether it is exact; past the cap the count is
+    ``cap``, a lower bound, so counting a huge set costs no more than
+    reading ``cap`` index entries.
+    """
+    capped = query.order_by(None).limit(cap + 1).subquery()
+    count = (await db.execute(select(func.count()).select_from(capped))).scalar()
+    if count > cap:
+        return cap, False
+    return count, True
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+    skip: int = 0,
+    include_total: bool = False,
+    count_cap: int = 10000,
+) -> Page:
+    """Run one page of an entity ``query``, plus a capped count if asked."""
+    total, total_exact = None, True
+    if include_total:
+        total, total_exact = await count_up_to(db, query, count_cap)
+    result = await db.execute(
+        keyset_page(query, sort_column, id_column, limit, cursor, skip)
+    )
+    items = list(result.scalars().all())
+    return Page(
+        items=items,
+        next_cursor=next_cursor(items, sort_column.key, limit),
+        total=total,
+        total_exact=total_exact,
+    )
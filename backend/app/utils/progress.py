@@ -0,0 +1,43 @@
+"""In-process progress notifications for long-running work."""
+
+import asyncio
+from collections.abc import Hashable
+
+
+class ProgressHub:
+    """Wake up subscribers when something they watch makes progress.
+
+    Notifications carry no data: subscribers re-read the current state from
+    the database, so they also work (by timing out and polling) when the
+    work runs in another process.
+    """
+
+    def __init__(self):
+        self._events: dict[Hashable, asyncio.Event] = {}
+        self._waiting: dict[Hashable, int] = {}
+
+    def publish(self, key: Hashable) -> None:
+        """Wake every subscriber waiting on ``key``."""
+        event = self._events.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def wait(self, key: Hashable, timeout: float) -> bool:
+        """Wait for the next notification; False if ``timeout`` passed first."""
+        event = self._events.setdefault(key, asyncio.Event())
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiting[key] -= 1
+            if not self._waiting[key]:
+                del self._waiting[key]
+                if self._events.get(key) is event:
+                    del self._events[key]
+
+
+# Singleton instance
+progress_hub = ProgressHub()
@@ -0,0 +1,259 @@
+"""Content-addressed cache for deterministic LLM completions."""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import async_session_maker
+from app.models.response_cache import CachedResponse
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedCompletion:
+    """A cached completion and the latency of the call that produced it."""
+
+    content: str
+    token_count: int | None
+    latency_ms: int | None
+    expires_at: float  # time.time() deadline
+
+
+def make_cache_key(
+    endpoint_url: str,
+    model_name: str,
+    messages: list[dict],
+    params: dict,
+) -> str:
+    """Hash everything that determines a completion into a stable key."""
+    material = json.dumps(
+        {
+            "endpoint_url": endpoint_url.rstrip("/"),
+            "model_name": model_name,
+            "messages": messages,
+            "params": params,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier completion cache.
+
+    The in-process tier is an LRU bounded by ``max_entries`` with a TTL on
+    every entry. When ``persistent`` is enabled, entries are also written to
+    the ``llm_response_cache`` table so they survive restarts and are shared
+    between backend processes. Persistent-tier failures are logged and treated
+    as misses; the cache never fails a model call.
+
+    Expired entries are swept from both tiers at most once per
+    ``purge_interval_seconds``, piggybacking on writes, so the table does not
+    keep rows for keys that are never requested again.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        persistent: bool = False,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        purge_interval_seconds: float = 300.0,
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent and session_factory is not None
+        self._session_factory = session_factory
+        self._entries: OrderedDict[str, CachedCompletion] = OrderedDict()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.purge_interval_seconds = purge_interval_seconds
+        self.purged = 0
+        self._last_purge = time.time()
+
+    async def get(self, key: str) -> CachedCompletion | None:
+        """Look a key up in memory, then in the persistent tier."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+            del self._entries[key]
+
+        if self.persistent:
+            entry = await self._get_persistent(key)
+            if entry is not None:
+                self._remember(key, entry)
+                self.persistent_hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        key: str,
+        endpoint_url: str,
+        model_name: str,
+        content: str,
+        token_count: int | None,
+        latency_ms: int | None,
+    ) -> None:
+        """Store a completion in both tiers."""
+        entry = CachedCompletion(
+            content=content,
+            token_count=token_count,
+            latency_ms=latency_ms,
+            expires_at=time.time() + self.ttl_seconds,
+        )
+        self._remember(key, entry)
+
+        if self.persistent:
+            await self._set_persistent(key, endpoint_url, model_name, entry)
+        if time.time() - self._last_purge >= self.purge_interval_seconds:
+            await self.purge_expired()
+
+    async def purge_expired(self) -> int:
+        """Delete expired entries from both tiers; returns how many."""
+        self._last_purge = time.time()
+        expired = [k for k, e in self._entries.items() if e.expires_at <= time.time()]
+        for key in expired:
+            del self._entries[key]
+        removed = len(expired)
+
+        if self.persistent:
+            try:
+                async with self._session_factory() as session:
+                    result = await session.execute(
+                        delete(CachedResponse).where(
+                            CachedResponse.expires_at <= datetime.now(timezone.utc)
+                        )
+                    )
+                    await session.commit()
+                removed += result.rowcount or 0
+            except Exception:
+                logger.exception("Failed to purge expired response cache entries")
+
+        self.purged += removed
+        return removed
+
+    async def clear(self) -> None:
+        """Drop every cached entry from both tiers."""
+        self._entries.clear()
+        # Nothing left to expire until new entries are written
+        self._last_purge = time.time()
+        if self.persistent:
+            try:
+                async with self._session_factory() as session:
+                    await session.execute(delete(CachedResponse))
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to clear persistent response cache")
+
+    def stats(self) -> dict:
+        """Hit/miss counters and occupancy."""
+        hits = self.memory_hits + self.persistent_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self.persistent,
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "purged": self.purged,
+            "purge_interval_seconds": self.purge_interval_seconds,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, entry: CachedCompletion) -> None:
+        """Insert into the LRU tier, evicting the least recently used."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _get_persistent(self, key: str) -> CachedCompletion | None:
+        try:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(CachedResponse).where(
+                        CachedResponse.key == key,
+                        CachedResponse.expires_at > datetime.now(timezone.utc),
+                    )
+                )
+                row = result.scalar_one_or_none()
+        except Exception:
+            logger.exception("Persistent response cache lookup failed")
+            return None
+
+        if row is None:
+            return None
+        return CachedCompletion(
+            content=row.content,
+            token_count=row.token_count,
+            latency_ms=row.latency_ms,
+            expires_at=row.expires_at.timestamp(),
+        )
+
+    async def _set_persistent(
+        self,
+        key: str,
+        endpoint_url: str,
+        model_name: str,
+        entry: CachedCompletion,
+    ) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        values = {
+            "key": key,
+            "endpoint_url": endpoint_url,
+            "model_name": model_name,
+            "content": entry.content,
+            "token_count": entry.token_count,
+            "latency_ms": entry.latency_ms,
+            "expires_at": expires_at,
+        }
+        statement = insert(CachedResponse).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[CachedResponse.key],
+            set_={k: v for k, v in values.items() if k != "key"},
+        )
+        try:
+            async with self._session_factory() as session:
+                await session.execute(statement)
+                await session.commit()
+        except Exception:
+            logger.exception("Persistent response cache write failed")
+
+
+# Singleton instance
+response_cache = ResponseCache(
+    enabled=settings.llm_cache_enabled,
+    max_entries=settings.llm_cache_max_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    persistent=settings.llm_cache_persistent,
+    session_factory=async_session_maker,
+    purge_interval_seconds=settings.llm_cache_purge_interval_seconds,
+)
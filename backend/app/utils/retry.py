@@ -0,0 +1,66 @@
+"""Retry budget and backoff for outbound model calls."""
+
+import random
+import time
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff in seconds for the given retry (1-based)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+class RetryBudget:
+    """Token bucket bounding retries (and hedges) to a share of traffic.
+
+    Every original request deposits ``ratio`` tokens and every extra attempt
+    withdraws one, so during an outage retries add at most ``ratio`` extra
+    load instead of multiplying it. A trickle of ``min_per_second`` tokens
+    keeps retries available when traffic is low.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 1.0,
+        max_balance: float = 10.0,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._updated_at = time.monotonic()
+        self.withdrawn = 0
+        self.denied = 0
+
+    @property
+    def balance(self) -> float:
+        now = time.monotonic()
+        self._balance = min(
+            self.max_balance,
+            self._balance + (now - self._updated_at) * self.min_per_second,
+        )
+        self._updated_at = now
+        return self._balance
+
+    def deposit(self) -> None:
+        """Credit the budget for one original request."""
+        self._balance = min(self.max_balance, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one token for an extra attempt; False if the budget is spent."""
+        if self.balance < 1:
+            self.denied += 1
+            return False
+        self._balance -= 1
+        self.withdrawn += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "ratio": self.ratio,
+            "min_per_second": self.min_per_second,
+            "balance": round(self.balance, 2),
+            "max_balance": self.max_balance,
+            "withdrawn": self.withdrawn,
+            "denied": self.denied,
+        }
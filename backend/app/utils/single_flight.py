@@ -0,0 +1,114 @@
+"""Coalescing of identical concurrent calls (single-flight)."""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight call among concurrent callers with the same key.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs await the same task. If every waiter is cancelled the
+    shared call is cancelled too, so abandoned requests don't keep running.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run ``factory()`` once for all concurrent callers of ``key``."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._calls.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0 and not task.done():
+                    # Every caller gave up: stop the upstream call
+                    task.cancel()
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+
+
+class StreamBroadcast(Generic[T]):
+    """Fan a single async iterator out to any number of subscribers.
+
+    Every item is buffered for the lifetime of the stream, so a subscriber
+    that joins late first replays what it missed and then follows live.
+    The source is cancelled when the last subscriber leaves early.
+    """
+
+    def __init__(self, source: AsyncIterator[T]):
+        self._items: list[T] = []
+        self._done = False
+        self._error: BaseException | None = None
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._task = asyncio.ensure_future(self._pump(source))
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def add_done_callback(self, callback: Callable[[asyncio.Task], None]) -> None:
+        self._task.add_done_callback(callback)
+
+    async def _pump(self, source: AsyncIterator[T]) -> None:
+        try:
+            async for item in source:
+                self._items.append(item)
+                self._notify()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def subscribe(self) -> AsyncIterator[T]:
+        """Replay buffered items, then yield new ones until the source ends."""
+        self._subscribers += 1
+        index = 0
+        try:
+            while True:
+                if index < len(self._items):
+                    yield self._items[index]
+                    index += 1
+                    continue
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                await self._changed.wait()
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._done:
+                self._task.cancel()
@@ -0,0 +1,77 @@
+"""Background job worker.
+
+The API process runs a worker by default (``JOB_WORKER_ENABLED``). More
+workers can run as separate processes or containers with::
+
+    python -m app.worker
+
+All of them claim work from the same ``jobs`` table.
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.config import get_settings
+from app.db.session import async_session_maker
+from app.models.job import JobKind
+from app.services.batch_jobs import BatchRunner
+from app.services.benchmark_jobs import BenchmarkRunner, benchmark_client
+from app.services.jobs import JobQueue, JobWorker
+from app.services.replica_probes import replica_prober
+from app.services.response_store import ResponseOffloader
+from app.services.result_writer import result_writer
+from app.services.test_run_jobs import TestRunJobRunner
+from app.utils.llm_client import llm_client
+
+settings = get_settings()
+
+job_queue = JobQueue(async_session_maker)
+test_run_runner = TestRunJobRunner()
+batch_runner = BatchRunner()
+benchmark_runner = BenchmarkRunner()
+response_offloader = ResponseOffloader()
+
+# Singleton instance
+job_worker = JobWorker(
+    job_queue,
+    handlers={
+        JobKind.TEST_RUN: test_run_runner.run,
+        JobKind.BATCH: batch_runner.run,
+        JobKind.BENCHMARK: benchmark_runner.run,
+        JobKind.RESPONSE_OFFLOAD: response_offloader.run,
+    },
+    failure_handlers={
+        JobKind.TEST_RUN: test_run_runner.fail,
+        JobKind.BATCH: batch_runner.fail,
+        JobKind.BENCHMARK: benchmark_runner.fail,
+    },
+    concurrency=settings.job_workers,
+    lease_seconds=settings.job_lease_seconds,
+    heartbeat_seconds=settings.job_heartbeat_seconds,
+    poll_seconds=settings.job_poll_seconds,
+    retry_delay=settings.job_retry_delay_seconds,
+)
+
+
+async def main() -> None:
+    """Run a worker until SIGINT/SIGTERM."""
+    logging.basicConfig(level=logging.INFO)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await job_worker.start()
+    await replica_prober.start()
+    print(f"Job worker {job_worker.worker_id} started")
+    await stop.wait()
+    await replica_prober.stop()
+    await job_worker.stop()
+    await result_writer.stop()
+    await llm_client.aclose()
+    await benchmark_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 
 from app.db.base import Base
 from app.models.user import User
+from app.services.result_writer import result_writer
 
 # Use SQLite for testing
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -35,9 +36,16 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         engine, class_=AsyncSession, expire_on_commit=False
     )
 
+    # Results are group-committed by the shared writer; point it at this DB
+    session_factory = result_writer.session_factory
+    result_writer.session_factory = async_session
+
     async with async_session() as session:
         yield session
 
+    await result_writer.stop()
+    result_writer.session_factory = session_factory
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
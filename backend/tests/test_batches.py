@@ -0,0 +1,217 @@
+"""Tests for batch evaluation."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.batch import Batch
+from app.models.job import Job, JobKind
+from app.models.model import Model
+from app.models.test_run import TestResult, TestRunStatus
+from app.schemas.batch import BatchCreate
+from app.schemas.test_run import ModelTestConfig
+from app.services.batch import BatchService
+from app.services.batch_jobs import BatchRunner
+from app.services.result_writer import ResultWriter
+from app.services.test_run import TestRunService
+from app.utils.llm_client import LLMResponse
+from app.utils.progress import ProgressHub
+
+
+class TestBatches:
+    """Tests for batch creation and execution."""
+
+    @pytest.fixture
+    async def test_model(self, db_session):
+        """Create a test model."""
+        model = Model(
+            name="Batch LLM",
+            model_name="batch-model",
+            endpoint_url="http://localhost:8000",
+            is_active=True,
+        )
+        db_session.add(model)
+        await db_session.commit()
+        await db_session.refresh(model)
+        return model
+
+    def test_parse_dataset(self):
+        """Test that objects and bare strings are accepted, blank lines skipped."""
+        items = BatchService.parse_dataset(
+            b'{"user_message": "Hi", "system_prompt": "Be brief"}\n\n"Hello"\n'
+        )
+
+        assert [item.user_message for item in items] == ["Hi", "Hello"]
+        assert items[0].system_prompt == "Be brief"
+
+    def test_parse_dataset_reports_bad_line(self):
+        """Test that an invalid row is reported with its line number."""
+        with pytest.raises(ValueError, match="Line 2"):
+            BatchService.parse_dataset(b'"ok"\n{"prompt": "missing field"}\n')
+        with pytest.raises(ValueError, match="empty"):
+            BatchService.parse_dataset(b"\n")
+
+    @pytest.mark.asyncio
+    async def test_create_batch(self, db_session, test_user, test_model):
+        """Test that a batch stores one run per row and queues a job."""
+        service = BatchService(db_session)
+        batch = await service.create_batch(
+            test_user.id,
+            BatchCreate(
+                system_prompt="Default",
+                models=[
+                    ModelTestConfig(model_id=test_model.id, temperature=0.5),
+                    ModelTestConfig(model_id=test_model.id, temperature=1.0),
+                ],
+            ),
+            BatchService.parse_dataset(b'"a"\n"b"\n"c"\n'),
+        )
+
+        assert batch.status == TestRunStatus.PENDING
+        assert batch.item_count == 3
+        assert batch.total == 6
+
+        runs = await service.get_results(batch.id)
+        assert [run.user_message for run in runs] == ["a", "b", "c"]
+        assert runs[0].system_prompt == "Default"
+
+        job = (await db_session.execute(select(Job))).scalar_one()
+        assert job.kind == JobKind.BATCH
+        assert job.target_id == batch.id
+
+        # Batch rows stay out of the test run history
+        page = await TestRunService(db_session).get_test_runs(test_user.id)
+        assert page.total == 0
+
+    @pytest.mark.asyncio
+    async def test_runner_executes_batch(self, db_session, test_user, test_model):
+        """Test that every row runs against every config, written in groups."""
+        service = BatchService(db_session)
+        batch = await service.create_batch(
+            test_user.id,
+            BatchCreate(
+                models=[
+                    ModelTestConfig(model_id=test_model.id, temperature=0.5),
+                    ModelTestConfig(model_id=test_model.id, temperature=1.0),
+                ],
+            ),
+            BatchService.parse_dataset(b'"a"\n"b"\n"c"\n'),
+        )
+        batch_id = batch.id
+
+        session_factory = async_sessionmaker(
+            db_session.bind, class_=AsyncSession, expire_on_commit=False
+        )
+        writer = ResultWriter(session_factory, max_rows=4, flush_ms=50)
+        runner = BatchRunner(
+            session_factory=session_factory,
+            hub=ProgressHub(),
+            concurrency=4,
+            writer=writer,
+        )
+        with patch(
+            "app.services.test_run.llm_client.chat_completion",
+            new_callable=AsyncMock,
+            return_value=LLMResponse(
+                content="ok", latency_ms=50, token_count=1, error=None
+            ),
+        ) as mock_completion:
+            await runner.run(batch_id)
+        await writer.stop()
+
+        assert mock_completion.await_count == 6
+        assert writer.rows_written == 6
+        assert writer.flushes < 6
+
+        db_session.expire_all()
+        batch = await db_session.get(Batch, batch_id)
+        assert batch.status == TestRunStatus.COMPLETE
+        assert batch.completed == 6
+        assert batch.failed == 0
+
+        progress = BatchService.progress(batch)
+        assert progress.eta_seconds is None
+        assert progress.elapsed_seconds is not None
+
+        runs = await service.get_results(batch_id)
+        assert all(run.status == TestRunStatus.COMPLETE for run in runs)
+        assert all(len(run.results) == 2 for run in runs)
+        results = (await db_session.execute(select(TestResult))).scalars().all()
+        assert len(results) == 6
+
+    @pytest.mark.asyncio
+    async def test_runner_resumes_from_checkpoint(
+        self, db_session, test_user, test_model
+    ):
+        """Test that a resumed batch only calls models for missing pairs."""
+        service = BatchService(db_session)
+        batch = await service.create_batch(
+            test_user.id,
+            BatchCreate(
+                models=[
+                    ModelTestConfig(model_id=test_model.id, temperature=0.5),
+                    ModelTestConfig(model_id=test_model.id, temperature=1.0),
+                ],
+            ),
+            BatchService.parse_dataset(b'"a"\n"b"\n"c"\n'),
+        )
+        batch_id, model_id = batch.id, test_model.id
+        rows = await service.get_results(batch_id)
+        # An earlier worker saved three results before it died
+        db_session.add_all(
+            TestResult(
+                test_run_id=rows[row].id,
+                model_id=model_id,
+                parameters={},
+                response="saved",
+                config_index=index,
+            )
+            for row, index in ((0, 0), (0, 1), (1, 0))
+        )
+        batch.status = TestRunStatus.RUNNING
+        batch.completed = 3
+        await db_session.commit()
+
+        session_factory = async_sessionmaker(
+            db_session.bind, class_=AsyncSession, expire_on_commit=False
+        )
+        writer = ResultWriter(session_factory, flush_ms=50)
+        runner = BatchRunner(
+            session_factory=session_factory, hub=ProgressHub(), writer=writer
+        )
+        with patch(
+            "app.services.test_run.llm_client.chat_completion",
+            new_callable=AsyncMock,
+            return_value=LLMResponse(
+                content="ok", latency_ms=50, token_count=1, error=None
+            ),
+        ) as mock_completion:
+            await runner.run(batch_id)
+
+        assert mock_completion.await_count == 3
+
+        db_session.expire_all()
+        batch = await db_session.get(Batch, batch_id)
+        assert batch.status == TestRunStatus.COMPLETE
+        assert batch.completed == 6
+
+        rows = await service.get_results(batch_id)
+        assert all(run.status == TestRunStatus.COMPLETE for run in rows)
+        assert sorted(r.config_index for r in rows[1].results) == [0, 1]
+
+        # A late duplicate from a worker that lost its lease is dropped
+        await writer.write(
+            TestResult(
+                test_run_id=rows[0].id,
+                model_id=model_id,
+                parameters={},
+                config_index=0,
+            ),
+            BatchRunner.on_saved(batch_id, 2),
+        )
+        await writer.stop()
+        db_session.expire_all()
+        batch = await db_session.get(Batch, batch_id)
+        assert batch.completed == 6
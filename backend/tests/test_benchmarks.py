@@ -0,0 +1,279 @@
+"""Tests for benchmarks (load tests)."""
+
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.benchmark import Benchmark
+from app.models.job import Job, JobKind
+from app.models.model import Model
+from app.models.test_run import TestRunStatus
+from app.schemas.benchmark import BenchmarkCreate, BenchmarkStep
+from app.schemas.test_run import ModelTestConfig
+from app.services.benchmark import BenchmarkService
+from app.services.benchmark_jobs import BenchmarkRunner, find_knee
+from app.services.test_run import TestRunService
+from app.utils.llm_client import LLMClient, LLMResponse
+
+
+def slow_client(delay: float = 0.02) -> tuple[LLMClient, dict]:
+    """A client whose endpoint answers after ``delay`` and tracks load."""
+    state = {"in_flight": 0, "peak": 0, "requests": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"] += 1
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(delay)
+        state["in_flight"] -= 1
+        return httpx.Response(
+            200,
+            json={
+                "choices": [{"message": {"content": "Hi"}}],
+                "usage": {"total_tokens": 10},
+            },
+        )
+
+    return LLMClient(coalesce=False, transport=httpx.MockTransport(handler)), state
+
+
+class TestBenchmarks:
+    """Tests for benchmark creation and execution."""
+
+    @pytest.fixture
+    async def test_model(self, db_session):
+        """Create a test model."""
+        model = Model(
+            name="Bench LLM",
+            model_name="bench-model",
+            endpoint_url="http://localhost:8000",
+            is_active=True,
+        )
+        db_session.add(model)
+        await db_session.commit()
+        await db_session.refresh(model)
+        return model
+
+    def test_summarize_step(self):
+        """Test percentiles, throughput and error rate of a step."""
+        samples = [
+            LLMResponse(
+                content="ok",
+                latency_ms=latency,
+                token_count=10,
+                error=None,
+                ttft_ms=latency // 10,
+            )
+            for latency in range(100, 1100, 100)
+        ]
+        samples += [
+            LLMResponse(content=None, latency_ms=5, token_count=None, error="HTTP 503")
+        ] * 2
+
+        step = BenchmarkRunner.summarize_step(samples, 2.0, concurrency=4)
+
+        assert step.concurrency == 4
+        assert step.requests == 12
+        assert step.errors == 2
+        assert step.error_rate == round(2 / 12, 4)
+        assert step.throughput_rps == 5.0
+        assert step.token_throughput == 50.0
+        assert step.latency_ms["p50"] == 550
+        assert step.latency_ms["max"] == 1000
+        assert step.ttft_ms["count"] == 10
+        assert step.error_samples == ["HTTP 503"]
+
+    @pytest.mark.asyncio
+    async def test_create_benchmark(self, db_session, test_user, test_model):
+        """Test that a benchmark is stored pending and queued as a job."""
+        service = BenchmarkService(db_session)
+        benchmark = await service.create_benchmark(
+            test_user.id,
+            BenchmarkCreate(
+                model_id=test_model.id, user_message="Hello", concurrency=[1, 4]
+            ),
+        )
+
+        assert benchmark.status == TestRunStatus.PENDING
+        assert benchmark.steps == []
+        job = (
+            await db_session.execute(select(Job).where(Job.target_id == benchmark.id))
+        ).scalar_one()
+        assert job.kind == JobKind.BENCHMARK
+
+    @pytest.mark.asyncio
+    async def test_create_benchmark_limits(self, db_session, test_user, test_model):
+        """Test that oversized benchmarks and bad specs are rejected."""
+        service = BenchmarkService(db_session)
+        with pytest.raises(ValueError, match="Concurrency is limited"):
+            await service.create_benchmark(
+                test_user.id,
+                BenchmarkCreate(
+                    model_id=test_model.id, user_message="Hi", concurrency=[100000]
+                ),
+            )
+        with pytest.raises(ValueError):
+            BenchmarkCreate(model_id=test_model.id, user_message="Hi", mode="qps")
+
+    @pytest.mark.asyncio
+    async def test_concurrency_ramp(self, db_session, test_user, test_model):
+        """Test that each step keeps its concurrency in flight and is saved."""
+        service = BenchmarkService(db_session)
+        benchmark = await service.create_benchmark(
+            test_user.id,
+            BenchmarkCreate(
+                model_id=test_model.id,
+                user_message="Hello",
+                concurrency=[1, 4],
+                step_seconds=0.2,
+                stream=False,
+            ),
+        )
+        benchmark_id = benchmark.id
+
+        client, state = slow_client()
+        runner = BenchmarkRunner(
+            session_factory=async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+            client=client,
+        )
+        await runner.run(benchmark_id)
+        await client.aclose()
+
+        db_session.expire_all()
+        benchmark = await db_session.get(Benchmark, benchmark_id)
+        assert benchmark.status == TestRunStatus.COMPLETE
+        assert [step["concurrency"] for step in benchmark.steps] == [1, 4]
+        assert state["peak"] == 4
+        single, quad = benchmark.steps
+        assert single["errors"] == 0
+        assert quad["throughput_rps"] > single["throughput_rps"] * 2
+        assert quad["latency_ms"]["p99"] >= 20
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_finished_steps(
+        self, db_session, test_user, test_model
+    ):
+        """Test that a resumed benchmark only runs its remaining steps."""
+        service = BenchmarkService(db_session)
+        benchmark = await service.create_benchmark(
+            test_user.id,
+            BenchmarkCreate(
+                model_id=test_model.id,
+                user_message="Hello",
+                mode="qps",
+                qps=[5, 50],
+                step_seconds=0.2,
+                stream=False,
+            ),
+        )
+        benchmark_id = benchmark.id
+        finished = BenchmarkRunner.summarize_step([], 1.0, target_qps=5)
+        benchmark.status = TestRunStatus.RUNNING
+        benchmark.steps = [finished.model_dump(mode="json")]
+        await db_session.commit()
+
+        client, state = slow_client()
+        runner = BenchmarkRunner(
+            session_factory=async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+            client=client,
+        )
+        await runner.run(benchmark_id)
+        await client.aclose()
+
+        db_session.expire_all()
+        benchmark = await db_session.get(Benchmark, benchmark_id)
+        assert benchmark.status == TestRunStatus.COMPLETE
+        assert [step["target_qps"] for step in benchmark.steps] == [5, 50]
+        # Only the 50 QPS step ran: about 10 requests in 0.2s
+        assert 8 <= state["requests"] <= 12
+        assert benchmark.steps[1]["requests"] == state["requests"]
+
+    def test_find_knee(self):
+        """Test that the knee is the last step before a plateau or slowdown."""
+
+        def step(concurrency, throughput, p50, error_rate=0.0):
+            return BenchmarkStep(
+                concurrency=concurrency,
+                duration_seconds=1.0,
+                requests=100,
+                errors=int(error_rate * 100),
+                error_rate=error_rate,
+                throughput_rps=throughput,
+                latency_ms={"p50": p50},
+            )
+
+        plateau = [
+            step(1, 10, 100),
+            step(2, 19, 105),
+            step(4, 36, 110),
+            step(8, 38, 210),
+        ]
+        assert find_knee(plateau) == (plateau[2], True)
+
+        slowdown = [step(1, 10, 100), step(2, 20, 150), step(4, 40, 250)]
+        assert find_knee(slowdown) == (slowdown[1], True)
+
+        errors = [step(1, 10, 100), step(2, 20, 100, error_rate=0.2)]
+        assert find_knee(errors) == (errors[0], True)
+
+        linear = [step(1, 10, 100), step(2, 20, 100)]
+        assert find_knee(linear) == (linear[1], False)
+
+    @pytest.mark.asyncio
+    async def test_probe_sets_model_cap(self, db_session, test_user, test_model):
+        """Test that a probe stops at the knee and caps the model there."""
+        service = BenchmarkService(db_session)
+        benchmark = await service.create_benchmark(
+            test_user.id,
+            BenchmarkCreate(
+                model_id=test_model.id,
+                user_message="Hello",
+                mode="probe",
+                max_concurrency=16,
+                step_seconds=0.2,
+                stream=False,
+            ),
+        )
+        benchmark_id, model_id = benchmark.id, test_model.id
+
+        # The endpoint serves two requests at a time; the rest queue
+        server = asyncio.Semaphore(2)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            async with server:
+                await asyncio.sleep(0.02)
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": "Hi"}}]}
+            )
+
+        client = LLMClient(coalesce=False, transport=httpx.MockTransport(handler))
+        runner = BenchmarkRunner(
+            session_factory=async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+            client=client,
+        )
+        await runner.run(benchmark_id)
+        await client.aclose()
+
+        db_session.expire_all()
+        benchmark = await db_session.get(Benchmark, benchmark_id)
+        model = await db_session.get(Model, model_id)
+        assert benchmark.status == TestRunStatus.COMPLETE
+        assert benchmark.recommended_concurrency == 2
+        # Stopped after the first saturated step instead of ramping to 16
+        assert [step["concurrency"] for step in benchmark.steps] == [1, 2, 4]
+        assert model.metadata_["max_concurrency"] == 2
+        assert model.metadata_["capacity_probe"]["benchmark_id"] == str(benchmark_id)
+
+        request = TestRunService._llm_request(
+            model, "Hi", None, ModelTestConfig(model_id=model_id)
+        )
+        assert request["max_concurrency"] == 2
@@ -0,0 +1,122 @@
+"""Tests for per-endpoint circuit breakers."""
+
+import httpx
+import pytest
+
+from app.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitState,
+)
+from app.utils.llm_client import LLMClient
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the threshold and rejects calls."""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+        for _ in range(2):
+            breaker.record_failure("boom")
+        assert breaker.state == CircuitState.CLOSED
+
+        breaker.record_failure("boom")
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+        assert breaker.rejected == 1
+        assert breaker.retry_after() > 0
+
+    def test_success_resets_failure_count(self):
+        """Test that failures must be consecutive to open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        """Test that one probe goes through after the recovery timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.HALF_OPEN
+
+        breaker.recovery_timeout = 30
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed half-open probe re-opens the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.recovery_timeout = 30
+        assert breaker.allow_request()
+
+        breaker.record_failure("still down")
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.times_opened == 2
+
+
+class TestLLMClientCircuitBreaker:
+    """Tests for fast-failing calls to unhealthy endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test that calls stop reaching an endpoint once its circuit opens."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503, text="unavailable")
+
+        client = LLMClient(
+            breakers=CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=60),
+            transport=httpx.MockTransport(handler),
+        )
+        for _ in range(2):
+            response = await client.chat_completion(
+                endpoint_url="http://model.local",
+                api_key=None,
+                model_name="test-model",
+                user_message="Hello",
+            )
+            assert response.status_code == 503
+
+        response = await client.chat_completion(
+            endpoint_url="http://model.local",
+            api_key=None,
+            model_name="test-model",
+            user_message="Hello",
+        )
+        assert calls == 2
+        assert response.error.startswith("Circuit open")
+        assert response.latency_ms == 0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_circuit(self):
+        """Test that 4xx responses are not counted against the endpoint."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(400, text="bad request")
+
+        client = LLMClient(
+            breakers=CircuitBreakerRegistry(failure_threshold=1),
+            transport=httpx.MockTransport(handler),
+        )
+        for _ in range(3):
+            response = await client.chat_completion(
+                endpoint_url="http://model.local",
+                api_key=None,
+                model_name="test-model",
+                user_message="Hello",
+            )
+            assert response.status_code == 400
+        assert client.breakers.get("http://model.local").state == CircuitState.CLOSED
+        await client.aclose()
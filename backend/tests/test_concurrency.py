@@ -0,0 +1,94 @@
+"""Tests for adaptive endpoint concurrency limiting."""
+
+import asyncio
+
+import pytest
+
+from app.utils.concurrency import (
+    AdaptiveLimiter,
+    ConcurrencyController,
+    ConcurrencyLimitExceeded,
+)
+
+
+class TestAdaptiveLimiter:
+    """Tests for the AIMD limiter."""
+
+    @pytest.mark.asyncio
+    async def test_waiters_queue_beyond_limit(self):
+        """Test that callers over the limit wait and are served in order."""
+        limiter = AdaptiveLimiter(initial_limit=1, max_queue=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+        assert not waiter.done()
+
+        with pytest.raises(ConcurrencyLimitExceeded):
+            await limiter.acquire()
+        assert limiter.rejected == 1
+
+        limiter.release(latency_ms=100, tokens=10)
+        await waiter
+        assert limiter.in_flight == 1
+        assert limiter.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_model_caps_are_independent(self):
+        """Test that a model's cap counts only its own calls."""
+        controller = ConcurrencyController(initial_limit=8)
+        capped = controller.cap("http://host", "small", 1)
+        other = controller.cap("http://host", "large", 1)
+        await capped.acquire()
+
+        waiter = asyncio.create_task(capped.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        # Another model on the same endpoint is not held up
+        await asyncio.wait_for(other.acquire(), timeout=1)
+
+        capped.release()
+        await waiter
+
+        controller.get("http://host")
+        (stats,) = controller.stats()
+        assert stats["model_caps"] == [
+            {"model": "small", "cap": 1, "in_flight": 1, "queued": 0},
+            {"model": "large", "cap": 1, "in_flight": 1, "queued": 0},
+        ]
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """Test that the limit grows on fast calls and shrinks on slow ones."""
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=10, backoff=0.5)
+
+        for _ in range(8):
+            limiter.in_flight += 1
+            limiter.release(latency_ms=100, tokens=10)
+        assert limiter.limit > 4
+
+        grown = limiter.limit
+        limiter.in_flight += 1
+        limiter.release(latency_ms=1000, tokens=10)  # 10x the baseline
+        assert limiter.limit == pytest.approx(grown * 0.5)
+
+        limiter.in_flight += 1
+        limiter.release(overloaded=True)
+        assert limiter.limit == pytest.approx(grown * 0.25)
+        assert limiter.decreases == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that a cancelled waiter does not leak a slot."""
+        limiter = AdaptiveLimiter(initial_limit=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.queued == 0
+        limiter.release()
+        assert limiter.in_flight == 0
@@ -0,0 +1,161 @@
+"""Tests for the durable job queue."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.job import Job, JobKind, JobStatus
+from app.services.jobs import JobQueue, JobWorker
+
+
+class TestJobQueue:
+    """Tests for claiming, leasing and finishing jobs."""
+
+    @pytest.fixture
+    def queue(self, db_session):
+        return JobQueue(
+            async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            )
+        )
+
+    async def _enqueue(self, db_session, max_attempts: int = 3) -> uuid.UUID:
+        job = JobQueue.enqueue(
+            db_session, JobKind.TEST_RUN, uuid.uuid4(), max_attempts=max_attempts
+        )
+        await db_session.commit()
+        return job.id
+
+    async def _status(self, db_session, job_id: uuid.UUID) -> Job:
+        db_session.expire_all()
+        result = await db_session.execute(select(Job).where(Job.id == job_id))
+        return result.scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_claim_is_exclusive(self, db_session, queue):
+        """Test that a claimed job is not handed to another worker."""
+        job_id = await self._enqueue(db_session)
+
+        claimed = await queue.claim("worker-a", limit=5, lease_seconds=60)
+        assert [job.id for job in claimed] == [job_id]
+        assert claimed[0].attempts == 1
+        assert await queue.claim("worker-b", limit=5, lease_seconds=60) == []
+
+        await queue.complete(claimed[0], "worker-a")
+        job = await self._status(db_session, job_id)
+        assert job.status == JobStatus.DONE
+        assert job.locked_by is None
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, db_session, queue):
+        """Test that a job abandoned by a crashed worker is claimed again."""
+        job_id = await self._enqueue(db_session)
+        (stale,) = await queue.claim("worker-a", limit=1, lease_seconds=60)
+
+        await db_session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+            )
+        )
+        await db_session.commit()
+
+        (job,) = await queue.claim("worker-b", limit=1, lease_seconds=60)
+        assert job.attempts == 2
+        # The original owner can no longer touch it
+        assert not await queue.heartbeat(stale, "worker-a", 60)
+        assert await queue.heartbeat(job, "worker-b", 60)
+
+    @pytest.mark.asyncio
+    async def test_fail_requeues_until_attempts_run_out(self, db_session, queue):
+        """Test that failures are retried up to max_attempts."""
+        job_id = await self._enqueue(db_session, max_attempts=2)
+
+        (job,) = await queue.claim("worker-a", limit=1, lease_seconds=60)
+        assert not await queue.fail(job, "worker-a", "boom", retry_delay=0)
+        assert (await self._status(db_session, job_id)).status == JobStatus.QUEUED
+
+        (job,) = await queue.claim("worker-a", limit=1, lease_seconds=60)
+        assert await queue.fail(job, "worker-a", "boom again", retry_delay=0)
+        job = await self._status(db_session, job_id)
+        assert job.status == JobStatus.FAILED
+        assert job.error == "boom again"
+
+    @pytest.mark.asyncio
+    async def test_worker_dispatches_to_handler(self, db_session, queue):
+        """Test that a worker runs the handler for each claimed job."""
+        job_id = await self._enqueue(db_session)
+        seen = []
+
+        async def handler(target_id):
+            seen.append(target_id)
+
+        worker = JobWorker(queue, {JobKind.TEST_RUN: handler}, concurrency=2)
+        assert await worker.run_once() == 1
+        while worker.stats()["running"]:
+            await asyncio.sleep(0.01)
+
+        job = await self._status(db_session, job_id)
+        assert seen == [job.target_id]
+        assert job.status == JobStatus.DONE
+        assert worker.stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_final_failure_notifies_target(self, db_session, queue):
+        """Test that the failure handler runs once a job fails for good."""
+        await self._enqueue(db_session, max_attempts=1)
+        failures = []
+
+        async def handler(target_id):
+            raise RuntimeError("handler exploded")
+
+        async def on_failure(target_id, error):
+            failures.append(error)
+
+        worker = JobWorker(
+            queue,
+            {JobKind.TEST_RUN: handler},
+            failure_handlers={JobKind.TEST_RUN: on_failure},
+            retry_delay=0,
+        )
+        await worker.run_once()
+        while worker.stats()["running"]:
+            await asyncio.sleep(0.01)
+
+        assert failures == ["handler exploded"]
+
+    @pytest.mark.asyncio
+    async def test_abandoned_too_often_notifies_target(self, db_session, queue):
+        """Test that a job whose lease keeps expiring is failed, not re-run."""
+        job_id = await self._enqueue(db_session, max_attempts=1)
+        await queue.claim("worker-a", limit=1, lease_seconds=60)
+        await db_session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+            )
+        )
+        await db_session.commit()
+        failures = []
+
+        async def handler(target_id):
+            raise AssertionError("should not run")
+
+        async def on_failure(target_id, error):
+            failures.append(error)
+
+        worker = JobWorker(
+            queue,
+            {JobKind.TEST_RUN: handler},
+            failure_handlers={JobKind.TEST_RUN: on_failure},
+        )
+        await worker.run_once()
+
+        assert failures == ["Lease expired too many times"]
+        assert (await self._status(db_session, job_id)).status == JobStatus.FAILED
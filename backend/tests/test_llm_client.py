@@ -0,0 +1,395 @@
+"""Tests for the LLM client."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.utils.llm_client import (
+    LLMClient,
+    build_chat_url,
+    build_models_url,
+    endpoint_origin,
+)
+from app.utils.retry import RetryBudget
+from app.utils.stats import LatencyWindow
+
+
+def completion_handler(request: httpx.Request) -> httpx.Response:
+    """Mock OpenAI-compatible chat completion endpoint."""
+    return httpx.Response(
+        200,
+        json={
+            "choices": [{"message": {"role": "assistant", "content": "Hi there"}}],
+            "usage": {"total_tokens": 7},
+        },
+    )
+
+
+class TestLLMClientPool:
+    """Tests for pooled HTTP clients."""
+
+    def test_build_chat_url(self):
+        """Test chat completion URL normalisation."""
+        assert build_chat_url("http://host:8000") == (
+            "http://host:8000/v1/chat/completions"
+        )
+        assert build_chat_url("http://host:8000/v1/") == (
+            "http://host:8000/v1/chat/completions"
+        )
+        assert build_chat_url("http://host:8000/v1/chat/completions") == (
+            "http://host:8000/v1/chat/completions"
+        )
+
+    def test_build_models_url(self):
+        """Test that health probes hit /v1/models however the endpoint is given."""
+        for endpoint in (
+            "http://host:8000",
+            "http://host:8000/v1/",
+            "http://host:8000/v1/chat/completions",
+        ):
+            assert build_models_url(endpoint) == "http://host:8000/v1/models"
+
+    def test_endpoint_origin(self):
+        """Test pool key derivation."""
+        assert endpoint_origin("http://Host:8000/v1/chat/completions") == (
+            "http://host:8000"
+        )
+
+    @pytest.mark.asyncio
+    async def test_client_reused_per_endpoint(self):
+        """Test that one pooled client is shared per endpoint origin."""
+        client = LLMClient(transport=httpx.MockTransport(completion_handler))
+
+        for _ in range(3):
+            response = await client.chat_completion(
+                endpoint_url="http://localhost:8000",
+                api_key=None,
+                model_name="test-model",
+                user_message="Hello",
+            )
+            assert response.content == "Hi there"
+            assert response.token_count == 7
+
+        await client.chat_completion(
+            endpoint_url="http://localhost:8001",
+            api_key=None,
+            model_name="test-model",
+            user_message="Hello",
+        )
+
+        stats = {s["endpoint"]: s for s in client.pool_stats()}
+        assert set(stats) == {"http://localhost:8000", "http://localhost:8001"}
+        assert stats["http://localhost:8000"]["requests"] == 3
+        assert stats["http://localhost:8000"]["in_flight"] == 0
+
+        await client.aclose()
+        assert client.pool_stats() == []
+
+    @pytest.mark.asyncio
+    async def test_n_samples_returned(self):
+        """Test that n > 1 is sent upstream and every choice is returned."""
+        sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.read())
+            return httpx.Response(
+                200,
+                json={
+                    "choices": [
+                        {"index": 1, "message": {"content": "Second"}},
+                        {"index": 0, "message": {"content": "First"}},
+                    ],
+                    "usage": {"total_tokens": 9},
+                },
+            )
+
+        client = LLMClient(transport=httpx.MockTransport(handler))
+        response = await client.chat_completion(
+            endpoint_url="http://localhost:8000",
+            api_key=None,
+            model_name="test-model",
+            user_message="Hello",
+            temperature=0.8,
+            n=2,
+        )
+        await client.aclose()
+
+        assert b'"n":2' in sent[0].replace(b" ", b"")
+        assert response.content == "First"
+        assert response.samples == ["First", "Second"]
+
+    @pytest.mark.asyncio
+    async def test_http_error_counted(self):
+        """Test that non-200 responses are reported and counted."""
+        client = LLMClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+
+        response = await client.chat_completion(
+            endpoint_url="http://localhost:8000",
+            api_key=None,
+            model_name="test-model",
+            user_message="Hello",
+        )
+
+        assert response.content is None
+        assert response.error.startswith("HTTP 503")
+        assert client.pool_stats()[0]["errors"] == 1
+        await client.aclose()
+
+
+def stream_handler(request: httpx.Request) -> httpx.Response:
+    """Mock OpenAI-compatible SSE streaming endpoint."""
+    lines = [
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+        'data: {"choices": [{"delta": {"content": "lo"}}]}',
+        'data: {"choices": [{"delta": {"content": "!"}}]}',
+        'data: {"choices": [], "usage": {"completion_tokens": 3, "total_tokens": 9}}',
+        "data: [DONE]",
+    ]
+    body = "\n\n".join(lines) + "\n\n"
+    return httpx.Response(
+        200, content=body, headers={"Content-Type": "text/event-stream"}
+    )
+
+
+class TestLLMClientStreaming:
+    """Tests for streamed chat completions."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas_and_final_response(self):
+        """Test that deltas arrive in order and timings are recorded."""
+        client = LLMClient(transport=httpx.MockTransport(stream_handler))
+
+        deltas = []
+        final = None
+        async for delta in client.stream_chat_completion(
+            endpoint_url="http://localhost:8000",
+            api_key=None,
+            model_name="test-model",
+            user_message="Hello",
+        ):
+            if delta.response is not None:
+                final = delta.response
+            else:
+                deltas.append(delta.content)
+
+        assert deltas == ["Hel", "lo", "!"]
+        assert final is not None
+        assert final.content == "Hello!"
+        assert final.token_count == 9
+        assert final.error is None
+        assert final.ttft_ms is not None
+        assert final.inter_token_latency["count"] == 2
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_http_error(self):
+        """Test that HTTP errors end the stream with an error response."""
+        client = LLMClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(500, text="boom")
+            )
+        )
+
+        events = [
+            delta
+            async for delta in client.stream_chat_completion(
+                endpoint_url="http://localhost:8000",
+                api_key=None,
+                model_name="test-model",
+                user_message="Hello",
+            )
+        ]
+
+        assert len(events) == 1
+        assert events[0].response.error == "HTTP 500: boom"
+        assert events[0].response.ttft_ms is None
+        await client.aclose()
+
+
+class TestLLMClientCoalescing:
+    """Tests for single-flight coalescing of identical requests."""
+
+    @pytest.mark.asyncio
+    async def test_identical_deterministic_requests_share_one_call(self):
+        """Test that concurrent temperature-0 requests hit upstream once."""
+        calls = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return completion_handler(request)
+
+        client = LLMClient(transport=httpx.MockTransport(handler))
+        request = dict(
+            endpoint_url="http://localhost:8000",
+            api_key=None,
+            model_name="test-model",
+            user_message="Hello",
+            temperature=0.0,
+        )
+
+        responses = await asyncio.gather(
+            *[client.chat_completion(**request) for _ in range(5)]
+        )
+
+        assert calls == 1
+        assert all(r.content == "Hi there" for r in responses)
+        assert client.coalescing_stats()["followers"] == 4
+
+        # Sampled requests are never coalesced
+        await asyncio.gather(
+            *[client.chat_completion(**{**request, "temperature": 0.7}) for _ in range(2)]
+        )
+        assert calls == 3
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_late_stream_joiner_replays_buffer(self):
+        """Test that a late stream subscriber gets every delta."""
+        calls = 0
+        first_sent = asyncio.Event()
+        release = asyncio.Event()
+
+        async def body():
+            yield b'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+            first_sent.set()
+            await release.wait()
+            yield b'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n'
+            yield b"data: [DONE]\n\n"
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, content=body())
+
+        client = LLMClient(transport=httpx.MockTransport(handler))
+        request = dict(
+            endpoint_url="http://localhost:8000",
+            api_key=None,
+            model_name="test-model",
+            user_message="Hello",
+            seed=7,
+        )
+
+        async def collect():
+            return [
+                d.content
+                async for d in client.stream_chat_completion(**request)
+                if d.response is None
+            ]
+
+        leader = asyncio.create_task(collect())
+        await first_sent.wait()
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(collect())
+        await asyncio.sleep(0.01)
+        release.set()
+
+        assert await leader == ["Hel", "lo"]
+        assert await follower == ["Hel", "lo"]
+        assert calls == 1
+        assert client.coalescing_stats()["stream_followers"] == 1
+        await client.aclose()
+
+
+class TestLLMClientRetries:
+    """Tests for retries, the retry budget and hedging."""
+
+    async def _complete(self, client: LLMClient):
+        return await client.chat_completion(
+            endpoint_url="http://model.local",
+            api_key=None,
+            model_name="test-model",
+            user_message="Hello",
+        )
+
+    @pytest.mark.asyncio
+    async def test_retries_server_errors(self):
+        """Test that a 5xx is retried and the attempt count recorded."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(503, text="unavailable")
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": "ok"}}]}
+            )
+
+        client = LLMClient(
+            max_attempts=3,
+            retry_base_delay=0,
+            transport=httpx.MockTransport(handler),
+        )
+        response = await self._complete(client)
+        assert response.error is None
+        assert response.attempts == 2
+        assert client.retries == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_not_retried(self):
+        """Test that 4xx responses are returned without retrying."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(400, text="bad request")
+
+        client = LLMClient(max_attempts=3, transport=httpx.MockTransport(handler))
+        response = await self._complete(client)
+        assert response.status_code == 400
+        assert response.attempts == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_bounds_retries(self):
+        """Test that retries stop once the budget is spent."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("connection refused")
+
+        client = LLMClient(
+            max_attempts=5,
+            retry_base_delay=0,
+            retry_budget=RetryBudget(ratio=0, min_per_second=0, max_balance=2),
+            transport=httpx.MockTransport(handler),
+        )
+        response = await self._complete(client)
+        assert response.error.startswith("Request error")
+        assert response.attempts == 3
+        assert client.retry_budget.denied == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_hedge_beats_straggler(self):
+        """Test that a slow call is hedged and the faster duplicate wins."""
+        calls = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": "ok"}}]}
+            )
+
+        client = LLMClient(
+            hedge=True,
+            hedge_min_samples=1,
+            transport=httpx.MockTransport(handler),
+        )
+        client._latencies["http://model.local"] = LatencyWindow()
+        client._latencies["http://model.local"].add(10)
+
+        response = await asyncio.wait_for(self._complete(client), timeout=2)
+        assert response.content == "ok"
+        assert response.attempts == 2
+        assert client.hedges == 1
+        assert client.hedge_wins == 1
+        await client.aclose()
@@ -0,0 +1,114 @@
+"""Tests for replica load balancing."""
+
+import httpx
+import pytest
+
+from app.utils.llm_client import LLMClient, prefix_key
+from app.utils.load_balancer import POWER_OF_TWO, HashRing, LoadBalancer
+
+REPLICAS = ["http://a.local", "http://b.local", "http://c.local"]
+
+
+class TestLoadBalancer:
+    """Tests for replica selection."""
+
+    def test_least_outstanding(self):
+        """Test that the replica with the fewest outstanding calls is picked."""
+        balancer = LoadBalancer()
+        with balancer.track(REPLICAS[0]), balancer.track(REPLICAS[1]):
+            assert balancer.choose(REPLICAS) == REPLICAS[2]
+        assert balancer.outstanding(REPLICAS[0]) == 0
+
+    def test_unhealthy_replicas_skipped(self):
+        """Test that ejected replicas are only used when nothing else is left."""
+        balancer = LoadBalancer()
+        with balancer.track(REPLICAS[1]):
+            choice = balancer.choose(REPLICAS, healthy=lambda url: url == REPLICAS[1])
+        assert choice == REPLICAS[1]
+        assert balancer.choose(REPLICAS[:1], healthy=lambda url: False) == REPLICAS[0]
+
+    def test_power_of_two_avoids_busiest(self):
+        """Test that power-of-two never picks the busier of its two samples."""
+        balancer = LoadBalancer(strategy=POWER_OF_TWO)
+        with balancer.track(REPLICAS[0]), balancer.track(REPLICAS[0]):
+            picks = {balancer.choose(REPLICAS) for _ in range(50)}
+        assert REPLICAS[0] not in picks
+
+    def test_unknown_strategy(self):
+        """Test that an unknown strategy is rejected."""
+        with pytest.raises(ValueError):
+            LoadBalancer(strategy="round_robin")
+
+
+class TestPrefixAffinity:
+    """Tests for consistent-hash routing by prompt prefix."""
+
+    def test_same_prefix_same_replica(self):
+        """Test that requests sharing a system prompt land on one replica."""
+        balancer = LoadBalancer()
+        key = prefix_key([{"role": "system", "content": "You are terse."}])
+        picks = {balancer.choose_affine(REPLICAS, key) for _ in range(20)}
+        assert len(picks) == 1
+        (stats,) = balancer.stats()
+        assert stats["affinity_hit_rate"] == 1.0
+
+    def test_prefix_key_ignores_user_message(self):
+        """Test that only the system prompt determines the key."""
+        system = {"role": "system", "content": "Shared prompt"}
+        first = prefix_key([system, {"role": "user", "content": "a"}])
+        second = prefix_key([system, {"role": "user", "content": "b"}])
+        assert first == second
+
+    def test_bounded_load_spills_over(self):
+        """Test that an overloaded home replica sheds to the next one."""
+        balancer = LoadBalancer(load_factor=1.0)
+        key = prefix_key([{"role": "system", "content": "hot prompt"}])
+        home = balancer.choose_affine(REPLICAS, key)
+        with balancer.track(home), balancer.track(home):
+            spill = balancer.choose_affine(REPLICAS, key)
+        assert spill != home
+        stats = {item["endpoint"]: item for item in balancer.stats()}
+        assert stats[spill]["affinity_hits"] == 0
+
+    def test_ring_only_remaps_removed_replica(self):
+        """Test that removing a replica keeps other keys on their replica."""
+        full = HashRing(REPLICAS)
+        reduced = HashRing(REPLICAS[:2])
+        for i in range(100):
+            home = next(full.walk(f"key-{i}"))
+            if home != REPLICAS[2]:
+                assert next(reduced.walk(f"key-{i}")) == home
+
+
+class TestLLMClientReplicas:
+    """Tests for multi-replica model calls."""
+
+    @pytest.mark.asyncio
+    async def test_retry_moves_to_another_replica(self):
+        """Test that a failed replica is not retried while another exists."""
+        hosts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            if request.url.host == "a.local":
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": "ok"}}]}
+            )
+
+        client = LLMClient(
+            max_attempts=2,
+            retry_base_delay=0,
+            transport=httpx.MockTransport(handler),
+        )
+        for _ in range(4):
+            response = await client.chat_completion(
+                endpoint_url="http://a.local",
+                api_key=None,
+                model_name="test-model",
+                user_message="Hello",
+                replica_urls=["http://b.local"],
+            )
+            assert response.content == "ok"
+        assert hosts.count("b.local") == 4
+        await client.aclose()
@@ -1,12 +1,16 @@
 """Tests for model management."""
 
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.models.model import Model
-from app.schemas.model import ModelCreate, ModelUpdate
+from app.schemas.model import EndpointHealthCheck, ModelCreate, ModelUpdate
 from app.services.model import ModelService
+from app.services.replica_probes import ReplicaProber
+from app.utils.circuit_breaker import CircuitBreakerRegistry
 
 
 class TestModelService:
@@ -31,6 +35,24 @@ class TestModelService:
         assert model.endpoint_url == "http://localhost:8000"
         assert model.is_active is True
 
+    @pytest.mark.asyncio
+    async def test_create_model_with_replicas(self, db_session):
+        """Test creating a model served from several endpoints."""
+        model_service = ModelService(db_session)
+
+        model = await model_service.create_model(
+            ModelCreate(
+                name="Replicated Model",
+                endpoint_url="http://replica-a:8000",
+                replica_urls=["http://replica-b:8000"],
+            )
+        )
+
+        assert model.endpoint_urls == [
+            "http://replica-a:8000",
+            "http://replica-b:8000",
+        ]
+
     @pytest.mark.asyncio
     async def test_get_model_by_id(self, db_session):
         """Test getting model by ID."""
@@ -81,10 +103,10 @@ class TestModelService:
         await db_session.commit()
 
         model_service = ModelService(db_session)
-        models, total = await model_service.get_models(skip=0, limit=3)
+        page = await model_service.get_models(skip=0, limit=3)
 
-        assert len(models) == 3
-        assert total == 5
+        assert len(page.items) == 3
+        assert page.total == 5
 
     @pytest.mark.asyncio
     async def test_update_model(self, db_session):
@@ -148,10 +170,79 @@ class TestModelService:
         model_service = ModelService(db_session)
 
         # Get active only
-        models, total = await model_service.get_models(active_only=True)
-        assert total == 1
-        assert models[0].name == "Active Model"
+        page = await model_service.get_models(active_only=True)
+        assert page.total == 1
+        assert page.items[0].name == "Active Model"
 
         # Get all
-        models, total = await model_service.get_models(active_only=False)
-        assert total == 2
+        page = await model_service.get_models(active_only=False)
+        assert page.total == 2
+
+    @pytest.mark.asyncio
+    async def test_health_check_client_error_leaves_breaker_closed(self, db_session):
+        """Test that a 4xx probe doesn't eject the endpoint, but a 5xx does."""
+        model_service = ModelService(db_session)
+        model = await model_service.create_model(
+            ModelCreate(name="Probe Model", endpoint_url="http://probe-host:8000")
+        )
+        breakers = CircuitBreakerRegistry()
+
+        for status_code, available in ((401, True), (503, False)):
+            probe = EndpointHealthCheck(
+                endpoint_url=model.endpoint_url,
+                is_healthy=False,
+                status_code=status_code,
+                error=f"HTTP {status_code}",
+            )
+            with patch(
+                "app.services.model.llm_client.breakers", breakers
+            ), patch.object(
+                ModelService, "_probe", new_callable=AsyncMock, return_value=probe
+            ):
+                health = await model_service.health_check(model.id)
+
+            assert health.is_healthy is False
+            assert breakers.available("http://probe-host:8000") is available
+
+    @pytest.mark.asyncio
+    async def test_replica_prober_ejects_dead_replica(self, db_session):
+        """Test that background probes cover only multi-replica models."""
+        db_session.add_all(
+            [
+                Model(
+                    name="Replicated",
+                    endpoint_url="http://replica-a:8000",
+                    replica_urls=["http://replica-b:8000"],
+                    is_active=True,
+                ),
+                Model(name="Single", endpoint_url="http://single:8000", is_active=True),
+            ]
+        )
+        await db_session.commit()
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+
+        async def probe(endpoint_url, api_key):
+            healthy = endpoint_url != "http://replica-b:8000"
+            return EndpointHealthCheck(
+                endpoint_url=endpoint_url,
+                is_healthy=healthy,
+                status_code=200 if healthy else 503,
+            )
+
+        prober = ReplicaProber(
+            async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            )
+        )
+        with patch("app.services.model.llm_client.breakers", breakers), patch.object(
+            ModelService, "_probe", side_effect=probe
+        ) as mock_probe:
+            probed = await prober.probe_all()
+
+        assert probed == 2
+        assert {c.args[0] for c in mock_probe.await_args_list} == {
+            "http://replica-a:8000",
+            "http://replica-b:8000",
+        }
+        assert breakers.available("http://replica-a:8000") is True
+        assert breakers.available("http://replica-b:8000") is False
@@ -79,12 +79,10 @@ class TestPromptService:
         await db_session.commit()
 
         prompt_service = PromptService(db_session)
-        prompts, total = await prompt_service.get_prompts(
-            user_id=test_user.id, skip=0, limit=3
-        )
+        page = await prompt_service.get_prompts(user_id=test_user.id, skip=0, limit=3)
 
-        assert len(prompts) == 3
-        assert total == 5
+        assert len(page.items) == 3
+        assert page.total == 5
 
     @pytest.mark.asyncio
     async def test_get_prompts_favorites_only(self, db_session, test_user):
@@ -106,12 +104,12 @@ class TestPromptService:
         await db_session.commit()
 
         prompt_service = PromptService(db_session)
-        prompts, total = await prompt_service.get_prompts(
+        page = await prompt_service.get_prompts(
             user_id=test_user.id, favorites_only=True
         )
 
-        assert total == 1
-        assert prompts[0].name == "Favorite"
+        assert page.total == 1
+        assert page.items[0].name == "Favorite"
 
     @pytest.mark.asyncio
     async def test_update_prompt_creates_version(self, db_session, test_user):
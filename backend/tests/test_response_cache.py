@@ -0,0 +1,104 @@
+"""Tests for the deterministic response cache."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.response_cache import CachedResponse
+from app.utils.llm_client import is_deterministic
+from app.utils.response_cache import ResponseCache, make_cache_key
+
+
+class TestResponseCache:
+    """Tests for the in-process cache tier."""
+
+    def test_is_deterministic(self):
+        """Test which sampling parameters are cacheable."""
+        assert is_deterministic(0.0, None) is True
+        assert is_deterministic(0.7, 42) is True
+        assert is_deterministic(0.7, None) is False
+
+    def test_cache_key_covers_request(self):
+        """Test that every request component changes the key."""
+        messages = [{"role": "user", "content": "Hi"}]
+        params = {"temperature": 0.0, "max_tokens": 16, "top_p": 1.0}
+        key = make_cache_key("http://a:8000", "m", messages, params)
+
+        assert key == make_cache_key("http://a:8000/", "m", messages, dict(params))
+        assert key != make_cache_key("http://b:8000", "m", messages, params)
+        assert key != make_cache_key("http://a:8000", "m2", messages, params)
+        assert key != make_cache_key(
+            "http://a:8000", "m", [{"role": "user", "content": "Hey"}], params
+        )
+        assert key != make_cache_key(
+            "http://a:8000", "m", messages, {**params, "max_tokens": 32}
+        )
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResponseCache(max_entries=2)
+        for key in ["a", "b"]:
+            await cache.set(key, "http://a", "m", key.upper(), 1, 10)
+
+        assert (await cache.get("a")).content == "A"  # "b" is now LRU
+        await cache.set("c", "http://a", "m", "C", 1, 10)
+
+        assert await cache.get("b") is None
+        assert (await cache.get("a")).content == "A"
+        assert (await cache.get("c")).content == "C"
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses."""
+        cache = ResponseCache(ttl_seconds=60)
+        await cache.set("a", "http://a", "m", "A", 1, 10)
+        cache._entries["a"].expires_at = time.time() - 1
+
+        assert await cache.get("a") is None
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_writes_purge_expired_entries(self):
+        """Test that a write sweeps expired entries once the interval passes."""
+        cache = ResponseCache(ttl_seconds=60, purge_interval_seconds=0)
+        await cache.set("a", "http://a", "m", "A", 1, 10)
+        cache._entries["a"].expires_at = time.time() - 1
+
+        await cache.set("b", "http://a", "m", "B", 1, 10)
+
+        assert "a" not in cache._entries
+        assert cache.stats()["purged"] == 1
+        assert cache.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_purge_deletes_expired_rows(self, db_session):
+        """Test that expired rows are deleted from the persistent tier."""
+        now = datetime.now(timezone.utc)
+        db_session.add_all(
+            CachedResponse(
+                key=key,
+                endpoint_url="http://a",
+                model_name="m",
+                content=key,
+                expires_at=now + timedelta(seconds=offset),
+            )
+            for key, offset in (("old", -60), ("fresh", 60))
+        )
+        await db_session.commit()
+        cache = ResponseCache(
+            persistent=True,
+            session_factory=async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+        )
+
+        assert await cache.purge_expired() == 1
+
+        result = await db_session.execute(select(CachedResponse.key))
+        assert result.scalars().all() == ["fresh"]
@@ -0,0 +1,121 @@
+"""Tests for compressed storage of large responses."""
+
+import zlib
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.model import Model
+from app.models.test_run import TestResult, TestResultBlob, TestRun
+from app.services.response_store import ResponseOffloader, storage_report
+from app.services.result_writer import ResultWriter
+from app.services.test_run import TestRunService
+from app.utils.compression import ZLIB, compress, decompress
+
+LARGE = "All work and no play makes Jack a dull boy. " * 200  # ~9 KB
+
+
+class TestResponseStore:
+    """Tests for offloading, reading back and migrating responses."""
+
+    @pytest.fixture
+    async def test_run(self, db_session, test_user):
+        """Create a test run and a model to attach results to."""
+        model = Model(name="Store LLM", endpoint_url="http://localhost:8000")
+        test_run = TestRun(user_id=test_user.id, user_message="Tell me a story")
+        db_session.add_all([model, test_run])
+        await db_session.commit()
+        return test_run, model
+
+    @pytest.fixture
+    def session_factory(self, db_session):
+        return async_sessionmaker(
+            db_session.bind, class_=AsyncSession, expire_on_commit=False
+        )
+
+    def test_codecs(self):
+        """Test that blobs decode with the codec that wrote them."""
+        raw = LARGE.encode()
+        codec, data = compress(raw)
+        assert len(data) < len(raw) / 10
+        assert decompress(codec, data) == raw
+        assert decompress(ZLIB, zlib.compress(raw)) == raw
+        with pytest.raises(ValueError, match="Unknown codec"):
+            decompress("lz4", data)
+
+    @pytest.mark.asyncio
+    async def test_writer_offloads_large_responses(
+        self, db_session, test_user, session_factory, test_run
+    ):
+        """Test that large responses go to a blob and read back in full."""
+        run, model = test_run
+        run_id, user_id = run.id, test_user.id
+        writer = ResultWriter(session_factory, flush_ms=0)
+        for index, response in enumerate([LARGE, "Short answer"]):
+            await writer.write(
+                TestResult(
+                    test_run_id=run_id,
+                    model_id=model.id,
+                    parameters={},
+                    response=response,
+                    config_index=index,
+                )
+            )
+        await writer.stop()
+
+        rows = (
+            await db_session.execute(
+                select(
+                    TestResult.response,
+                    TestResult.response_offloaded,
+                    TestResult.response_preview,
+                ).order_by(TestResult.config_index)
+            )
+        ).all()
+        assert rows[0] == (None, True, LARGE[:200])
+        assert rows[1] == ("Short answer", False, "Short answer")
+        blob = (await db_session.execute(select(TestResultBlob))).scalar_one()
+        assert blob.raw_size == len(LARGE.encode())
+        assert len(blob.data) < blob.raw_size / 10
+
+        db_session.expire_all()
+        service = TestRunService(db_session)
+        loaded = await service.get_test_run_by_id(run_id, user_id)
+        response = await service.run_response(loaded)
+        assert sorted(r.response for r in response.results) == sorted(
+            [LARGE, "Short answer"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_offloader_moves_existing_rows(
+        self, db_session, session_factory, test_run
+    ):
+        """Test the background move of rows stored before offloading."""
+        run, model = test_run
+        db_session.add_all(
+            TestResult(
+                test_run_id=run.id,
+                model_id=model.id,
+                parameters={},
+                response=response,
+                config_index=index,
+            )
+            for index, response in enumerate([LARGE, LARGE + "!", "Short"])
+        )
+        await db_session.commit()
+
+        before = await storage_report(db_session)
+        assert before["pending_results"] == 2
+        assert before["offloaded_results"] == 0
+
+        offloader = ResponseOffloader(session_factory, batch_size=1)
+        await offloader.run(run.id)
+
+        report = await storage_report(db_session)
+        assert report["pending_results"] == 0
+        assert report["inline_results"] == 1
+        assert report["offloaded_results"] == 2
+        assert report["offloaded_raw_bytes"] == len(LARGE.encode()) * 2 + 1
+        assert report["saved_bytes"] > report["offloaded_raw_bytes"] * 0.9
+        assert report["compression_ratio"] > 10
@@ -0,0 +1,199 @@
+"""Tests for the write-behind result buffer."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.model import Model
+from app.models.test_run import TestResult, TestRun, TestRunStatus
+from app.services.result_writer import ResultWriter
+
+
+class TestResultWriter:
+    """Tests for grouping, backpressure and shutdown of the result writer."""
+
+    @pytest.fixture
+    async def test_run(self, db_session, test_user):
+        """Create a running test run and a model to attach results to."""
+        model = Model(
+            name="Writer LLM",
+            model_name="writer-model",
+            endpoint_url="http://localhost:8000",
+            is_active=True,
+        )
+        test_run = TestRun(
+            user_id=test_user.id,
+            user_message="Hello",
+            status=TestRunStatus.RUNNING,
+        )
+        db_session.add_all([model, test_run])
+        await db_session.commit()
+        return test_run, model
+
+    @pytest.fixture
+    def session_factory(self, db_session):
+        return async_sessionmaker(
+            db_session.bind, class_=AsyncSession, expire_on_commit=False
+        )
+
+    @staticmethod
+    def result(test_run, model, index: int, **kwargs) -> TestResult:
+        values = dict(
+            test_run_id=test_run.id,
+            model_id=model.id,
+            parameters={},
+            response="ok",
+            config_index=index,
+        )
+        return TestResult(**{**values, **kwargs})
+
+    @staticmethod
+    async def count(db_session) -> int:
+        return (await db_session.execute(select(func.count(TestResult.id)))).scalar()
+
+    @pytest.mark.asyncio
+    async def test_flush_at_max_rows(self, db_session, session_factory, test_run):
+        """Test that a full group is written without waiting for the timer."""
+        writer = ResultWriter(session_factory, max_rows=3, flush_ms=60_000)
+        run_id = test_run[0].id
+        await asyncio.wait_for(
+            asyncio.gather(
+                *(writer.write(self.result(*test_run, i)) for i in range(3))
+            ),
+            timeout=2,
+        )
+
+        assert writer.flushes == 1
+        assert writer.rows_written == 3
+        assert await self.count(db_session) == 3
+        db_session.expire_all()
+        run = await db_session.get(TestRun, run_id)
+        assert run.status == TestRunStatus.PARTIAL
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_flush_after_flush_ms(self, db_session, session_factory, test_run):
+        """Test that a partial group is written once ``flush_ms`` passes."""
+        writer = ResultWriter(session_factory, max_rows=100, flush_ms=50)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.wait_for(writer.write(self.result(*test_run, 0)), timeout=2)
+
+        assert loop.time() - started >= 0.04
+        assert writer.flushes == 1
+        assert writer.stats()["batch_size"]["max"] == 1
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self, db_session, session_factory, test_run):
+        """Test that writes block once ``max_pending`` results are queued."""
+        writer = ResultWriter(session_factory, max_rows=1, flush_ms=0, max_pending=1)
+        gate = asyncio.Event()
+        flush = writer._flush
+
+        async def gated_flush(group):
+            await gate.wait()
+            await flush(group)
+
+        writer._flush = gated_flush
+        # One result is being flushed, one fills the queue, one must wait
+        writes = []
+        for i in range(3):
+            writes.append(asyncio.create_task(writer.write(self.result(*test_run, i))))
+            await asyncio.sleep(0.01)
+
+        assert writer.backpressure_waits == 1
+        assert writer.stats()["pending"] == 1
+        assert not any(write.done() for write in writes)
+
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(*writes), timeout=2)
+        assert writer.rows_written == 3
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_queue(self, db_session, session_factory, test_run):
+        """Test that ``stop`` writes every queued result before returning."""
+        writer = ResultWriter(session_factory, max_rows=100, flush_ms=60_000)
+        writes = [
+            asyncio.create_task(writer.write(self.result(*test_run, i)))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        assert writer.rows_written == 0
+
+        await asyncio.wait_for(writer.stop(), timeout=2)
+
+        assert all(write.done() and write.exception() is None for write in writes)
+        assert await self.count(db_session) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_group_retried_one_at_a_time(
+        self, db_session, session_factory, test_run
+    ):
+        """Test that one bad row fails only its own write."""
+        writer = ResultWriter(session_factory, max_rows=3, flush_ms=60_000)
+        # model_id is NOT NULL, so this row fails the group's INSERT
+        bad = self.result(*test_run, 1, model_id=None)
+        good = [self.result(*test_run, i) for i in (0, 2)]
+
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(
+                writer.write(good[0]),
+                writer.write(bad),
+                writer.write(good[1]),
+                return_exceptions=True,
+            ),
+            timeout=2,
+        )
+
+        assert outcomes[0] is None and outcomes[2] is None
+        assert isinstance(outcomes[1], Exception)
+        assert writer.failed_flushes == 2  # The group, then the bad row alone
+        assert writer.flushes == 2
+        assert await self.count(db_session) == 2
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_dead_writer_fails_waiting_writes(
+        self, db_session, session_factory, test_run
+    ):
+        """Test that writes fail instead of hanging if the task dies."""
+        writer = ResultWriter(session_factory, max_rows=100, flush_ms=60_000)
+        write = asyncio.create_task(writer.write(self.result(*test_run, 0)))
+        await asyncio.sleep(0.01)
+
+        writer._task.cancel()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            await asyncio.wait_for(write, timeout=2)
+
+        # The next write starts a new task
+        writer.flush_ms = 0
+        await asyncio.wait_for(writer.write(self.result(*test_run, 1)), timeout=2)
+        await writer.stop()
+        assert await self.count(db_session) == 1
+
+    @pytest.mark.asyncio
+    async def test_on_saved_skips_duplicates(
+        self, db_session, session_factory, test_run
+    ):
+        """Test that ``on_saved`` sees only the results actually inserted."""
+        writer = ResultWriter(session_factory, max_rows=2, flush_ms=60_000)
+        seen = []
+
+        async def on_saved(db, saved):
+            seen.extend(result.config_index for result in saved)
+
+        await asyncio.wait_for(
+            asyncio.gather(
+                writer.write(self.result(*test_run, 0), on_saved),
+                writer.write(self.result(*test_run, 0), on_saved),
+            ),
+            timeout=2,
+        )
+
+        assert seen == [0]
+        assert await self.count(db_session) == 1
+        await writer.stop()
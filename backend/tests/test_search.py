@@ -0,0 +1,119 @@
+"""Tests for test run search."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.model import Model
+from app.models.test_run import TestResult, TestRun
+from app.models.user import User
+from app.services.search import SearchService, highlight
+
+
+class TestSearchService:
+    """Tests for searching prompts and responses."""
+
+    @pytest.fixture
+    async def test_models(self, db_session):
+        """Create two models."""
+        models = [
+            Model(name=f"Search LLM {i}", endpoint_url=f"http://localhost:800{i}")
+            for i in range(2)
+        ]
+        db_session.add_all(models)
+        await db_session.commit()
+        return models
+
+    @pytest.fixture
+    async def test_runs(self, db_session, test_user, test_models):
+        """Two runs, each answered by both models."""
+        first, second = test_models
+        runs = [
+            TestRun(
+                user_id=test_user.id,
+                user_message="What is the capital of France?",
+                created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                results=[
+                    TestResult(
+                        model_id=first.id, parameters={}, response="Paris, of course."
+                    ),
+                    TestResult(model_id=second.id, parameters={}, response="Lyon"),
+                ],
+            ),
+            TestRun(
+                user_id=test_user.id,
+                user_message="Name a large city",
+                system_prompt="Answer in one word",
+                created_at=datetime(2026, 2, 1, tzinfo=timezone.utc),
+                results=[
+                    TestResult(model_id=first.id, parameters={}, response="Tokyo"),
+                    TestResult(model_id=second.id, parameters={}, response="paris"),
+                ],
+            ),
+        ]
+        db_session.add_all(runs)
+        await db_session.commit()
+        return runs
+
+    @pytest.mark.asyncio
+    async def test_search_responses(self, db_session, test_user, test_runs):
+        """Test that hits are the matching results, highlighted."""
+        hits = await SearchService(db_session).search(test_user.id, "Paris")
+
+        assert [(hit.model_name, hit.response) for hit in hits] == [
+            ("Search LLM 1", "<mark>paris</mark>"),
+            ("Search LLM 0", "<mark>Paris</mark>, of course."),
+        ]
+        assert hits[1].test_run_id == test_runs[0].id
+
+    @pytest.mark.asyncio
+    async def test_search_prompts(self, db_session, test_user, test_runs):
+        """Test that a prompt match returns every result of the run."""
+        hits = await SearchService(db_session).search(test_user.id, "one word")
+
+        assert {hit.response for hit in hits} == {"Tokyo", "paris"}
+        assert hits[0].user_message == "Name a large city"
+
+    @pytest.mark.asyncio
+    async def test_search_filters(
+        self, db_session, test_user, test_models, test_runs
+    ):
+        """Test the model and date filters."""
+        service = SearchService(db_session)
+
+        hits = await service.search(test_user.id, "paris", model_id=test_models[0].id)
+        assert [hit.response for hit in hits] == ["<mark>Paris</mark>, of course."]
+
+        hits = await service.search(
+            test_user.id,
+            "paris",
+            created_from=datetime(2026, 1, 15, tzinfo=timezone.utc),
+        )
+        assert [hit.response for hit in hits] == ["<mark>paris</mark>"]
+
+        hits = await service.search(
+            test_user.id,
+            "paris",
+            created_to=datetime(2026, 1, 15, tzinfo=timezone.utc),
+        )
+        assert [hit.test_run_id for hit in hits] == [test_runs[0].id]
+
+    @pytest.mark.asyncio
+    async def test_search_other_users(self, db_session, test_runs):
+        """Test that another user's runs are not searched."""
+        other = User(
+            email="other@example.com", name="Other User", google_id="google-456"
+        )
+        db_session.add(other)
+        await db_session.commit()
+
+        assert await SearchService(db_session).search(other.id, "paris") == []
+
+    def test_highlight(self):
+        """Test that excerpts are cut around the first match."""
+        text = "x" * 200 + " needle " + "y" * 200
+        excerpt = highlight(text, "NEEDLE")
+
+        assert "<mark>needle</mark>" in excerpt
+        assert len(excerpt) < len(text)
+        assert highlight(None, "needle") is None
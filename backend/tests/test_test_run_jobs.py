@@ -0,0 +1,260 @@
+"""Tests for background test run execution."""
+
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.model import Model
+from app.models.test_run import TestResult, TestRunStatus
+from app.schemas.test_run import (
+    ModelTestConfig,
+    SweepAxis,
+    SweepSpec,
+    TestRunCreate,
+    TestRunSweepCreate,
+)
+from app.services.test_run import TestRunService
+from app.services.test_run_jobs import TestRunJobRunner
+from app.utils.llm_client import LLMResponse
+from app.utils.progress import ProgressHub
+
+
+class TestTestRunJobs:
+    """Tests for queued test runs."""
+
+    @pytest.fixture
+    async def test_model(self, db_session):
+        """Create a test model."""
+        model = Model(
+            name="Job LLM",
+            model_name="job-model",
+            endpoint_url="http://localhost:8000",
+            is_active=True,
+        )
+        db_session.add(model)
+        await db_session.commit()
+        await db_session.refresh(model)
+        return model
+
+    @pytest.mark.asyncio
+    async def test_create_test_run_job(self, db_session, test_user, test_model):
+        """Test that a job is persisted as pending with its model configs."""
+        service = TestRunService(db_session)
+        test_run = await service.create_test_run_job(
+            test_user.id,
+            TestRunCreate(
+                user_message="Hello",
+                models=[ModelTestConfig(model_id=test_model.id)],
+            ),
+        )
+
+        assert test_run.status == TestRunStatus.PENDING
+        assert test_run.config["models"][0]["model_id"] == str(test_model.id)
+
+        progress = await service.get_progress(test_run.id, test_user.id)
+        assert progress.total == 1
+        assert progress.completed == 0
+        assert progress.models[0].status == "pending"
+
+    @pytest.mark.asyncio
+    async def test_runner_executes_job(self, db_session, test_user, test_model):
+        """Test that the runner executes a pending run and records progress."""
+        service = TestRunService(db_session)
+        test_run = await service.create_test_run_job(
+            test_user.id,
+            TestRunCreate(
+                user_message="Hello",
+                models=[ModelTestConfig(model_id=test_model.id)],
+            ),
+        )
+
+        runner = TestRunJobRunner(
+            session_factory=async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+            hub=ProgressHub(),
+        )
+        with patch(
+            "app.services.test_run.llm_client.chat_completion",
+            new_callable=AsyncMock,
+            return_value=LLMResponse(
+                content="Hi", latency_ms=120, token_count=3, error=None
+            ),
+        ) as mock_completion:
+            await runner.run(test_run.id)
+            # A second run of the same job is a no-op
+            await runner.run(test_run.id)
+
+        assert mock_completion.await_count == 1
+
+        test_run_id, user_id = test_run.id, test_user.id
+        db_session.expire_all()
+        progress = await service.get_progress(test_run_id, user_id)
+        assert progress.status == TestRunStatus.COMPLETE
+        assert progress.completed == 1
+        assert progress.models[0].status == "complete"
+        assert progress.models[0].latency_ms == 120
+
+    @pytest.mark.asyncio
+    async def test_runner_fail_marks_run_failed(
+        self, db_session, test_user, test_model
+    ):
+        """Test that a job's final failure is recorded on its run."""
+        service = TestRunService(db_session)
+        test_run = await service.create_test_run_job(
+            test_user.id,
+            TestRunCreate(
+                user_message="Hello",
+                models=[ModelTestConfig(model_id=test_model.id)],
+            ),
+        )
+        runner = TestRunJobRunner(
+            session_factory=async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+            hub=ProgressHub(),
+        )
+
+        test_run_id, user_id = test_run.id, test_user.id
+        await runner.fail(test_run_id, "Lease expired too many times")
+
+        db_session.expire_all()
+        progress = await service.get_progress(test_run_id, user_id)
+        assert progress.status == TestRunStatus.FAILED
+        assert progress.error == "Lease expired too many times"
+
+    def test_expand_grid_sweep(self):
+        """Test that a grid sweep is the cross product, grouped by model."""
+        model_ids = [uuid4(), uuid4()]
+        configs = TestRunService.expand_sweep(
+            SweepSpec(
+                temperature=SweepAxis(values=[0.2, 0.8]),
+                max_tokens=SweepAxis(values=[64, 128, 256]),
+                n=4,
+            ),
+            model_ids,
+        )
+
+        assert len(configs) == 12
+        assert [c.model_id for c in configs[:6]] == [model_ids[0]] * 6
+        assert {(c.temperature, c.max_tokens) for c in configs[:6]} == {
+            (t, m) for t in (0.2, 0.8) for m in (64, 128, 256)
+        }
+        assert all(c.n == 4 for c in configs)
+
+    def test_expand_random_sweep(self):
+        """Test that a seeded random sweep is repeatable and in range."""
+        spec = SweepSpec(
+            strategy="random",
+            temperature=SweepAxis(min=0.0, max=1.5),
+            top_p=SweepAxis(values=[0.9, 1.0]),
+            samples=5,
+            seed=7,
+        )
+        model_id = uuid4()
+
+        first = TestRunService.expand_sweep(spec, [model_id])
+        second = TestRunService.expand_sweep(spec, [model_id])
+
+        assert first == second
+        assert len(first) == 5
+        assert all(0.0 <= c.temperature <= 1.5 for c in first)
+        assert all(c.top_p in (0.9, 1.0) for c in first)
+
+    def test_expand_sweep_rejects_out_of_range(self):
+        """Test that parameters outside the allowed ranges are rejected."""
+        with pytest.raises(ValueError):
+            TestRunService.expand_sweep(
+                SweepSpec(temperature=SweepAxis(values=[3.0])), [uuid4()]
+            )
+
+    def test_expand_sweep_checks_size_first(self):
+        """Test that an oversized grid is refused without building it."""
+        axis = SweepAxis(values=[i / 100 for i in range(50)])
+        spec = SweepSpec(temperature=axis, top_p=axis, max_tokens=axis)
+        with patch("app.services.test_run.itertools.product") as product:
+            with pytest.raises(ValueError, match="1250000 calls"):
+                TestRunService.expand_sweep(
+                    spec, [uuid4() for _ in range(10)], max_calls=200
+                )
+        product.assert_not_called()
+
+    def test_expand_sweep_dedupes(self):
+        """Test that repeated combinations are called once."""
+        configs = TestRunService.expand_sweep(
+            SweepSpec(
+                temperature=SweepAxis(values=[0.5, 0.5]),
+                max_tokens=SweepAxis(values=[64, 64.0]),
+            ),
+            [uuid4()],
+        )
+        assert [(c.temperature, c.max_tokens) for c in configs] == [(0.5, 64)]
+
+    @pytest.mark.asyncio
+    async def test_sweep_runs_and_groups_results(
+        self, db_session, test_user, test_model
+    ):
+        """Test that a sweep runs every config once, even when resumed."""
+        service = TestRunService(db_session)
+        test_run = await service.create_sweep_job(
+            test_user.id,
+            TestRunSweepCreate(
+                user_message="Hello",
+                model_ids=[test_model.id],
+                sweep=SweepSpec(temperature=SweepAxis(values=[0.3, 0.6, 0.9])),
+            ),
+        )
+        test_run_id, user_id, model_id = test_run.id, test_user.id, test_model.id
+        # An interrupted worker already saved the first two configs
+        for index, temperature in enumerate([0.3, 0.6]):
+            db_session.add(
+                TestResult(
+                    test_run_id=test_run_id,
+                    model_id=model_id,
+                    parameters={"temperature": temperature},
+                    response="Earlier",
+                    config_index=index,
+                )
+            )
+        await db_session.commit()
+
+        runner = TestRunJobRunner(
+            session_factory=async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            ),
+            hub=ProgressHub(),
+        )
+        with patch(
+            "app.services.test_run.llm_client.chat_completion",
+            new_callable=AsyncMock,
+            return_value=LLMResponse(
+                content="Hi", latency_ms=50, token_count=2, error=None
+            ),
+        ) as mock_completion:
+            await runner.run(test_run_id)
+
+        assert mock_completion.await_count == 1
+        assert mock_completion.await_args.kwargs["temperature"] == 0.9
+
+        db_session.expire_all()
+        sweep = await service.get_sweep(test_run_id, user_id)
+        assert sweep.status == TestRunStatus.COMPLETE
+        assert [g.parameters["temperature"] for g in sweep.groups] == [0.3, 0.6, 0.9]
+        assert all(len(g.results) == 1 for g in sweep.groups)
+
+    @pytest.mark.asyncio
+    async def test_sweep_over_limit_rejected(self, db_session, test_user, test_model):
+        """Test that sweeps expanding past the call limit are refused."""
+        service = TestRunService(db_session)
+        with patch("app.services.test_run.settings.sweep_max_calls", 2):
+            with pytest.raises(ValueError, match="limit 2"):
+                await service.create_sweep_job(
+                    test_user.id,
+                    TestRunSweepCreate(
+                        user_message="Hello",
+                        model_ids=[test_model.id],
+                        sweep=SweepSpec(temperature=SweepAxis(values=[0.1, 0.2, 0.3])),
+                    ),
+                )
@@ -1,15 +1,41 @@
 """Tests for test run execution."""
 
+import asyncio
+from contextlib import aclosing, contextmanager
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.api.v1.test_runs import get_test_run
 from app.models.model import Model
-from app.models.test_run import TestRun, TestResult
+from app.models.test_run import TestRun, TestResult, TestRunStatus
+from app.models.text import StoredText, text_hash
 from app.schemas.test_run import ModelTestConfig, TestRunCreate
+from app.schemas.model import ModelUpdate
+from app.services.model import ModelService, model_names
+from app.services.result_writer import ResultWriter
 from app.services.test_run import TestRunService
-from app.utils.llm_client import LLMResponse
+from app.utils.llm_client import LLMResponse, StreamDelta
+
+
+@contextmanager
+def count_queries(db_session):
+    """Collect the SQL statements a block sends through the session's engine."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
 
 
 class TestTestRunService:
@@ -122,6 +148,60 @@ class TestTestRunService:
             for result in test_run.results:
                 assert result.response == "Test response"
 
+    @pytest.mark.asyncio
+    async def test_results_saved_as_models_finish(
+        self, db_session, test_user, test_models
+    ):
+        """Test that each result is committed as soon as its model finishes."""
+        fast_id, slow_id = test_models[0].id, test_models[1].id
+        writer = ResultWriter(
+            async_sessionmaker(
+                db_session.bind, class_=AsyncSession, expire_on_commit=False
+            )
+        )
+        service = TestRunService(db_session, writer=writer)
+        seen = {}
+
+        async def completion(**kwargs):
+            if kwargs["endpoint_url"].endswith("8001"):
+                # Once the fast model's result is committed, read it back
+                # through another session while this model is still pending
+                while writer.rows_written < 1:
+                    await asyncio.sleep(0.01)
+                async with writer.session_factory() as db:
+                    row = (
+                        await db.execute(
+                            select(TestRun.status, TestResult.model_id).join(
+                                TestResult
+                            )
+                        )
+                    ).one()
+                seen["status"], seen["results"] = row.status, [row.model_id]
+            return LLMResponse(content="Done", latency_ms=10, token_count=1, error=None)
+
+        with patch(
+            "app.services.test_run.llm_client.chat_completion",
+            side_effect=completion,
+        ):
+            test_run = await asyncio.wait_for(
+                service.create_and_execute_test(
+                    test_user.id,
+                    TestRunCreate(
+                        user_message="Test message",
+                        models=[
+                            ModelTestConfig(model_id=fast_id, temperature=0.5),
+                            ModelTestConfig(model_id=slow_id, temperature=0.5),
+                        ],
+                    ),
+                ),
+                timeout=5,
+            )
+
+        await writer.stop()
+        assert seen == {"status": TestRunStatus.PARTIAL, "results": [fast_id]}
+        assert test_run.status == TestRunStatus.COMPLETE
+        assert len(test_run.results) == 2
+
     @pytest.mark.asyncio
     async def test_execute_with_error(self, db_session, test_user, test_model):
         """Test handling model errors."""
@@ -151,6 +231,121 @@ class TestTestRunService:
             assert result.response is None
             assert result.error == "Connection refused"
 
+    @pytest.mark.asyncio
+    async def test_deterministic_result_cached(self, db_session, test_user, test_model):
+        """Test that repeated temperature-0 runs are served from the cache."""
+        mock_response = LLMResponse(
+            content="Cached answer",
+            latency_ms=150,
+            token_count=10,
+            error=None,
+        )
+
+        with patch(
+            "app.services.test_run.llm_client.chat_completion",
+            new_callable=AsyncMock,
+            return_value=mock_response,
+        ) as mock_call:
+            service = TestRunService(db_session)
+
+            test_data = TestRunCreate(
+                user_message=f"Deterministic {uuid4()}",
+                models=[ModelTestConfig(model_id=test_model.id, temperature=0.0)],
+            )
+
+            first = await service.create_and_execute_test(test_user.id, test_data)
+            second = await service.create_and_execute_test(test_user.id, test_data)
+
+        assert mock_call.await_count == 1
+        assert first.results[0].cache_hit is False
+        assert second.results[0].cache_hit is True
+        assert second.results[0].response == "Cached answer"
+
+    @pytest.mark.asyncio
+    async def test_stream_and_execute_test(self, db_session, test_user, test_models):
+        """Test streaming frames from multiple models with a tiny buffer."""
+
+        async def fake_stream(**kwargs):
+            for piece in ["Hel", "lo"]:
+                yield StreamDelta(content=piece)
+            yield StreamDelta(
+                content="",
+                response=LLMResponse(
+                    content="Hello",
+                    latency_ms=80,
+                    token_count=4,
+                    error=None,
+                    ttft_ms=20,
+                    tokens_per_second=50.0,
+                ),
+            )
+
+        with patch(
+            "app.services.test_run.llm_client.stream_chat_completion",
+            side_effect=fake_stream,
+        ):
+            service = TestRunService(db_session)
+
+            test_data = TestRunCreate(
+                user_message="Test message",
+                models=[ModelTestConfig(model_id=model.id) for model in test_models],
+            )
+
+            frames = [
+                frame
+                async for frame in service.stream_and_execute_test(
+                    test_user.id, test_data, buffer_size=1
+                )
+            ]
+
+        assert frames[0]["type"] == "run"
+
+        for model in test_models:
+            model_frames = [f for f in frames if f.get("model_id") == str(model.id)]
+            text = "".join(f["content"] for f in model_frames if f["type"] == "delta")
+            assert text == "Hello"
+            assert model_frames[-1]["type"] == "result"
+            assert model_frames[-1]["result"]["ttft_ms"] == 20
+
+        test_run = await service.get_test_run_by_id(
+            UUID(frames[0]["test_run_id"]), test_user.id
+        )
+        assert len(test_run.results) == 3
+        assert test_run.status == TestRunStatus.COMPLETE
+
+    @pytest.mark.asyncio
+    async def test_stream_closed_early_marks_run_failed(
+        self, db_session, test_user, test_model
+    ):
+        """Test that a run is running while streaming and failed if abandoned."""
+
+        async def stalled_stream(**kwargs):
+            await asyncio.sleep(60)
+            yield StreamDelta(content="never")
+
+        service = TestRunService(db_session)
+        frames = service.stream_and_execute_test(
+            test_user.id,
+            TestRunCreate(
+                user_message="Test message",
+                models=[ModelTestConfig(model_id=test_model.id)],
+            ),
+            buffer_size=8,
+        )
+        with patch(
+            "app.services.test_run.llm_client.stream_chat_completion",
+            side_effect=stalled_stream,
+        ):
+            async with aclosing(frames):
+                run_frame = await anext(frames)
+                test_run = await service.get_test_run_by_id(
+                    UUID(run_frame["test_run_id"]), test_user.id
+                )
+                assert test_run.status == TestRunStatus.RUNNING
+
+        await db_session.refresh(test_run)
+        assert test_run.status == TestRunStatus.FAILED
+
     @pytest.mark.asyncio
     async def test_get_test_run_by_id(self, db_session, test_user, test_model):
         """Test getting test run by ID."""
@@ -207,12 +402,143 @@ class TestTestRunService:
         await db_session.commit()
 
         service = TestRunService(db_session)
-        test_runs, total = await service.get_test_runs(
-            user_id=test_user.id, skip=0, limit=3
+        page = await service.get_test_runs(user_id=test_user.id, skip=0, limit=3)
+
+        assert len(page.items) == 3
+        assert page.total == 5
+
+    @pytest.mark.asyncio
+    async def test_get_test_runs_cursor(self, db_session, test_user):
+        """Test that cursors page through same-timestamp runs without gaps."""
+        created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        db_session.add_all(
+            TestRun(user_id=test_user.id, user_message=f"Message {i}", created_at=at)
+            for i, at in enumerate([created_at] * 4 + [created_at.replace(day=2)])
+        )
+        await db_session.commit()
+
+        service = TestRunService(db_session)
+        seen, cursor = [], None
+        while True:
+            page = await service.get_test_runs(
+                test_user.id, limit=2, cursor=cursor, include_total=False
+            )
+            assert page.total is None
+            seen += [run.user_message for run in page.items]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert len(seen) == len(set(seen)) == 5
+        assert seen[0] == "Message 4"  # Newest first
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await service.get_test_runs(test_user.id, cursor="not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_texts_stored_once(self, db_session, test_user):
+        """Test that repeated prompts share one text row and read unchanged."""
+        user_id = test_user.id
+        prompt = "You are a careful assistant. " * 100
+        db_session.add_all(
+            TestRun(
+                user_id=user_id, user_message=f"Question {i % 2}", system_prompt=prompt
+            )
+            for i in range(4)
+        )
+        db_session.add(TestRun(user_id=user_id, user_message="Question 0"))
+        await db_session.commit()
+
+        texts = (await db_session.execute(select(StoredText.content))).scalars()
+        assert sorted(texts) == ["Question 0", "Question 1", prompt]
+
+        db_session.expire_all()
+        page = await TestRunService(db_session).get_test_runs(
+            user_id, system_prompt_hash=text_hash(prompt)
+        )
+        assert page.total == 4
+        assert all(run.system_prompt == prompt for run in page.items)
+        assert sorted(run.user_message for run in page.items) == [
+            "Question 0",
+            "Question 0",
+            "Question 1",
+            "Question 1",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_test_runs_total_capped(self, db_session, test_user):
+        """Test that the count stops at its cap and reports an estimate."""
+        db_session.add_all(
+            TestRun(user_id=test_user.id, user_message=f"Message {i}")
+            for i in range(5)
+        )
+        await db_session.commit()
+
+        service = TestRunService(db_session)
+        with patch("app.services.test_run.settings.pagination_count_cap", 3):
+            page = await service.get_test_runs(test_user.id, limit=2)
+
+        assert page.total == 3
+        assert page.total_exact is False
+        assert len(page.items) == 2
+
+    @pytest.mark.asyncio
+    async def test_summaries_use_aggregates_and_previews(
+        self, db_session, test_user, test_models
+    ):
+        """Test that run summaries carry stats and previews, not full text."""
+        first, second = test_models[0], test_models[1]
+        test_run = TestRun(user_id=test_user.id, user_message="Hi")
+        test_run.results = [
+            TestResult(
+                model_id=first.id,
+                parameters={},
+                response="x" * 5000,
+                latency_ms=120,
+                config_index=0,
+            ),
+            TestResult(
+                model_id=second.id,
+                parameters={},
+                response="short",
+                latency_ms=80,
+                config_index=1,
+            ),
+            TestResult(
+                model_id=second.id,
+                parameters={},
+                error="HTTP 503",
+                latency_ms=10,
+                config_index=2,
+            ),
+        ]
+        empty_run = TestRun(user_id=test_user.id, user_message="Nothing yet")
+        db_session.add_all([test_run, empty_run])
+        await db_session.commit()
+        # A result saved before previews were stored
+        await db_session.execute(
+            update(TestResult)
+            .where(TestResult.config_index == 1)
+            .values(response_preview=None)
         )
+        await db_session.commit()
 
-        assert len(test_runs) == 3
-        assert total == 5
+        service = TestRunService(db_session)
+        page = await service.get_test_runs(test_user.id)
+        summaries = {s.user_message: s for s in await service.summarize(page.items)}
+
+        summary = summaries["Hi"]
+        assert summary.result_count == 3
+        assert summary.error_count == 1
+        assert (summary.min_latency_ms, summary.max_latency_ms) == (10, 120)
+        assert summary.model_names == ["Test LLM 0", "Test LLM 1"]
+        previews = {p.model_name: p for p in summary.previews}
+        assert previews["Test LLM 0"].response_preview == "x" * 200
+        assert previews["Test LLM 1"].response_preview == "short"
+        assert previews["Test LLM 1"].failed is False
+
+        assert summaries["Nothing yet"].result_count == 0
+        assert summaries["Nothing yet"].previews == []
 
     @pytest.mark.asyncio
     async def test_delete_test_run(self, db_session, test_user, test_model):
@@ -289,3 +615,68 @@ class TestTestRunService:
             # Only active model should have a result
             assert len(test_run.results) == 1
             assert test_run.results[0].model_id == active_model.id
+
+    @pytest.mark.asyncio
+    async def test_get_test_run_queries_independent_of_results(
+        self, db_session, test_user, test_models
+    ):
+        """Test that fetching a run costs the same queries for 1 or 3 results."""
+        runs = []
+        for models in (test_models[:1], test_models):
+            test_run = TestRun(user_id=test_user.id, user_message="Hi")
+            test_run.results = [
+                TestResult(model_id=model.id, parameters={}, response="ok")
+                for model in models
+            ]
+            db_session.add(test_run)
+            runs.append(test_run)
+        await db_session.commit()
+        run_ids = [run.id for run in runs]
+        for model in test_models:
+            model_names.invalidate(model.id)
+
+        counts = []
+        for run_id in run_ids:
+            db_session.expunge_all()
+            with count_queries(db_session) as statements:
+                response = await get_test_run(run_id, test_user, db_session)
+            counts.append(len(statements))
+
+        assert counts[0] == counts[1] <= 2
+        assert [r.model_name for r in response.results] == [
+            "Test LLM 0",
+            "Test LLM 1",
+            "Test LLM 2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_run_response_uses_model_name_cache(
+        self, db_session, test_user, test_models
+    ):
+        """Test that names are looked up once, then served from the cache."""
+        test_run = TestRun(user_id=test_user.id, user_message="Hi")
+        test_run.results = [
+            TestResult(model_id=model.id, parameters={}, response="ok")
+            for model in test_models
+        ]
+        db_session.add(test_run)
+        await db_session.commit()
+        model_id = test_models[0].id
+        for model in test_models:
+            model_names.invalidate(model.id)
+        service = TestRunService(db_session)
+
+        with count_queries(db_session) as cold:
+            await service.run_response(test_run)
+        with count_queries(db_session) as warm:
+            response = await service.run_response(test_run)
+        assert len(cold) == 1
+        assert warm == []
+        assert response.results[0].model_name == "Test LLM 0"
+
+        # Renaming a model invalidates its entry
+        await ModelService(db_session).update_model(
+            model_id, ModelUpdate(name="Renamed")
+        )
+        response = await service.run_response(test_run)
+        assert response.results[0].model_name == "Renamed"
@@ -92,6 +92,7 @@ export interface Model {
   name: string
   model_name: string | null
   endpoint_url: string
+  replica_urls?: string[] | null
   is_active: boolean
   metadata_: Record<string, unknown> | null
   created_at: string
@@ -102,6 +103,7 @@ export interface ModelCreate {
   name: string
   model_name?: string
   endpoint_url: string
+  replica_urls?: string[]
   api_key?: string
   metadata_?: Record<string, unknown>
 }
@@ -110,6 +112,7 @@ export interface ModelUpdate {
   name?: string
   model_name?: string
   endpoint_url?: string
+  replica_urls?: string[]
   api_key?: string
   is_active?: boolean
   metadata_?: Record<string, unknown>
@@ -117,11 +120,21 @@ export interface ModelUpdate {
 
 export interface ModelListResponse {
   items: Model[]
-  total: number
+  total: number | null  // Omitted with include_total=false
+  total_exact: boolean  // False when total is a capped lower bound
+  next_cursor: string | null
   page: number
   size: number
 }
 
+export interface EndpointHealthCheck {
+  endpoint_url: string
+  is_healthy: boolean
+  status_code: number | null
+  latency_ms: number | null
+  error: string | null
+}
+
 export interface ModelHealthCheck {
   model_id: string
   model_name: string
@@ -129,12 +142,14 @@ export interface ModelHealthCheck {
   is_healthy: boolean
   latency_ms: number | null
   error: string | null
+  replicas?: EndpointHealthCheck[] | null
 }
 
 export const modelsApi = {
-  list: (page = 1, size = 20, activeOnly = true) =>
+  list: (page = 1, size = 20, activeOnly = true, cursor?: string) =>
     request<ModelListResponse>(
-      `/api/v1/models?page=${page}&size=${size}&active_only=${activeOnly}`
+      `/api/v1/models?page=${page}&size=${size}&active_only=${activeOnly}` +
+        (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '')
     ),
   get: (id: string) => request<Model>(`/api/v1/models/${id}`),
   create: (data: ModelCreate) =>
@@ -176,7 +191,9 @@ export interface PromptUpdate {
 
 export interface PromptListResponse {
   items: Prompt[]
-  total: number
+  total: number | null  // Omitted with include_total=false
+  total_exact: boolean  // False when total is a capped lower bound
+  next_cursor: string | null
   skip: number
   limit: number
 }
@@ -189,9 +206,16 @@ export interface PromptVersion {
 }
 
 export const promptsApi = {
-  list: (skip = 0, limit = 20, favoritesOnly = false, tag?: string) => {
+  list: (
+    skip = 0,
+    limit = 20,
+    favoritesOnly = false,
+    tag?: string,
+    cursor?: string
+  ) => {
     let url = `/api/v1/prompts?skip=${skip}&limit=${limit}&favorites_only=${favoritesOnly}`
     if (tag) url += `&tag=${encodeURIComponent(tag)}`
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`
     return request<PromptListResponse>(url)
   },
   get: (id: string) => request<Prompt>(`/api/v1/prompts/${id}`),
@@ -221,42 +245,93 @@ export interface TestResult {
   response: string | null
   latency_ms: number | null
   token_count: number | null
+  ttft_ms?: number | null
+  tokens_per_second?: number | null
+  inter_token_latency?: Record<string, number> | null
+  cache_hit?: boolean
+  attempts?: number | null
+  samples?: (string | null)[] | null
   error: string | null
   created_at: string
 }
 
+export type TestRunStatus = 'pending' | 'running' | 'partial' | 'complete' | 'failed'
+
 export interface TestRun {
   id: string
   user_id: string
   prompt_template_id: string | null
   user_message: string
   system_prompt: string | null
+  status?: TestRunStatus
+  error?: string | null
   results: TestResult[]
   created_at: string
   updated_at: string
 }
 
+export interface ResultPreview {
+  model_id: string
+  model_name: string
+  response_preview: string | null
+  failed: boolean
+}
+
 export interface TestRunSummary {
   id: string
   user_message: string
   system_prompt: string | null
   prompt_template_id: string | null
+  status?: TestRunStatus
   result_count: number
+  error_count: number
+  min_latency_ms: number | null
+  max_latency_ms: number | null
+  model_names: string[]
+  previews: ResultPreview[]
   created_at: string
 }
 
 export interface TestRunListResponse {
   items: TestRunSummary[]
-  total: number
+  total: number | null  // Omitted with include_total=false
+  total_exact: boolean  // False when total is a capped lower bound
+  next_cursor: string | null
+  skip: number
+  limit: number
+}
+
+export interface TestRunSearchHit {
+  test_run_id: string
+  result_id: string
+  model_id: string
+  model_name: string | null
+  rank: number
+  user_message: string  // Matches wrapped in <mark></mark>; escape the rest
+  response: string | null
+  created_at: string
+}
+
+export interface TestRunSearchResponse {
+  items: TestRunSearchHit[]
+  query: string
   skip: number
   limit: number
 }
 
+export interface TestRunSearchFilters {
+  modelId?: string
+  createdFrom?: string
+  createdTo?: string
+}
+
 export interface ModelTestConfig {
   model_id: string
   temperature?: number
   max_tokens?: number
   top_p?: number
+  seed?: number
+  n?: number
 }
 
 export interface TestRunCreate {
@@ -264,14 +339,53 @@ export interface TestRunCreate {
   system_prompt?: string
   prompt_template_id?: string
   models: ModelTestConfig[]
+  stream?: boolean
+}
+
+export interface TestRunJob {
+  id: string
+  status: TestRunStatus
+  progress_url: string
+  events_url: string
+}
+
+export interface ModelProgress {
+  model_id: string
+  model_name: string
+  status: string
+  latency_ms: number | null
+  error: string | null
+}
+
+export interface TestRunProgress {
+  id: string
+  status: TestRunStatus
+  total: number
+  completed: number
+  error: string | null
+  models: ModelProgress[]
 }
 
 export const testRunsApi = {
-  list: (skip = 0, limit = 20) =>
-    request<TestRunListResponse>(`/api/v1/test-runs?skip=${skip}&limit=${limit}`),
+  list: (skip = 0, limit = 20, cursor?: string) =>
+    request<TestRunListResponse>(
+      `/api/v1/test-runs?skip=${skip}&limit=${limit}` +
+        (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '')
+    ),
+  search: (q: string, filters: TestRunSearchFilters = {}, skip = 0, limit = 20) => {
+    const params = new URLSearchParams({ q, skip: String(skip), limit: String(limit) })
+    if (filters.modelId) params.set('model_id', filters.modelId)
+    if (filters.createdFrom) params.set('created_from', filters.createdFrom)
+    if (filters.createdTo) params.set('created_to', filters.createdTo)
+    return request<TestRunSearchResponse>(`/api/v1/test-runs/search?${params}`)
+  },
   get: (id: string) => request<TestRun>(`/api/v1/test-runs/${id}`),
   create: (data: TestRunCreate) =>
     request<TestRun>('/api/v1/test-runs', { method: 'POST', body: data }),
+  createJob: (data: TestRunCreate) =>
+    request<TestRunJob>('/api/v1/test-runs/jobs', { method: 'POST', body: data }),
+  progress: (id: string) =>
+    request<TestRunProgress>(`/api/v1/test-runs/${id}/progress`),
   delete: (id: string) =>
     request<void>(`/api/v1/test-runs/${id}`, { method: 'DELETE' }),
 }
@@ -31,9 +31,9 @@ export function DashboardPage() {
       ])
 
       setStats({
-        activeModels: modelsRes.total,
-        totalPrompts: promptsRes.total,
-        totalTests: testsRes.total,
+        activeModels: modelsRes.total ?? 0,
+        totalPrompts: promptsRes.total ?? 0,
+        totalTests: testsRes.total ?? 0,
       })
       setRecentTests(testsRes.items)
     } catch (error) {